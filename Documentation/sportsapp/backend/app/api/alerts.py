@@ -1 +1,96 @@
-alerts api
\ No newline at end of file
+from fastapi import APIRouter, Header, HTTPException, Query
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sportsapp.backend.app.db.repository import ALERT_KINDS, DEFAULT_LINE_MARKET, repository
+from typing import Literal, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+class AlertCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["game_start", "game_final", "player_status", "line_move"]
+    entity_type: Literal["event", "team", "player"]
+    entity_id: str = Field(..., min_length=1, description="Event ext_ref (odds event_ref for line_move), team id or player id")
+    threshold: Optional[float] = Field(None, gt=0, description="line_move: points (or price for h2h) the line must move")
+    market: Optional[Literal["h2h", "spreads", "totals"]] = None
+    book: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_kind(self):
+        if self.entity_type not in ALERT_KINDS[self.kind]:
+            raise ValueError(f"{self.kind} alerts follow: {', '.join(ALERT_KINDS[self.kind])}")
+        if self.kind == "line_move":
+            if self.threshold is None:
+                raise ValueError("line_move alerts need a threshold")
+            self.market = self.market or DEFAULT_LINE_MARKET
+        elif self.threshold is not None or self.market or self.book:
+            raise ValueError("threshold, market and book only apply to line_move alerts")
+        return self
+
+
+def _token(authorization: Optional[str]) -> str:
+    """The caller's Supabase JWT; alerts are read and written as that user so RLS applies."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Sign in to manage alerts")
+    return token
+
+
+@router.get("/")
+async def list_alerts(
+    include_inactive: bool = Query(False, description="Also return alerts that were turned off"),
+    authorization: Optional[str] = Header(None)
+):
+    """The signed-in user's alert subscriptions."""
+    token = _token(authorization)
+    try:
+        alerts = await repository.list_alerts(token, include_inactive=include_inactive)
+        logger.info(f"Fetched {len(alerts)} alerts")
+        return alerts
+    except Exception as e:
+        logger.error(f"Supabase query failed: {e}")
+        return {"error": "Failed to fetch alerts"}
+
+
+@router.post("/", status_code=201)
+async def create_alert(alert: AlertCreate, authorization: Optional[str] = Header(None)):
+    """Subscribe to a game starting or finishing, a player's status or a betting line moving."""
+    token = _token(authorization)
+    try:
+        return await repository.create_alert(token, alert.model_dump(exclude_none=True))
+    except Exception as e:
+        logger.error(f"Supabase insert failed: {e}")
+        return {"error": "Failed to create alert"}
+
+
+@router.get("/deliveries")
+async def list_deliveries(
+    limit: int = Query(50, ge=1, le=200, description="Max alerts to return"),
+    before: Optional[int] = Query(None, description="Only deliveries older than this id (next page)"),
+    authorization: Optional[str] = Header(None)
+):
+    """Alerts that fired for the signed-in user, newest first."""
+    token = _token(authorization)
+    try:
+        return await repository.list_alert_deliveries(token, limit=limit, before=before)
+    except Exception as e:
+        logger.error(f"Supabase query failed: {e}")
+        return {"error": "Failed to fetch alert deliveries"}
+
+
+@router.delete("/{alert_id}")
+async def delete_alert(alert_id: int, authorization: Optional[str] = Header(None)):
+    """Turn an alert off."""
+    token = _token(authorization)
+    try:
+        found = await repository.deactivate_alert(token, alert_id)
+    except Exception as e:
+        logger.error(f"Supabase update failed: {e}")
+        return {"error": "Failed to delete alert"}
+    if not found:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return {"id": alert_id, "active": False}
@@ -0,0 +1,95 @@
+from fastapi import APIRouter
+from pydantic import BaseModel, ConfigDict, Field
+from sportsapp.backend.app.api.events import query_events
+from sportsapp.backend.app.api.players import query_players
+from sportsapp.backend.app.api.teams import query_teams
+from typing import Annotated, Any, Dict, Literal, Optional, Union
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+MAX_QUERIES = 10
+
+
+class _ListParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    sport: Optional[str] = None
+    limit: int = Field(50, ge=1, le=100)
+    cursor: Optional[str] = None
+    fields: Optional[str] = None
+
+
+class EventParams(_ListParams):
+    status: Optional[str] = None
+    expand: Optional[str] = None
+
+
+class TeamParams(_ListParams):
+    name: Optional[str] = None
+
+
+class PlayerParams(_ListParams):
+    team_id: Optional[int] = None
+    name: Optional[str] = None
+    expand: Optional[str] = None
+
+
+class EventQuery(BaseModel):
+    resource: Literal["events"]
+    params: EventParams = EventParams()
+
+
+class TeamQuery(BaseModel):
+    resource: Literal["teams"]
+    params: TeamParams = TeamParams()
+
+
+class PlayerQuery(BaseModel):
+    resource: Literal["players"]
+    params: PlayerParams = PlayerParams()
+
+
+SubQuery = Annotated[Union[EventQuery, TeamQuery, PlayerQuery], Field(discriminator="resource")]
+
+
+class BatchRequest(BaseModel):
+    queries: Dict[str, SubQuery] = Field(..., min_length=1, max_length=MAX_QUERIES)
+
+
+# Same code path as GET /events/, /teams/ and /players/ (snapshot, cache, repository)
+HANDLERS = {"events": query_events, "teams": query_teams, "players": query_players}
+
+
+async def run_query(name: str, query: SubQuery) -> Dict[str, Any]:
+    try:
+        rows, next_cursor = await HANDLERS[query.resource](**query.params.model_dump())
+        return {"data": rows, "next_cursor": next_cursor}
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(f"Batch query {name!r} ({query.resource}) failed: {e}")
+        return {"error": f"Failed to fetch {query.resource}"}
+
+
+@router.post("/")
+async def batch(request: BatchRequest):
+    """Run several list queries concurrently and return them keyed by name.
+
+    Example body::
+
+        {"queries": {
+            "games": {"resource": "events", "params": {"sport": "NBA", "expand": "teams"}},
+            "teams": {"resource": "teams", "params": {"sport": "NBA", "limit": 30}}
+        }}
+
+    Each result is ``{"data": [...], "next_cursor": ...}`` or ``{"error": ...}``;
+    one failing query does not fail the others.
+    """
+    names = list(request.queries)
+    results = await asyncio.gather(*(run_query(name, request.queries[name]) for name in names))
+    logger.info(f"Batch of {len(names)} queries ({', '.join(q.resource for q in request.queries.values())})")
+    return dict(zip(names, results))
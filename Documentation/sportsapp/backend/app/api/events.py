@@ -1,29 +1,52 @@
-from fastapi import APIRouter, Query
-from sportsapp.backend.app.db.connection import supabase_anon
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.pagination import decode_cursor, paginate, parse_expand, parse_fields
+from sportsapp.backend.app.db.repository import EVENT_EMBEDS, EVENT_FIELDS, EVENT_KEYS, embed_keys, repository
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+async def query_events(sport: Optional[str] = None, status: Optional[str] = None, limit: int = 50,
+                       cursor: Optional[str] = None, fields: Optional[str] = None,
+                       expand: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of events and the next page's cursor (ValueError for a bad cursor, field or expand)."""
+    columns = parse_fields(fields, EVENT_FIELDS)
+    embeds = parse_expand(expand, list(EVENT_EMBEDS))
+    after = decode_cursor(cursor, EVENT_KEYS) if cursor else None
+
+    # One extra row tells us whether there is a next page
+    rows = await response_cache.get_or_load(
+        "events", {"sport": sport, "status": status, "limit": limit, "cursor": cursor, "fields": ",".join(columns),
+                   "expand": ",".join(embeds)},
+        lambda: repository.list_events(sport=sport, status=status, limit=limit + 1, after=after,
+                                       columns=columns, expand=embeds),
+    )
+    return paginate(rows, limit, EVENT_KEYS, [*columns, *embed_keys(EVENT_EMBEDS, embeds)])
+
 @router.get("/")
 async def list_events(
+    response: Response,
     sport: Optional[str] = Query(None, description="Filter by sport (e.g., NBA, UFC)"),
     status: Optional[str] = Query(None, description="Filter by status (e.g., Scheduled, InProgress)"),
-    limit: int = Query(50, ge=1, le=100, description="Max rows to return")
+    limit: int = Query(50, ge=1, le=100, description="Max rows to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)"),
+    expand: Optional[str] = Query(None, description="Embed related rows: teams (home_team and away_team)")
 ):
     """List events with optional filters."""
     try:
-        query = supabase_anon.table("events").select("id, sport, season, start_time, venue, status, home_team_id, away_team_id")
-        if sport:
-            query = query.eq("sport", sport)
-        if status:
-            query = query.eq("status", status)
-        query = query.limit(limit)
-        res = query.execute()
-        logger.info(f"Fetched {len(res.data)} events (sport={sport}, status={status})")
-        return res.data
+        rows, next_cursor = await query_events(sport=sport, status=status, limit=limit, cursor=cursor,
+                                               fields=fields, expand=expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Supabase query failed: {e}")
-        return {"error": "Failed to fetch events"}
\ No newline at end of file
+        return {"error": "Failed to fetch events"}
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    logger.info(f"Fetched {len(rows)} events (sport={sport}, status={status})")
+    return rows
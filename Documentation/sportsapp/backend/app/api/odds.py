@@ -0,0 +1,74 @@
+from fastapi import APIRouter, HTTPException, Query
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.odds import BUCKETS, board_from_rows, downsample, odds_board, parse_time
+from sportsapp.backend.app.db.repository import repository
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/odds", tags=["odds"])
+
+BUCKET_PATTERN = f"^({'|'.join(BUCKETS)})$"
+
+@router.get("/")
+async def current_lines(
+    sport: Optional[str] = Query(None, description="Filter by sport (e.g., NBA, NFL)"),
+    market: Optional[str] = Query(None, description="Only this market: h2h, spreads or totals"),
+    limit: int = Query(50, ge=1, le=200, description="Max events to return")
+):
+    """Best current line per market outcome across books, for upcoming and live events."""
+    if odds_board.ready:
+        return odds_board.lines(sport, market, limit)
+    # Still loading: one query on odds_latest (never the history table)
+    try:
+        rows = await repository.list_odds(sport=sport)
+    except Exception as e:
+        logger.error(f"Supabase query failed: {e}")
+        return {"error": "Failed to fetch odds"}
+    return board_from_rows(rows).lines(sport, market, limit)
+
+@router.get("/{event_ref}")
+async def event_lines(event_ref: str):
+    """Best lines for one event plus every book's current quotes."""
+    if odds_board.ready:
+        event = odds_board.event(event_ref)
+    else:
+        try:
+            event = board_from_rows(await repository.list_odds(event_ref=event_ref)).event(event_ref)
+        except Exception as e:
+            logger.error(f"Supabase query failed: {e}")
+            return {"error": "Failed to fetch odds"}
+    if event is None:
+        raise HTTPException(status_code=404, detail="No odds for this event")
+    return event
+
+@router.get("/{event_ref}/history")
+async def line_history(
+    event_ref: str,
+    market: str = Query("h2h", description="h2h, spreads or totals"),
+    book: Optional[str] = Query(None, description="Only this bookmaker (e.g., draftkings)"),
+    outcome: Optional[str] = Query(None, description="Only this outcome (team name, Over, Under)"),
+    bucket: str = Query("15m", pattern=BUCKET_PATTERN, description="Bucket width: 1m, 5m, 15m, 1h, 6h or 1d"),
+    since: Optional[str] = Query(None, description="Only changes at or after this ISO timestamp")
+):
+    """Line movement per book and outcome, downsampled to open/high/low/close price per time bucket."""
+    if since and parse_time(since) is None:
+        raise HTTPException(status_code=400, detail="since must be an ISO 8601 timestamp")
+
+    async def load():
+        rows = await repository.get_odds_history(event_ref, market, book=book, outcome=outcome, since=since)
+        return {"event_ref": event_ref, "market": market, "bucket": bucket, "changes": len(rows),
+                "series": downsample(rows, BUCKETS[bucket])}
+
+    try:
+        history = await response_cache.get_or_load(
+            "odds", {"event_ref": event_ref, "market": market, "book": book, "outcome": outcome,
+                     "bucket": bucket, "since": since},
+            load,
+        )
+    except Exception as e:
+        logger.error(f"Supabase query failed: {e}")
+        return {"error": "Failed to fetch line history"}
+    logger.info(f"Fetched {history['changes']} line changes for {event_ref} {market}")
+    return history
@@ -1,32 +1,58 @@
-from fastapi import APIRouter, Query
-from sportsapp.backend.app.db.connection import supabase_anon
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.pagination import decode_cursor, paginate, parse_expand, parse_fields
+from sportsapp.backend.app.db.snapshot import snapshot
+from sportsapp.backend.app.db.repository import PLAYER_EMBEDS, PLAYER_FIELDS, PLAYER_KEYS, embed_keys, repository
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/players", tags=["players"])
 
+async def query_players(sport: Optional[str] = None, team_id: Optional[int] = None, name: Optional[str] = None,
+                        limit: int = 50, cursor: Optional[str] = None, fields: Optional[str] = None,
+                        expand: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of players and the next page's cursor (ValueError for a bad cursor, field or expand)."""
+    columns = parse_fields(fields, PLAYER_FIELDS)
+    embeds = parse_expand(expand, list(PLAYER_EMBEDS))
+    after = decode_cursor(cursor, PLAYER_KEYS) if cursor else None
+
+    # One extra row tells us whether there is a next page
+    if snapshot.ready:
+        rows = await snapshot.list_players(sport=sport, team_id=team_id, name=name, limit=limit + 1, after=after,
+                                           columns=columns, expand=embeds)
+    else:
+        rows = await response_cache.get_or_load(
+            "players", {"sport": sport, "team_id": team_id, "name": name and name.lower(), "limit": limit, "cursor": cursor,
+                        "fields": ",".join(columns), "expand": ",".join(embeds)},
+            lambda: repository.list_players(sport=sport, team_id=team_id, name=name, limit=limit + 1, after=after,
+                                            columns=columns, expand=embeds),
+        )
+    return paginate(rows, limit, PLAYER_KEYS, [*columns, *embed_keys(PLAYER_EMBEDS, embeds)])
+
 @router.get("/")
 async def list_players(
+    response: Response,
     sport: Optional[str] = Query(None, description="Filter by sport (e.g., NBA, UFC)"),
     team_id: Optional[int] = Query(None, description="Filter by team ID"),
     name: Optional[str] = Query(None, description="Filter by player name (partial match)"),
-    limit: int = Query(50, ge=1, le=100, description="Max rows to return")
+    limit: int = Query(50, ge=1, le=100, description="Max rows to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)"),
+    expand: Optional[str] = Query(None, description="Embed related rows: team")
 ):
     """List players with optional filters."""
     try:
-        query = supabase_anon.table("players").select("id, sport, first_name, last_name, position, status, team_id")
-        if sport:
-            query = query.eq("sport", sport)
-        if team_id:
-            query = query.eq("team_id", team_id)
-        if name:
-            query = query.ilike("last_name", f"%{name}%")
-        query = query.limit(limit)
-        res = query.execute()
-        logger.info(f"Fetched {len(res.data)} players (sport={sport}, team_id={team_id}, name={name})")
-        return res.data
+        rows, next_cursor = await query_players(sport=sport, team_id=team_id, name=name, limit=limit,
+                                                cursor=cursor, fields=fields, expand=expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Supabase query failed: {e}")
-        return {"error": "Failed to fetch players"}
\ No newline at end of file
+        return {"error": "Failed to fetch players"}
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    logger.info(f"Fetched {len(rows)} players (sport={sport}, team_id={team_id}, name={name})")
+    return rows
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Query
+from sportsapp.backend.app.db.snapshot import snapshot
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1, max_length=64, description="Search text (names, nicknames, team names or abbreviations)"),
+    sport: Optional[str] = Query(None, description="Limit to one sport (e.g., NBA, UFC)"),
+    type: Optional[str] = Query(None, pattern="^(player|team)$", description="Limit to players or teams"),
+    limit: int = Query(10, ge=1, le=25, description="Max results to return")
+):
+    """Ranked, typo-tolerant typeahead over players and teams across sports."""
+    if not snapshot.ready:
+        # The in-memory index is still loading (see db/snapshot.py)
+        raise HTTPException(status_code=503, detail="Search index is loading, try again shortly")
+    results = snapshot.search(q, limit=limit, sport=sport, kind=type)
+    logger.debug(f"Search {q!r} (sport={sport}, type={type}): {len(results)} results")
+    return results
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Query
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.repository import repository
+from sportsapp.backend.app.jobs.standings import LEADERBOARD_STATS
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/standings", tags=["standings"])
+
+STAT_PATTERN = f"^({'|'.join(LEADERBOARD_STATS)})$"
+
+@router.get("/")
+async def get_standings(
+    sport: str = Query(..., description="Sport (e.g., NBA, NFL)"),
+    season: str = Query(..., description="Season as stored on events (e.g., 2025)")
+):
+    """Ranked standings, maintained by the ingest worker as games finish."""
+    try:
+        rows = await response_cache.get_or_load(
+            "standings", {"table": "standings", "sport": sport, "season": season},
+            lambda: repository.get_standings(sport, season),
+        )
+        logger.info(f"Fetched standings for {sport} {season} ({len(rows)} teams)")
+        return rows
+    except Exception as e:
+        logger.error(f"Supabase query failed: {e}")
+        return {"error": "Failed to fetch standings"}
+
+@router.get("/leaders")
+async def get_leaders(
+    sport: str = Query(..., description="Sport (e.g., NBA, NFL)"),
+    season: str = Query(..., description="Season as stored on events (e.g., 2025)"),
+    stat: str = Query("wins", pattern=STAT_PATTERN, description="Leaderboard: wins or points_for")
+):
+    """Top teams by a running season total."""
+    try:
+        rows = await response_cache.get_or_load(
+            "standings", {"table": "leaderboards", "sport": sport, "season": season, "stat": stat},
+            lambda: repository.get_leaderboard(sport, season, stat),
+        )
+        logger.info(f"Fetched {stat} leaders for {sport} {season} ({len(rows)} teams)")
+        return rows
+    except Exception as e:
+        logger.error(f"Supabase query failed: {e}")
+        return {"error": "Failed to fetch leaderboard"}
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, HTTPException, Query
+from sportsapp.backend.app.stats.engine import PER_MODES, engine
+from typing import Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+PER_PATTERN = f"^({'|'.join(PER_MODES)})$"
+
+
+async def run(query, *args, **kwargs):
+    """Run an engine query off the event loop (a cold partition reads Parquet), mapping lookup errors to HTTP."""
+    try:
+        return await asyncio.to_thread(query, *args, **kwargs)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Season not in the stats dataset (see GET /stats/)")
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]) if e.args else "Not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/")
+async def list_seasons():
+    """Sports, stat types and years available in the scraped dataset."""
+    return await asyncio.to_thread(engine.catalog)
+
+
+@router.get("/leaders")
+async def leaders(
+    year: int = Query(..., description="Season year (e.g., 2024)"),
+    stat: str = Query(..., description="Stat column (e.g., PTS, AST, HR, ERA)"),
+    sport: str = Query("basketball", description="basketball or baseball"),
+    stat_type: str = Query("totals", description="Dataset table (e.g., totals, per_game, advanced, batting)"),
+    per: Optional[str] = Query(None, pattern=PER_PATTERN, description="Normalize: game or 36 (minutes)"),
+    limit: int = Query(10, ge=1, le=100, description="Max rows to return"),
+    min_games: int = Query(0, ge=0, description="Only players with at least this many games"),
+    team: Optional[str] = Query(None, description="Only players on this team (e.g., LAL)"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="Default: desc, asc for lower-is-better stats")
+):
+    """League leaders for one stat, with league-relative percentiles."""
+    ascending = None if order is None else order == "asc"
+    season = await run(engine.season, sport, stat_type, year)
+    rows = await run(season.leaders, stat, per=per, limit=limit, min_games=min_games, team=team, ascending=ascending)
+    logger.info(f"Stat leaders {sport} {stat_type} {year} {stat} (per={per}): {len(rows)} rows")
+    return rows
+
+
+@router.get("/player")
+async def player_season(
+    name: str = Query(..., description="Player name as listed by Sports Reference"),
+    year: int = Query(..., description="Season year"),
+    sport: str = Query("basketball", description="basketball or baseball"),
+    stat_type: str = Query("totals", description="Dataset table"),
+    per: Optional[str] = Query(None, pattern=PER_PATTERN, description="Normalize: game or 36 (minutes)")
+):
+    """One player's season line and percentile against the league for every stat."""
+    season = await run(engine.season, sport, stat_type, year)
+    return await run(season.player, name, per=per)
+
+
+@router.get("/teams")
+async def team_splits(
+    year: int = Query(..., description="Season year"),
+    stats: str = Query(..., description="Comma-separated stat columns (e.g., PTS,AST)"),
+    sport: str = Query("basketball", description="basketball or baseball"),
+    stat_type: str = Query("totals", description="Dataset table"),
+    agg: str = Query("sum", pattern="^(sum|mean|max)$", description="How to combine a team's player lines")
+):
+    """Per-team aggregates of player lines."""
+    columns = [s.strip() for s in stats.split(",") if s.strip()]
+    season = await run(engine.season, sport, stat_type, year)
+    return await run(season.team_splits, columns, agg=agg)
+
+
+@router.get("/rolling")
+async def rolling_form(
+    name: str = Query(..., description="Player name as listed by Sports Reference"),
+    stat: str = Query(..., description="Stat column"),
+    sport: str = Query("basketball", description="basketball or baseball"),
+    stat_type: str = Query("totals", description="Dataset table"),
+    per: Optional[str] = Query(None, pattern=PER_PATTERN, description="Normalize: game or 36 (minutes)"),
+    window: int = Query(3, ge=1, le=10, description="Seasons in the rolling mean")
+):
+    """A player's stat season by season with a rolling mean."""
+    return await run(engine.rolling, sport, stat_type, name, stat, per=per, window=window)
@@ -1,29 +1,50 @@
-from fastapi import APIRouter, Query
-from sportsapp.backend.app.db.connection import supabase_anon
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.pagination import decode_cursor, paginate, parse_fields
+from sportsapp.backend.app.db.snapshot import snapshot
+from sportsapp.backend.app.db.repository import TEAM_FIELDS, TEAM_KEYS, repository
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
+async def query_teams(sport: Optional[str] = None, name: Optional[str] = None, limit: int = 50,
+                      cursor: Optional[str] = None, fields: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of teams and the next page's cursor (ValueError for a bad cursor or field)."""
+    columns = parse_fields(fields, TEAM_FIELDS)
+    after = decode_cursor(cursor, TEAM_KEYS) if cursor else None
+
+    # One extra row tells us whether there is a next page
+    if snapshot.ready:
+        rows = await snapshot.list_teams(sport=sport, name=name, limit=limit + 1, after=after, columns=columns)
+    else:
+        rows = await response_cache.get_or_load(
+            "teams", {"sport": sport, "name": name and name.lower(), "limit": limit, "cursor": cursor, "fields": ",".join(columns)},
+            lambda: repository.list_teams(sport=sport, name=name, limit=limit + 1, after=after, columns=columns),
+        )
+    return paginate(rows, limit, TEAM_KEYS, columns)
+
 @router.get("/")
 async def list_teams(
+    response: Response,
     sport: Optional[str] = Query(None, description="Filter by sport (e.g., NBA, UFC)"),
     name: Optional[str] = Query(None, description="Filter by team name (partial match)"),
-    limit: int = Query(50, ge=1, le=100, description="Max rows to return")
+    limit: int = Query(50, ge=1, le=100, description="Max rows to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)")
 ):
     """List teams with optional filters."""
     try:
-        query = supabase_anon.table("teams").select("id, sport, name, short_name, market")
-        if sport:
-            query = query.eq("sport", sport)
-        if name:
-            query = query.ilike("name", f"%{name}%")
-        query = query.limit(limit)
-        res = query.execute()
-        logger.info(f"Fetched {len(res.data)} teams (sport={sport}, name={name})")
-        return res.data
+        rows, next_cursor = await query_teams(sport=sport, name=name, limit=limit, cursor=cursor, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Supabase query failed: {e}")
-        return {"error": "Failed to fetch teams"}
\ No newline at end of file
+        return {"error": "Failed to fetch teams"}
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    logger.info(f"Fetched {len(rows)} teams (sport={sport}, name={name})")
+    return rows
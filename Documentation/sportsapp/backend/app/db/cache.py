@@ -0,0 +1,248 @@
+"""
+Read-through response cache for the list endpoints.
+
+Two tiers sit in front of the repository:
+
+- L1: an in-process LRU with per-entry expiry (``CACHE_L1_SIZE`` entries)
+- L2: Redis, when ``REDIS_URL`` is set and the ``redis`` package is installed,
+  shared by every API worker
+
+Keys are the resource name plus its normalized query params, so
+``?limit=50&sport=NBA`` and ``?sport=NBA&limit=50`` share an entry. TTLs are
+per resource (``CACHE_TTL_TEAMS`` etc.). Concurrent misses for one key are
+coalesced: the first request runs the query, the rest await its result.
+
+Ingest calls ``invalidate(table)`` after writing to a table. With Redis this
+drops the shared entries and publishes on ``CACHE_CHANNEL`` so every API
+worker clears its L1. Ingest runs in its own process (``jobs/worker.py``),
+so without Redis its invalidations never reach the API: entries then live
+at most ``CACHE_TTL_NO_REDIS`` seconds, and both processes log a warning at
+startup.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_CHANNEL = "fanalytics:cache:invalidate"
+CACHE_L1_SIZE = int(os.getenv("CACHE_L1_SIZE", "1024"))
+
+# Seconds an entry stays fresh; teams/players only change when ingest writes
+RESOURCE_TTLS = {
+    "teams": int(os.getenv("CACHE_TTL_TEAMS", "3600")),
+    "players": int(os.getenv("CACHE_TTL_PLAYERS", "900")),
+    "events": int(os.getenv("CACHE_TTL_EVENTS", "60")),
+    # Rewritten (and invalidated) by the ingest worker whenever a game finishes
+    "standings": int(os.getenv("CACHE_TTL_STANDINGS", "300")),
+    # Line history; current lines are served from db/odds.py, not this cache
+    "odds": int(os.getenv("CACHE_TTL_ODDS", "30")),
+}
+DEFAULT_TTL = 60
+# Cap on every TTL when invalidations cannot reach the API (no Redis)
+CACHE_TTL_NO_REDIS = int(os.getenv("CACHE_TTL_NO_REDIS", "60"))
+
+
+def cache_key(resource: str, params: Dict[str, Any]) -> str:
+    """`resource` plus its non-empty params in a canonical order."""
+    normalized = {k: v for k, v in params.items() if v is not None and v != ""}
+    return f"{resource}:{json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)}"
+
+
+class LRUCache:
+    """Small in-process LRU whose entries expire individually."""
+
+    def __init__(self, max_entries: int = CACHE_L1_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def drop_prefix(self, prefix: str):
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+
+class ResponseCache:
+    """L1 + optional Redis read-through cache with single-flight loading."""
+
+    def __init__(self, redis_url: Optional[str] = REDIS_URL, max_entries: int = CACHE_L1_SIZE):
+        self.l1 = LRUCache(max_entries)
+        self.redis = aioredis.from_url(redis_url) if (redis_url and aioredis) else None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Bumped on invalidation so a query that started before it is not cached after it
+        self._generations: Dict[str, int] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._observers: List[Callable[[str], None]] = []
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, resource: str, params: Dict[str, Any],
+                          loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None):
+        """Cached value for (`resource`, `params`), calling `loader` at most once per miss."""
+        ttl = ttl if ttl is not None else RESOURCE_TTLS.get(resource, DEFAULT_TTL)
+        if self.redis is None:
+            ttl = min(ttl, CACHE_TTL_NO_REDIS)
+        key = cache_key(resource, params)
+
+        entry = self.l1.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                value = await asyncio.shield(inflight)
+                self.hits += 1
+                return value
+            except asyncio.CancelledError:
+                # The request running the query went away; load it ourselves
+                if not inflight.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(resource, key, loader, ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _load(self, resource: str, key: str, loader, ttl: float):
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(f"cache:{key}")
+                if cached is not None:
+                    self.hits += 1
+                    value = json.loads(cached)
+                    self.l1.set(key, value, ttl)
+                    return value
+            except Exception as e:
+                logger.warning(f"Redis read failed, falling back to the database: {e}")
+
+        self.misses += 1
+        generation = self._generations.get(resource, 0)
+        value = await loader()
+        if generation != self._generations.get(resource, 0):
+            return value
+        self.l1.set(key, value, ttl)
+
+        if self.redis is not None:
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.set(f"cache:{key}", json.dumps(value, default=str), ex=int(ttl))
+                    pipe.sadd(f"cache:keys:{resource}", f"cache:{key}")
+                    pipe.expire(f"cache:keys:{resource}", int(ttl))
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis write failed: {e}")
+        return value
+
+    async def invalidate(self, resource: str):
+        """Drop every cached response for `resource`, here and (via Redis) everywhere."""
+        self._drop_local(resource)
+        if self.redis is None:
+            return
+        try:
+            index = f"cache:keys:{resource}"
+            keys = await self.redis.smembers(index)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                if keys:
+                    pipe.delete(*keys)
+                pipe.delete(index)
+                pipe.publish(CACHE_CHANNEL, resource)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis invalidation for {resource} failed: {e}")
+
+    def warn_if_local(self, role: str):
+        """Log that invalidations cannot cross processes when there is no Redis."""
+        if self.redis is not None:
+            return
+        reason = "the redis package is not installed" if REDIS_URL else "REDIS_URL is not set"
+        logger.warning(f"{reason}: the {role} cannot exchange cache invalidations with the other process; "
+                       f"cached responses expire within {CACHE_TTL_NO_REDIS}s and in-memory snapshots "
+                       f"only refresh on their timers")
+
+    def on_invalidate(self, callback: Callable[[str], None]):
+        """Call `callback(resource)` whenever `resource` is invalidated in this process."""
+        self._observers.append(callback)
+
+    def _drop_local(self, resource: str):
+        self._generations[resource] = self._generations.get(resource, 0) + 1
+        self.l1.drop_prefix(f"{resource}:")
+        for callback in self._observers:
+            callback(resource)
+
+    async def start(self):
+        """Listen for invalidations published by other processes (a warning without Redis)."""
+        if self.redis is None:
+            self.warn_if_local("API")
+            return
+        if self._listener is not None:
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(CACHE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        resource = message["data"]
+                        if isinstance(resource, bytes):
+                            resource = resource.decode()
+                        self._drop_local(resource)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed ({e}); reconnecting")
+                await asyncio.sleep(5)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self.redis is not None:
+            await self.redis.aclose()
+
+
+# Shared by the routers (reads) and the ingest engine (invalidation)
+response_cache = ResponseCache()
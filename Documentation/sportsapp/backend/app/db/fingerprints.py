@@ -0,0 +1,123 @@
+"""
+Change detection for the ingest jobs.
+
+Each ingested row is reduced to a fingerprint (a hash of its normalized
+contents) and remembered per table and ``ext_ref`` in a small local SQLite
+file. On the next run only rows whose fingerprint changed are sent to
+Supabase, so a steady-state run that re-reads 30 unchanged teams writes
+nothing at all.
+
+Fingerprints older than ``INGEST_FINGERPRINT_MAX_AGE`` seconds (default one
+day) count as changed, so every row is still rewritten periodically and a
+manual edit in the database cannot go unnoticed forever.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+Row = Dict[str, Any]
+
+DEFAULT_FINGERPRINT_DB = os.getenv(
+    "INGEST_FINGERPRINT_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "fanalytics", "ingest_fingerprints.sqlite3"),
+)
+DEFAULT_MAX_AGE = float(os.getenv("INGEST_FINGERPRINT_MAX_AGE", str(24 * 60 * 60)))
+
+# Keys per lookup query; SQLite caps bound parameters at 999 on older builds
+_QUERY_CHUNK = 500
+
+
+def fingerprint(row: Row) -> str:
+    """Stable hash of a row: key order, surrounding whitespace and '' vs None do not matter."""
+    normalized = {}
+    for key, value in row.items():
+        if isinstance(value, str):
+            value = value.strip() or None
+        normalized[key] = value
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class ChangeSet:
+    """Rows split by what the last successful run saw for their key."""
+    inserted: List[Row] = field(default_factory=list)
+    updated: List[Row] = field(default_factory=list)
+    skipped: int = 0
+
+    @property
+    def changed(self) -> List[Row]:
+        return self.inserted + self.updated
+
+
+class FingerprintStore:
+    """Per-table ``ext_ref -> fingerprint`` map persisted in SQLite."""
+
+    def __init__(self, path: str = DEFAULT_FINGERPRINT_DB, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, digest TEXT NOT NULL,"
+            " updated_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def _known(self, namespace: str, keys: Sequence[str]) -> Dict[str, tuple]:
+        known = {}
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[start:start + _QUERY_CHUNK]
+            rows = self._conn.execute(
+                "SELECT key, digest, updated_at FROM fingerprints"
+                f" WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                (namespace, *chunk),
+            )
+            known.update((key, (digest, updated_at)) for key, digest, updated_at in rows)
+        return known
+
+    def diff(self, namespace: str, rows: Sequence[Row], key: str = "ext_ref") -> ChangeSet:
+        """Split `rows` into inserted / updated / unchanged against the stored fingerprints."""
+        with self._lock:
+            known = self._known(namespace, list({str(row.get(key)) for row in rows}))
+        now = time.time()
+        changes = ChangeSet()
+        for row in rows:
+            stored = known.get(str(row.get(key)))
+            if stored is None:
+                changes.inserted.append(row)
+            elif stored[0] != fingerprint(row) or (
+                self.max_age is not None and now - stored[1] > self.max_age
+            ):
+                changes.updated.append(row)
+            else:
+                changes.skipped += 1
+        return changes
+
+    def record(self, namespace: str, rows: Iterable[Row], key: str = "ext_ref"):
+        """Remember `rows` as written; call only with rows the database accepted."""
+        now = time.time()
+        values = [(namespace, str(row.get(key)), fingerprint(row), now) for row in rows]
+        if not values:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints (namespace, key, digest, updated_at)"
+                " VALUES (?, ?, ?, ?)",
+                values,
+            )
+            self._conn.commit()
+
+    def forget(self, namespace: str):
+        """Drop a table's fingerprints so its next run rewrites every row."""
+        with self._lock:
+            self._conn.execute("DELETE FROM fingerprints WHERE namespace = ?", (namespace,))
+            self._conn.commit()
@@ -0,0 +1,280 @@
+"""
+In-memory latest-value index of betting lines for the ``/odds`` router.
+
+The ingest worker (``jobs/odds.py``) writes each changed quote twice: an
+append-only row in ``odds_history`` and an upsert into ``odds_latest``,
+which holds one row per (event, market, book, outcome). Each API process
+mirrors ``odds_latest`` here, so a current-line read is a few dictionary
+lookups and never touches the history table:
+
+- quotes are grouped per event as (market, outcome) -> {book: quote}
+- an event's best lines (best number, then best price, across books) are
+  computed when one of its quotes changes and cached until the next change
+- refreshes pull only rows whose ``updated_at`` moved (re-reading a short
+  overlap window, see ``Repository.scan``), on ingest invalidations of
+  ``odds`` and every ``ODDS_REFRESH_SECONDS``; a full reload every
+  ``ODDS_FULL_RELOAD_SECONDS`` drops rows deleted upstream
+
+Events that started more than ``ODDS_EVENT_WINDOW_HOURS`` ago are evicted
+after every refresh, so memory and ``lines()`` scale with the events on
+the board, not with the season. Line movement is read from ``odds_history`` and downsampled into
+time buckets by ``downsample``.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sportsapp.backend.app.db.refresher import BackgroundRefresh
+from sportsapp.backend.app.db.repository import ODDS_FIELDS, Repository, repository
+
+ODDS_BOARD_ENABLED = os.getenv("ODDS_BOARD_ENABLED", "1") == "1"
+ODDS_REFRESH_SECONDS = float(os.getenv("ODDS_REFRESH_SECONDS", "15"))
+ODDS_FULL_RELOAD_SECONDS = float(os.getenv("ODDS_FULL_RELOAD_SECONDS", "3600"))
+ODDS_EVENT_WINDOW_HOURS = float(os.getenv("ODDS_EVENT_WINDOW_HOURS", "6"))
+
+# History bucket sizes accepted by /odds/{event}/history
+BUCKETS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "6h": 21600, "1d": 86400}
+
+Row = Dict[str, Any]
+
+
+def parse_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def line_value(market: str, outcome: str, point: Optional[float], price: Optional[float]) -> Tuple[float, float]:
+    """Sort key where larger is better for the bettor: the number first, then the (American) price."""
+    number = 0.0
+    if point is not None:
+        if market == "spreads":
+            number = point
+        elif market == "totals":
+            # Over wants a low total, under a high one
+            number = -point if outcome.lower() == "over" else point
+    return number, price if price is not None else float("-inf")
+
+
+class Quote:
+    __slots__ = ODDS_FIELDS
+
+    def __init__(self, row: Row):
+        for field in ODDS_FIELDS:
+            setattr(self, field, row.get(field))
+
+    def line(self) -> Row:
+        return {"outcome": self.outcome, "price": self.price, "point": self.point, "book": self.book,
+                "recorded_at": self.recorded_at}
+
+
+class EventLines:
+    """Current quotes for one event and its cached best lines."""
+
+    __slots__ = ("event_ref", "sport", "home_team", "away_team", "commence_time", "starts", "quotes", "_summary")
+
+    def __init__(self, quote: Quote):
+        self.event_ref = quote.event_ref
+        self.sport = quote.sport
+        self.home_team = quote.home_team
+        self.away_team = quote.away_team
+        self.commence_time = quote.commence_time
+        self.starts = parse_time(quote.commence_time)
+        # (market, outcome) -> {book: quote}
+        self.quotes: Dict[Tuple[str, str], Dict[str, Quote]] = {}
+        self._summary: Optional[Row] = None
+
+    def put(self, quote: Quote):
+        self.quotes.setdefault((quote.market, quote.outcome), {})[quote.book] = quote
+        if quote.commence_time != self.commence_time:
+            # Rescheduled
+            self.commence_time = quote.commence_time
+            self.starts = parse_time(quote.commence_time)
+        self._summary = None
+
+    def summary(self) -> Row:
+        """The event with the best line per market outcome across books."""
+        if self._summary is None:
+            markets: Dict[str, List[Row]] = {}
+            for (market, outcome), books in sorted(self.quotes.items()):
+                best = max(books.values(), key=lambda q: line_value(market, outcome, q.point, q.price))
+                markets.setdefault(market, []).append({**best.line(), "books": len(books)})
+            self._summary = {
+                "event_ref": self.event_ref, "sport": self.sport, "home_team": self.home_team,
+                "away_team": self.away_team, "commence_time": self.commence_time, "markets": markets,
+            }
+        return self._summary
+
+    def detail(self) -> Row:
+        """Best lines plus every book's current quotes."""
+        books: Dict[str, Dict[str, List[Row]]] = {}
+        for (market, _), quotes in sorted(self.quotes.items()):
+            for book, quote in quotes.items():
+                books.setdefault(book, {}).setdefault(market, []).append(quote.line())
+        return {**self.summary(), "books": books}
+
+
+class OddsBoard(BackgroundRefresh):
+    """Latest-value index of ``odds_latest``, refreshed incrementally."""
+
+    label = "Odds board"
+    resources = ("odds",)
+    enabled = ODDS_BOARD_ENABLED
+    refresh_seconds = ODDS_REFRESH_SECONDS
+    full_reload_seconds = ODDS_FULL_RELOAD_SECONDS
+
+    def __init__(self, repo: Optional[Repository] = repository):
+        super().__init__()
+        self.repo = repo
+        self.events: Dict[str, EventLines] = {}
+        self.by_sport: Dict[str, Set[str]] = {}
+        self.high_water: Optional[str] = None
+        self.loaded = False
+        self._order: Dict[str, List[str]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded
+
+    def apply(self, rows: Iterable[Row]) -> int:
+        """Fold `rows` of ``odds_latest`` in; returns how many changed a quote."""
+        applied = 0
+        for row in rows:
+            stamp = row.get("updated_at")
+            if stamp is not None and (self.high_water is None or str(stamp) > self.high_water):
+                self.high_water = str(stamp)
+            event = self.events.get(row.get("event_ref"))
+            if event is not None:
+                current = event.quotes.get((row.get("market"), row.get("outcome")), {}).get(row.get("book"))
+                if current is not None and all(getattr(current, f) == row.get(f) for f in ODDS_FIELDS):
+                    # Re-read from the scan's overlap window, unchanged
+                    continue
+            quote = Quote(row)
+            if event is None:
+                event = self.events[quote.event_ref] = EventLines(quote)
+                self.by_sport.setdefault(quote.sport, set()).add(quote.event_ref)
+            event.put(quote)
+            self._order.pop(event.sport, None)
+            applied += 1
+        return applied
+
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """Drop events that started more than ``ODDS_EVENT_WINDOW_HOURS`` ago; returns how many."""
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=ODDS_EVENT_WINDOW_HOURS)
+        stale = [ref for ref, event in self.events.items() if event.starts is not None and event.starts < cutoff]
+        for ref in stale:
+            event = self.events.pop(ref)
+            refs = self.by_sport.get(event.sport)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del self.by_sport[event.sport]
+            self._order.pop(event.sport, None)
+        return len(stale)
+
+    async def refresh(self, full: bool = False) -> int:
+        """Pull changed rows (every row when `full`); the new state is swapped in whole."""
+        target = self if (self.loaded and not full) else OddsBoard(self.repo)
+        changed = 0
+        async for page in self.repo.scan("odds_latest", (*ODDS_FIELDS, "updated_at"),
+                                         since=None if target is not self else self.high_water):
+            changed += target.apply(page)
+        target.evict()
+        if target is not self:
+            self.events, self.by_sport, self._order = target.events, target.by_sport, target._order
+            self.high_water = target.high_water
+            self.loaded = True
+        return changed
+
+    def describe(self, changed: int, full: bool) -> Optional[str]:
+        if full:
+            return f"loaded: {changed} quotes for {len(self.events)} events"
+        return None
+
+    def _sport_order(self, sport: str) -> List[str]:
+        order = self._order.get(sport)
+        if order is None:
+            far = datetime.max.replace(tzinfo=timezone.utc)
+            order = self._order[sport] = sorted(
+                self.by_sport.get(sport, ()), key=lambda ref: (self.events[ref].starts or far, ref)
+            )
+        return order
+
+    def lines(self, sport: Optional[str] = None, market: Optional[str] = None, limit: int = 50) -> List[Row]:
+        """Best lines for upcoming and in-progress events, soonest first."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=ODDS_EVENT_WINDOW_HOURS)
+        sports = [sport] if sport else sorted(s for s in self.by_sport if s)
+        found = []
+        for name in sports:
+            for ref in self._sport_order(name):
+                event = self.events[ref]
+                if event.starts is not None and event.starts < cutoff:
+                    continue
+                found.append(event)
+        if not sport:
+            far = datetime.max.replace(tzinfo=timezone.utc)
+            found.sort(key=lambda e: (e.starts or far, e.event_ref))
+        rows = []
+        for event in found:
+            summary = event.summary()
+            if market:
+                if market not in summary["markets"]:
+                    continue
+                summary = {**summary, "markets": {market: summary["markets"][market]}}
+            rows.append(summary)
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def event(self, event_ref: str) -> Optional[Row]:
+        event = self.events.get(event_ref)
+        return event.detail() if event is not None else None
+
+
+def board_from_rows(rows: Iterable[Row]) -> OddsBoard:
+    """A throwaway board over already-fetched ``odds_latest`` rows (used until the shared one is loaded)."""
+    board = OddsBoard(repo=None)
+    board.apply(rows)
+    board.loaded = True
+    return board
+
+
+def downsample(rows: Iterable[Row], seconds: int) -> List[Row]:
+    """Price moves per (book, outcome) grouped into `seconds`-wide buckets.
+
+    Each bucket gives the open/high/low/close price, the closing number and
+    how many changes it saw. History only stores changes, so a bucket with
+    no change is omitted and the previous close still holds.
+    """
+    series: Dict[Tuple[str, str], Dict[int, Row]] = {}
+    for row in sorted(rows, key=lambda r: (str(r.get("recorded_at")), r.get("id") or 0)):
+        stamp = parse_time(row.get("recorded_at"))
+        if stamp is None:
+            continue
+        bucket = int(stamp.timestamp()) // seconds * seconds
+        price = row.get("price")
+        buckets = series.setdefault((row.get("book"), row.get("outcome")), {})
+        point = buckets.get(bucket)
+        if point is None:
+            buckets[bucket] = {"t": datetime.fromtimestamp(bucket, timezone.utc).isoformat(),
+                               "open": price, "high": price, "low": price, "close": price,
+                               "point": row.get("point"), "changes": 1}
+            continue
+        if price is not None:
+            point["high"] = price if point["high"] is None else max(point["high"], price)
+            point["low"] = price if point["low"] is None else min(point["low"], price)
+        point["close"] = price
+        point["point"] = row.get("point")
+        point["changes"] += 1
+    return [
+        {"book": book, "outcome": outcome, "points": [buckets[b] for b in sorted(buckets)]}
+        for (book, outcome), buckets in sorted(series.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1])))
+    ]
+
+
+# Shared by the odds router
+odds_board = OddsBoard()
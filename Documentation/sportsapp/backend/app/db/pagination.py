@@ -0,0 +1,76 @@
+"""
+Keyset pagination and field projection for the list endpoints.
+
+A page is fetched as ``limit + 1`` rows ordered by the resource's key
+(``id`` for teams/players, ``(start_time, id)`` for events). If the extra
+row came back there is a next page, and its cursor is the key of the last
+row returned, encoded as opaque URL-safe base64. The next query filters
+``key > cursor`` instead of skipping rows, so page 50 costs the same as
+page 1.
+
+``fields=`` narrows the selected columns to a whitelisted subset; key
+columns are always fetched (the cursor needs them) and dropped from the
+output if they were not requested. ``expand=`` names related rows to embed
+in the same query (see ``EVENT_EMBEDS`` in ``db/repository.py``).
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Row = Dict[str, Any]
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> Dict[str, Any]:
+    """Key values from a cursor; ValueError if it is malformed or for another resource."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, dict) or set(values) != set(keys):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Requested columns in `allowed` order (all of them when `fields` is empty)."""
+    if not fields:
+        return list(allowed)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})")
+    return [f for f in allowed if f in requested]
+
+
+def parse_expand(expand: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Requested embedded resources in `allowed` order (none when `expand` is empty)."""
+    if not expand:
+        return []
+    requested = {e.strip() for e in expand.split(",") if e.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown expand: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})")
+    return [e for e in allowed if e in requested]
+
+
+def select_columns(columns: Sequence[str], keys: Sequence[str]) -> str:
+    """PostgREST select list: the key columns plus `columns`, without repeats."""
+    return ", ".join(dict.fromkeys([*keys, *columns]))
+
+
+def paginate(rows: List[Row], limit: int, keys: Sequence[str],
+             columns: Sequence[str]) -> Tuple[List[Row], Optional[str]]:
+    """Trim a ``limit + 1`` fetch to one page and its next cursor, projected to `columns`."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({k: rows[-1].get(k) for k in keys})
+    if any(k not in columns for k in keys):
+        rows = [{c: row.get(c) for c in columns} for row in rows]
+    return rows, next_cursor
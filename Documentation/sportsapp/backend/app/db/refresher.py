@@ -0,0 +1,70 @@
+"""
+Background refresh loop for the in-memory read models (``db/snapshot.py``,
+``db/odds.py``).
+
+A model loads in full when it starts and again every
+``full_reload_seconds`` (which drops rows deleted upstream). In between it
+pulls only what changed, every ``refresh_seconds`` or sooner when an
+ingest invalidation pokes one of its ``resources``. A failed refresh is
+logged and retried on the next tick; readers keep the last good state.
+"""
+import asyncio
+import logging
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresh:
+    """Base for a read model refreshed by a background task; subclasses implement ``refresh``."""
+
+    label = "Read model"
+    resources: Tuple[str, ...] = ()
+    enabled = True
+    refresh_seconds = 60.0
+    full_reload_seconds = 3600.0
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    async def refresh(self, full: bool = False) -> Any:
+        raise NotImplementedError
+
+    def describe(self, changed: Any, full: bool) -> Optional[str]:
+        """Log line for a refresh that returned `changed`, or None to stay quiet."""
+        return None
+
+    def poke(self, resource: str):
+        """Refresh soon (an ingest run changed `resource`)."""
+        if resource in self.resources:
+            self._wake.set()
+
+    async def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        last_full = None
+        while True:
+            full = last_full is None or loop.time() - last_full >= self.full_reload_seconds
+            try:
+                changed = await self.refresh(full)
+                if full:
+                    last_full = loop.time()
+                message = self.describe(changed, full)
+                if message:
+                    logger.info(f"{self.label} {message}")
+            except Exception as e:
+                logger.warning(f"{self.label} refresh failed: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
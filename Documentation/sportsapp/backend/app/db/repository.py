@@ -0,0 +1,279 @@
+"""
+Async read repository for the API routers.
+
+The ``supabase`` client used by ``connection.py`` is synchronous, so calling
+``.execute()`` inside an ``async def`` route blocks the event loop for the
+whole round-trip. This module talks to the same PostgREST endpoint through
+``postgrest.AsyncPostgrestClient`` on a pooled ``httpx.AsyncClient``, so a
+single uvicorn worker can have many queries in flight.
+
+Pool size, keep-alive and timeout come from ``DB_POOL_SIZE``,
+``DB_POOL_KEEPALIVE`` and ``DB_TIMEOUT``.
+
+Incremental reads (``scan(since=...)``) rely on writers stamping
+``updated_at`` on every upsert. The ingest worker stamps rows just before
+it sends them, so a batch can commit after a reader has already seen later
+stamps. Each scan therefore re-reads ``SCAN_OVERLAP_SECONDS`` before
+`since` (``overlap_since`` in ``db/scan.py``); readers apply rows by id,
+so seeing one twice is harmless.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import httpx
+from postgrest import AsyncPostgrestClient
+
+from sportsapp.backend.app.db.connection import SUPABASE_ANON_KEY, SUPABASE_URL
+from sportsapp.backend.app.db.pagination import select_columns
+from sportsapp.backend.app.db.scan import overlap_since
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_POOL_KEEPALIVE = int(os.getenv("DB_POOL_KEEPALIVE", "10"))
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "10"))
+
+TEAM_FIELDS = ("id", "sport", "name", "short_name", "market")
+PLAYER_FIELDS = ("id", "sport", "first_name", "last_name", "position", "status", "team_id")
+EVENT_FIELDS = ("id", "sport", "season", "start_time", "venue", "status", "home_team_id", "away_team_id")
+
+# Keyset order per resource (see db/pagination.py)
+TEAM_KEYS = ("id",)
+PLAYER_KEYS = ("id",)
+EVENT_KEYS = ("start_time", "id")
+
+# expand= names -> {output key: foreign key column}, each joined to teams
+# through a PostgREST embedded resource in the same query
+EMBED_TEAM_FIELDS = ("id", "sport", "name", "short_name")
+EVENT_EMBEDS = {"teams": {"home_team": "home_team_id", "away_team": "away_team_id"}}
+PLAYER_EMBEDS = {"team": {"team": "team_id"}}
+
+STANDINGS_COLUMNS = ("rank, team_id, wins, losses, ties, win_pct, games_back, points_for, points_against, "
+                     "point_diff, home_record, away_record, streak, last10, updated_at")
+
+# odds_latest: one row per (event_ref, market, book, outcome); odds_history: every change (jobs/odds.py)
+ODDS_FIELDS = ("id", "event_ref", "sport", "home_team", "away_team", "commence_time", "market", "book", "outcome",
+               "price", "point", "recorded_at")
+ODDS_HISTORY_FIELDS = ("id", "market", "book", "outcome", "price", "point", "recorded_at")
+ODDS_HISTORY_MAX_ROWS = int(os.getenv("ODDS_HISTORY_MAX_ROWS", "20000"))
+
+# Per-user alerts (jobs/alerts.py); row level security limits both tables to auth.uid()
+# kind -> entity types it can follow
+ALERT_KINDS = {
+    "game_start": ("event", "team"),
+    "game_final": ("event", "team"),
+    "player_status": ("player",),
+    "line_move": ("event",),
+}
+DEFAULT_LINE_MARKET = "spreads"
+ALERT_FIELDS = ("id", "kind", "entity_type", "entity_id", "threshold", "market", "book", "active", "created_at")
+ALERT_DELIVERY_FIELDS = ("id", "subscription_id", "kind", "entity_type", "entity_id", "payload", "created_at")
+
+Row = Dict[str, Any]
+
+
+def embed_keys(embeds: Dict[str, Dict[str, str]], expand: Sequence[str]) -> List[str]:
+    """Output keys added to each row by the `expand` names."""
+    return [key for name in expand for key in embeds[name]]
+
+
+def _select(columns: Sequence[str], keys: Sequence[str], embeds: Dict[str, Dict[str, str]],
+            expand: Sequence[str]) -> str:
+    """Select list with each expanded foreign key embedded as ``key:teams!fk(...)``."""
+    team_columns = ", ".join(EMBED_TEAM_FIELDS)
+    joins = [f"{key}:teams!{fk}({team_columns})" for name in expand for key, fk in embeds[name].items()]
+    return ", ".join([select_columns(columns, keys), *joins])
+
+
+class Repository:
+    """Read queries against Supabase's PostgREST API without blocking the event loop."""
+
+    def __init__(self, url: str, key: str, pool_size: int = DB_POOL_SIZE,
+                 keepalive: int = DB_POOL_KEEPALIVE, timeout: float = DB_TIMEOUT):
+        self.rest_url = f"{url.rstrip('/')}/rest/v1"
+        self.headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self._client: Optional[AsyncPostgrestClient] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def client(self) -> AsyncPostgrestClient:
+        """The PostgREST client for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._http = httpx.AsyncClient(
+                base_url=self.rest_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.keepalive),
+            )
+            self._client = AsyncPostgrestClient(self.rest_url, headers=self.headers, http_client=self._http)
+            self._loop = loop
+        return self._client
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+        self._client = None
+        self._http = None
+        self._loop = None
+
+    def as_user(self, token: str) -> AsyncPostgrestClient:
+        """A client that runs queries as the user behind `token` (their RLS policies apply),
+        sharing this repository's connection pool."""
+        self.client()
+        return AsyncPostgrestClient(self.rest_url, headers={**self.headers, "Authorization": f"Bearer {token}"},
+                                    http_client=self._http)
+
+    async def scan(self, table: str, columns: Sequence[str], since: Optional[str] = None,
+                   page_size: int = 1000, where: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Row]]:
+        """Yield every row of `table` (optionally only those updated since about `since`, see
+        ``overlap_since``, or equal to `where`) in id-ordered pages."""
+        last_id = None
+        while True:
+            query = self.client().from_(table).select(", ".join(columns))
+            if since is not None:
+                query = query.gte("updated_at", overlap_since(since))
+            for column, value in (where or {}).items():
+                query = query.eq(column, value)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            res = await query.order("id").limit(page_size).execute()
+            if res.data:
+                yield res.data
+            if len(res.data) < page_size:
+                return
+            last_id = res.data[-1]["id"]
+
+    async def list_teams(self, sport: Optional[str] = None, name: Optional[str] = None,
+                         limit: int = 50, after: Optional[Row] = None,
+                         columns: Sequence[str] = TEAM_FIELDS) -> List[Row]:
+        query = self.client().from_("teams").select(select_columns(columns, TEAM_KEYS))
+        if sport:
+            query = query.eq("sport", sport)
+        if name:
+            query = query.ilike("name", f"%{name}%")
+        if after:
+            query = query.gt("id", after["id"])
+        res = await query.order("id").limit(limit).execute()
+        return res.data
+
+    async def list_players(self, sport: Optional[str] = None, team_id: Optional[int] = None,
+                           name: Optional[str] = None, limit: int = 50, after: Optional[Row] = None,
+                           columns: Sequence[str] = PLAYER_FIELDS, expand: Sequence[str] = ()) -> List[Row]:
+        query = self.client().from_("players").select(_select(columns, PLAYER_KEYS, PLAYER_EMBEDS, expand))
+        if sport:
+            query = query.eq("sport", sport)
+        if team_id:
+            query = query.eq("team_id", team_id)
+        if name:
+            query = query.ilike("last_name", f"%{name}%")
+        if after:
+            query = query.gt("id", after["id"])
+        res = await query.order("id").limit(limit).execute()
+        return res.data
+
+    async def list_events(self, sport: Optional[str] = None, status: Optional[str] = None,
+                          limit: int = 50, after: Optional[Row] = None,
+                          columns: Sequence[str] = EVENT_FIELDS, expand: Sequence[str] = ()) -> List[Row]:
+        query = self.client().from_("events").select(_select(columns, EVENT_KEYS, EVENT_EMBEDS, expand))
+        if sport:
+            query = query.eq("sport", sport)
+        if status:
+            query = query.eq("status", status)
+        if after:
+            # Rows after (start_time, id); events without a start time sort last
+            if after["start_time"] is None:
+                query = query.is_("start_time", "null").gt("id", after["id"])
+            else:
+                start = json.dumps(str(after["start_time"]))
+                query = query.or_(
+                    f"start_time.gt.{start},and(start_time.eq.{start},id.gt.{int(after['id'])}),start_time.is.null"
+                )
+        res = await (
+            query.order("start_time", nullsfirst=False).order("id").limit(limit).execute()
+        )
+        return res.data
+
+    async def get_standings(self, sport: str, season: Any) -> List[Row]:
+        """Precomputed standings for one season (see jobs/standings.py)."""
+        res = await (
+            self.client().from_("standings").select(STANDINGS_COLUMNS)
+            .eq("sport", sport).eq("season", season).order("rank").execute()
+        )
+        return res.data
+
+    async def get_leaderboard(self, sport: str, season: Any, stat: str) -> List[Row]:
+        res = await (
+            self.client().from_("leaderboards").select("rank, team_id, value, updated_at")
+            .eq("sport", sport).eq("season", season).eq("stat", stat).order("rank").execute()
+        )
+        return res.data
+
+    async def list_odds(self, sport: Optional[str] = None, event_ref: Optional[str] = None) -> List[Row]:
+        """Current quotes from odds_latest for a sport or one event."""
+        where = {k: v for k, v in (("sport", sport), ("event_ref", event_ref)) if v}
+        return [row async for page in self.scan("odds_latest", ODDS_FIELDS, where=where) for row in page]
+
+    async def get_odds_history(self, event_ref: str, market: str, book: Optional[str] = None,
+                               outcome: Optional[str] = None, since: Optional[str] = None,
+                               max_rows: int = ODDS_HISTORY_MAX_ROWS) -> List[Row]:
+        """Recorded line changes for one event market, oldest first, capped at `max_rows`."""
+        rows: List[Row] = []
+        last_id = None
+        while len(rows) < max_rows:
+            query = (
+                self.client().from_("odds_history").select(", ".join(ODDS_HISTORY_FIELDS))
+                .eq("event_ref", event_ref).eq("market", market)
+            )
+            if book:
+                query = query.eq("book", book)
+            if outcome:
+                query = query.eq("outcome", outcome)
+            if since:
+                query = query.gte("recorded_at", since)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            page_size = min(1000, max_rows - len(rows))
+            res = await query.order("id").limit(page_size).execute()
+            rows.extend(res.data)
+            if len(res.data) < page_size:
+                break
+            last_id = res.data[-1]["id"]
+        return rows
+
+    async def list_alerts(self, token: str, include_inactive: bool = False) -> List[Row]:
+        """The user's alert subscriptions, newest first."""
+        query = self.as_user(token).from_("alert_subscriptions").select(", ".join(ALERT_FIELDS))
+        if not include_inactive:
+            query = query.eq("active", True)
+        res = await query.order("id", desc=True).execute()
+        return res.data
+
+    async def create_alert(self, token: str, alert: Row) -> Row:
+        res = await self.as_user(token).from_("alert_subscriptions").insert(alert).execute()
+        return {field: res.data[0].get(field) for field in ALERT_FIELDS}
+
+    async def deactivate_alert(self, token: str, alert_id: int) -> bool:
+        """Switch a subscription off (kept so the matching engine sees the change); False if not found."""
+        res = await (
+            self.as_user(token).from_("alert_subscriptions")
+            .update({"active": False, "updated_at": datetime.now(timezone.utc).isoformat()}).eq("id", alert_id).execute()
+        )
+        return bool(res.data)
+
+    async def list_alert_deliveries(self, token: str, limit: int = 50, before: Optional[int] = None) -> List[Row]:
+        """The user's delivered alerts, newest first."""
+        query = self.as_user(token).from_("alert_deliveries").select(", ".join(ALERT_DELIVERY_FIELDS))
+        if before is not None:
+            query = query.lt("id", before)
+        res = await query.order("id", desc=True).limit(limit).execute()
+        return res.data
+
+
+# Public (anon key) repository shared by the routers, like supabase_anon
+repository = Repository(SUPABASE_URL, SUPABASE_ANON_KEY)
@@ -0,0 +1,55 @@
+"""
+Keyset-paged table reads for the ingest jobs.
+
+The jobs' in-memory state (odds lines, standings, alert subscriptions) is
+loaded with the sync service client from a worker thread. Pages are taken
+in ``id`` order with ``id > last`` instead of an offset, so a row written
+or updated while the read is running cannot shift the pages and be
+skipped, the same scheme as ``Repository.scan`` on the async side.
+
+Incremental reads (``since=``) re-read ``SCAN_OVERLAP_SECONDS`` before the
+last ``updated_at`` seen, since rows are stamped before their batch
+commits (see ``db/repository.py``).
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from supabase import Client
+
+# Longer than an ingest batch takes from stamping updated_at to committing
+SCAN_OVERLAP_SECONDS = float(os.getenv("SCAN_OVERLAP_SECONDS", "120"))
+
+Row = Dict[str, Any]
+
+
+def overlap_since(since: str) -> str:
+    """`since` moved back by ``SCAN_OVERLAP_SECONDS``."""
+    stamp = datetime.fromisoformat(str(since).replace("Z", "+00:00"))
+    return (stamp - timedelta(seconds=SCAN_OVERLAP_SECONDS)).isoformat()
+
+
+def scan_rows(db: Client, table: str, columns: Sequence[str], since: Optional[str] = None,
+              page_size: int = 1000, where: Optional[Dict[str, Any]] = None) -> List[Row]:
+    """Every row of `table` (optionally only those updated since about `since`, see
+    ``overlap_since``, or matching `where`: a list/tuple/set value is an ``in`` filter,
+    anything else ``eq``), read in id-ordered pages (runs in a worker thread)."""
+    select = ", ".join(columns if "id" in columns else ("id", *columns))
+    rows: List[Row] = []
+    last_id = None
+    while True:
+        query = db.table(table).select(select)
+        if since is not None:
+            query = query.gte("updated_at", overlap_since(since))
+        for column, value in (where or {}).items():
+            if isinstance(value, (list, tuple, set, frozenset)):
+                query = query.in_(column, sorted(value))
+            else:
+                query = query.eq(column, value)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        res = query.order("id").limit(page_size).execute()
+        rows.extend(res.data)
+        if len(res.data) < page_size:
+            return rows
+        last_id = res.data[-1]["id"]
@@ -0,0 +1,196 @@
+"""
+Fuzzy, ranked typeahead search over players and teams.
+
+Built from the reference snapshot (``db/snapshot.py``) so a keystroke never
+leaves the process. Every searchable term (player first/last name and
+nickname, team name words and short_name) is normalized (lowercase, accents
+and punctuation stripped) and split into padded trigrams::
+
+    "lebron" -> "  l", " le", "leb", "ebr", "bro", "ron", "on "
+
+The leading padding makes prefixes share grams with the full word, so
+"leb" already finds "lebron", and a typo only breaks the few grams around
+it, so "lebrn" still shares most of them. A query is answered in two steps:
+
+1. candidates: count shared grams per entry through the inverted index and
+   keep the ``CANDIDATES`` best
+2. ranking: score each query token against the entry's terms (exact >
+   prefix > bounded edit distance to the term or any prefix of it) and
+   average over tokens, so "james lebron" and "lebron ja" both rank
+   LeBron James first
+"""
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CANDIDATES = 64
+MIN_SCORE = 0.35
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase ASCII words separated by single spaces ("Jon 'Bones' Jones" -> "jon bones jones")."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def padded_grams(token: str) -> List[str]:
+    padded = f"  {token} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def prefix_distance(query: str, term: str) -> int:
+    """Smallest Levenshtein distance between `query` and any prefix of `term`.
+
+    Covers both a typo in a complete word ("lebrn" vs "lebron") and in a word
+    still being typed ("lebrn" vs "lebronx..."). Bit-parallel (Myers/Hyyrö):
+    one pass over `term` with a few integer operations per character.
+    """
+    m = len(query)
+    if m == 0:
+        return 0
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(query):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    pv, mv, score = mask, 0, m
+    best = m
+    for ch in term:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        if score < best:
+            best = score
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return best
+
+
+def token_score(query: str, term: str) -> float:
+    """How well one query token matches one term, 0..1."""
+    if query == term:
+        return 1.0
+    if term.startswith(query):
+        # Typeahead: longer prefixes are stronger evidence
+        return 0.75 + 0.2 * len(query) / len(term)
+    if len(query) < 3:
+        return 0.0
+    bound = 1 if len(query) <= 4 else 2
+    distance = prefix_distance(query, term)
+    if distance > bound:
+        return 0.0
+    return 0.7 - 0.2 * distance
+
+
+class SearchEntry:
+    __slots__ = ("kind", "id", "sport", "name", "team_id", "terms", "rank_bias")
+
+    def __init__(self, kind: str, id: Any, sport: Optional[str], name: str, terms: Sequence[str],
+                 team_id: Any = None, rank_bias: float = 0.0):
+        self.kind = kind
+        self.id = id
+        self.sport = sport
+        self.name = name
+        self.team_id = team_id
+        self.terms = tuple(dict.fromkeys(t for t in terms if t))
+        self.rank_bias = rank_bias
+
+
+def player_entry(record) -> SearchEntry:
+    name = " ".join(p for p in (record.first_name, record.last_name) if p)
+    terms = normalize(name).split() + normalize(getattr(record, "nickname", None)).split()
+    # Active players first when scores tie
+    bias = 0.0 if (record.status or "Active") == "Active" else -0.01
+    return SearchEntry("player", record.id, record.sport, name, terms, record.team_id, bias)
+
+
+def team_entry(record) -> SearchEntry:
+    terms = normalize(record.name).split() + normalize(record.short_name).split()
+    return SearchEntry("team", record.id, record.sport, record.name or "", terms)
+
+
+class SearchIndex:
+    """Immutable trigram index over search entries."""
+
+    def __init__(self, entries: Iterable[SearchEntry], team_names: Optional[Dict[Any, str]] = None):
+        self.entries: List[SearchEntry] = list(entries)
+        self.team_names = team_names or {}
+        self.grams: Dict[str, List[int]] = {}
+        for position, entry in enumerate(self.entries):
+            grams = set()
+            for term in entry.terms:
+                grams.update(padded_grams(term))
+            for gram in grams:
+                self.grams.setdefault(gram, []).append(position)
+
+    @classmethod
+    def from_records(cls, teams: Iterable[Any], players: Iterable[Any]) -> "SearchIndex":
+        teams = list(teams)
+        entries = [team_entry(t) for t in teams] + [player_entry(p) for p in players]
+        return cls(entries, {t.id: t.name for t in teams})
+
+    def search(self, query: str, limit: int = 10, sport: Optional[str] = None,
+               kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        tokens = normalize(query).split()
+        if not tokens:
+            return []
+
+        counts: Counter = Counter()
+        for token in tokens:
+            for gram in set(padded_grams(token)):
+                postings = self.grams.get(gram)
+                if postings:
+                    counts.update(postings)
+
+        scored = []
+        examined = 0
+        # Names repeat a lot ("james", "smith"), so score each (token, term) pair once
+        memo: Dict[Tuple[str, str], float] = {}
+        for position, _ in counts.most_common():
+            entry = self.entries[position]
+            if (sport and entry.sport != sport) or (kind and entry.kind != kind):
+                continue
+            examined += 1
+            if examined > CANDIDATES:
+                break
+            total = 0.0
+            for token in tokens:
+                best = 0.0
+                for term in entry.terms:
+                    score = memo.get((token, term))
+                    if score is None:
+                        score = memo[(token, term)] = token_score(token, term)
+                    if score > best:
+                        best = score
+                total += best
+            score = total / len(tokens) + entry.rank_bias
+            if score >= MIN_SCORE:
+                scored.append((score, -len(entry.name), position))
+
+        results = []
+        for score, _, position in heapq.nlargest(limit, scored):
+            entry = self.entries[position]
+            results.append({
+                "type": entry.kind,
+                "id": entry.id,
+                "sport": entry.sport,
+                "name": entry.name,
+                "team_id": entry.team_id,
+                "team": self.team_names.get(entry.team_id),
+                "score": round(score, 3),
+            })
+        return results
@@ -0,0 +1,234 @@
+"""
+In-memory, indexed snapshot of the teams and players tables.
+
+Both tables are small and only change when ingest writes, so each API
+process keeps a local copy and answers ``/teams`` and ``/players`` from it
+instead of sending a remote ``ilike '%x%'`` that no B-tree index can serve.
+
+- rows are ``__slots__`` records keyed by id, plus an id-sorted array
+- hash indexes map each filter value (sport, team_id) to its sorted ids
+- a trigram index maps every 3-character substring of the searched name
+  to the ids containing it; a query walks the shortest posting list among
+  its filters and trigrams and checks the rest on each candidate
+- a fuzzy search index over names and nicknames (``db/search.py``) for
+  ``/search``
+
+The snapshot loads in the background at startup; until it is ready the
+routers keep querying Supabase. Every ``SNAPSHOT_REFRESH_SECONDS`` (and on
+ingest invalidations, when Redis is configured) it pulls only rows whose
+``updated_at`` moved (the ingest worker stamps it on every write); a full
+reload every ``SNAPSHOT_FULL_RELOAD_SECONDS`` drops deleted rows. Indexes are rebuilt off to the side and swapped in
+whole, so readers never see a half-built index.
+"""
+import asyncio
+import logging
+import os
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sportsapp.backend.app.db.pagination import select_columns
+from sportsapp.backend.app.db.refresher import BackgroundRefresh
+from sportsapp.backend.app.db.repository import (
+    EMBED_TEAM_FIELDS, PLAYER_FIELDS, PLAYER_KEYS, TEAM_FIELDS, TEAM_KEYS, Repository, repository,
+)
+from sportsapp.backend.app.db.search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "1") == "1"
+SNAPSHOT_REFRESH_SECONDS = float(os.getenv("SNAPSHOT_REFRESH_SECONDS", "60"))
+SNAPSHOT_FULL_RELOAD_SECONDS = float(os.getenv("SNAPSHOT_FULL_RELOAD_SECONDS", "3600"))
+
+GRAM = 3
+Row = Dict[str, Any]
+
+
+class TeamRecord:
+    __slots__ = TEAM_FIELDS
+
+    def __init__(self, row: Row):
+        for field in TEAM_FIELDS:
+            setattr(self, field, row.get(field))
+
+
+# nickname is only used by search (db/search.py), not returned by /players
+SNAPSHOT_PLAYER_FIELDS = (*PLAYER_FIELDS, "nickname")
+
+
+class PlayerRecord:
+    __slots__ = SNAPSHOT_PLAYER_FIELDS
+
+    def __init__(self, row: Row):
+        for field in SNAPSHOT_PLAYER_FIELDS:
+            setattr(self, field, row.get(field))
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class TableIndex:
+    """Immutable indexes over one table's records."""
+
+    __slots__ = ("records", "ids", "groups", "search_field", "search_text", "grams")
+
+    def __init__(self, records: Dict[Any, Any], group_fields: Sequence[str], search_field: str):
+        self.records = records
+        self.ids = sorted(records)
+        self.search_field = search_field
+        self.groups: Dict[str, Dict[Any, List[Any]]] = {field: {} for field in group_fields}
+        self.search_text: Dict[Any, str] = {}
+        self.grams: Dict[str, List[Any]] = {}
+        for record_id in self.ids:
+            record = records[record_id]
+            for field, index in self.groups.items():
+                index.setdefault(getattr(record, field), []).append(record_id)
+            text = (getattr(record, search_field) or "").lower()
+            self.search_text[record_id] = text
+            for gram in trigrams(text):
+                self.grams.setdefault(gram, []).append(record_id)
+
+    def query(self, filters: Dict[str, Any], search: Optional[str], after: Any, limit: int) -> List[Any]:
+        """Records matching every filter and containing `search`, in id order after `after`."""
+        filters = {field: value for field, value in filters.items() if value is not None and value != ""}
+        postings = []
+        for field, value in filters.items():
+            postings.append(self.groups[field].get(value, []))
+
+        needle = search.lower() if search else None
+        if needle and len(needle) >= GRAM:
+            for gram in trigrams(needle):
+                postings.append(self.grams.get(gram, []))
+
+        # Walk the shortest posting list and check the remaining conditions
+        # directly; that is cheaper than intersecting the longer lists
+        candidates = min(postings, key=len) if postings else self.ids
+        start = bisect_right(candidates, after) if after is not None else 0
+        found = []
+        for record_id in candidates[start:]:
+            record = self.records[record_id]
+            if needle and needle not in self.search_text[record_id]:
+                continue
+            if any(getattr(record, field) != value for field, value in filters.items()):
+                continue
+            found.append(record)
+            if len(found) >= limit:
+                break
+        return found
+
+
+class SnapshotTable:
+    """One table's snapshot: records, indexes and refresh bookkeeping."""
+
+    def __init__(self, table: str, fields: Sequence[str], record_type, group_fields: Sequence[str],
+                 search_field: str):
+        self.table = table
+        self.fields = tuple(fields)
+        self.record_type = record_type
+        self.group_fields = tuple(group_fields)
+        self.search_field = search_field
+        self.index: Optional[TableIndex] = None
+        self.high_water: Optional[str] = None
+        self.incremental = True
+
+    async def load(self, repo: Repository, full: bool):
+        incremental = not full and self.index is not None and self.incremental
+        columns = (*self.fields, "updated_at") if self.incremental else self.fields
+        records = dict(self.index.records) if incremental else {}
+        high_water = self.high_water if incremental else None
+        changed = 0
+        try:
+            async for page in repo.scan(self.table, columns, since=high_water if incremental else None):
+                for row in page:
+                    stamp = row.get("updated_at")
+                    if stamp is not None and (high_water is None or str(stamp) > high_water):
+                        high_water = str(stamp)
+                    current = records.get(row["id"])
+                    if current is not None and all(getattr(current, f) == row.get(f) for f in self.fields):
+                        # Re-read from the scan's overlap window, unchanged
+                        continue
+                    records[row["id"]] = self.record_type(row)
+                    changed += 1
+        except Exception as e:
+            if self.incremental and "updated_at" in str(e):
+                # No updated_at column: fall back to full reloads every refresh
+                logger.warning(f"{self.table} has no usable updated_at ({e}); snapshot will reload fully")
+                self.incremental = False
+                return await self.load(repo, full=True)
+            raise
+
+        if changed or not incremental:
+            # Built in a thread so request handling keeps getting the GIL meanwhile
+            self.index = await asyncio.to_thread(TableIndex, records, self.group_fields, self.search_field)
+        self.high_water = high_water
+        return changed
+
+    def rows(self, filters: Dict[str, Any], search: Optional[str], after: Optional[Row], limit: int,
+             columns: Sequence[str], keys: Sequence[str]) -> List[Tuple[Any, Row]]:
+        """Matching (record, row) pairs, rows holding the key columns plus `columns`."""
+        selected = select_columns(columns, keys).split(", ")
+        records = self.index.query(filters, search, after["id"] if after else None, limit)
+        return [(record, {field: getattr(record, field) for field in selected}) for record in records]
+
+
+class ReferenceSnapshot(BackgroundRefresh):
+    """Teams and players answered locally, with the same interface as the repository."""
+
+    label = "Reference snapshot"
+    resources = ("teams", "players")
+    enabled = SNAPSHOT_ENABLED
+    refresh_seconds = SNAPSHOT_REFRESH_SECONDS
+    full_reload_seconds = SNAPSHOT_FULL_RELOAD_SECONDS
+
+    def __init__(self, repo: Repository = repository):
+        super().__init__()
+        self.repo = repo
+        self.teams = SnapshotTable("teams", TEAM_FIELDS, TeamRecord, ("sport",), "name")
+        self.players = SnapshotTable("players", SNAPSHOT_PLAYER_FIELDS, PlayerRecord, ("sport", "team_id"), "last_name")
+        self.search_index: Optional[SearchIndex] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.search_index is not None
+
+    async def refresh(self, full: bool = False) -> Tuple[int, int]:
+        """Pull changes for both tables; returns the number of rows fetched for each."""
+        changed = (await self.teams.load(self.repo, full), await self.players.load(self.repo, full))
+        if any(changed) or self.search_index is None:
+            self.search_index = await asyncio.to_thread(
+                SearchIndex.from_records, self.teams.index.records.values(), self.players.index.records.values()
+            )
+        return changed
+
+    def describe(self, changed: Tuple[int, int], full: bool) -> Optional[str]:
+        teams, players = changed
+        if full:
+            return f"loaded: {len(self.teams.index.ids)} teams, {len(self.players.index.ids)} players"
+        if teams or players:
+            return f"refreshed: {teams} teams, {players} players changed"
+        return None
+
+    async def list_teams(self, sport: Optional[str] = None, name: Optional[str] = None,
+                         limit: int = 50, after: Optional[Row] = None,
+                         columns: Sequence[str] = TEAM_FIELDS) -> List[Row]:
+        return [row for _, row in self.teams.rows({"sport": sport}, name, after, limit, columns, TEAM_KEYS)]
+
+    async def list_players(self, sport: Optional[str] = None, team_id: Optional[int] = None,
+                           name: Optional[str] = None, limit: int = 50, after: Optional[Row] = None,
+                           columns: Sequence[str] = PLAYER_FIELDS, expand: Sequence[str] = ()) -> List[Row]:
+        matches = self.players.rows({"sport": sport, "team_id": team_id}, name, after, limit, columns, PLAYER_KEYS)
+        if "team" in expand:
+            # Same shape as the PostgREST embed in Repository.list_players
+            teams = self.teams.index.records
+            for record, row in matches:
+                team = teams.get(record.team_id)
+                row["team"] = {f: getattr(team, f) for f in EMBED_TEAM_FIELDS} if team else None
+        return [row for _, row in matches]
+
+    def search(self, query: str, limit: int = 10, sport: Optional[str] = None,
+               kind: Optional[str] = None) -> List[Row]:
+        return self.search_index.search(query, limit=limit, sport=sport, kind=kind)
+
+
+# Shared by the teams/players/search routers
+snapshot = ReferenceSnapshot()
@@ -0,0 +1,98 @@
+"""
+Batched upserts for the ingest jobs.
+
+Rows are sent to Supabase in chunks (one PostgREST request per chunk instead
+of one per row), optionally with several chunks in flight at once. When a
+chunk is rejected it is bisected until the offending rows are isolated, so
+one bad record costs a few extra requests instead of aborting the run.
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+DEFAULT_PARALLEL_BATCHES = int(os.getenv("INGEST_PARALLEL_BATCHES", "2"))
+
+Row = Dict[str, Any]
+
+
+@dataclass
+class UpsertResult:
+    """Outcome of a batched upsert: how many rows landed and which did not."""
+    succeeded: int = 0
+    failed: List[Tuple[Row, str]] = field(default_factory=list)
+    requests: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + len(self.failed)
+
+
+def _dedupe(rows: Sequence[Row], on_conflict: str) -> List[Row]:
+    """Keep the last row per conflict key; Postgres rejects a batch that hits a key twice."""
+    keys = [k.strip() for k in on_conflict.split(",")]
+    by_key: Dict[Tuple, Row] = {}
+    for row in rows:
+        by_key[tuple(row.get(k) for k in keys)] = row
+    return list(by_key.values())
+
+
+def _upsert_chunk(db: Client, table: str, rows: List[Row], on_conflict: str, result: UpsertResult,
+                  ignore_duplicates: bool = False):
+    """Upsert one chunk, bisecting on failure down to single rows (runs in a worker thread)."""
+    result.requests += 1
+    try:
+        db.table(table).upsert(rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates).execute()
+        result.succeeded += len(rows)
+        return
+    except Exception as e:
+        if len(rows) == 1:
+            result.failed.append((rows[0], str(e)))
+            return
+        logger.warning(f"Batch of {len(rows)} rows into {table} failed ({e}); bisecting")
+
+    middle = len(rows) // 2
+    _upsert_chunk(db, table, rows[:middle], on_conflict, result, ignore_duplicates)
+    _upsert_chunk(db, table, rows[middle:], on_conflict, result, ignore_duplicates)
+
+
+async def batched_upsert(
+    db: Client,
+    table: str,
+    rows: Sequence[Row],
+    on_conflict: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    parallel: int = DEFAULT_PARALLEL_BATCHES,
+    ignore_duplicates: bool = False,
+) -> UpsertResult:
+    """Upsert `rows` into `table` in chunks of `batch_size`, `parallel` chunks at a time.
+
+    The synchronous Supabase calls run in worker threads so the event loop keeps
+    serving other jobs while a chunk is in flight. With `ignore_duplicates`,
+    rows whose conflict key already exists are left untouched (insert-only).
+    """
+    rows = _dedupe(rows, on_conflict)
+    result = UpsertResult()
+    if not rows:
+        return result
+
+    semaphore = asyncio.Semaphore(max(1, parallel))
+
+    async def run(chunk: List[Row]):
+        async with semaphore:
+            chunk_result = UpsertResult()
+            await asyncio.to_thread(_upsert_chunk, db, table, chunk, on_conflict, chunk_result, ignore_duplicates)
+            return chunk_result
+
+    chunks = [list(rows[i:i + batch_size]) for i in range(0, len(rows), batch_size)]
+    for chunk_result in await asyncio.gather(*(run(chunk) for chunk in chunks)):
+        result.succeeded += chunk_result.succeeded
+        result.failed.extend(chunk_result.failed)
+        result.requests += chunk_result.requests
+    return result
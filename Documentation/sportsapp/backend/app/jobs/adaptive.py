@@ -0,0 +1,140 @@
+"""
+Game-state-aware cadence for the ingest scheduler.
+
+``EventCalendar`` reads the ``events`` table around today and classifies
+each sport as:
+
+- ``live``: an event is in progress (by status, or by start time while the
+  provider has not flipped the status yet)
+- ``soon``: an event starts within ``PREGAME_MINUTES``
+- ``idle``: nothing on
+
+``AdaptiveCadence`` turns a feed's last run and its sport's state into the
+delay before the next run: the feed's live interval during live/soon
+windows, otherwise its normal interval doubled for every consecutive run
+that changed nothing (304 or all rows unchanged), up to its ceiling. Every
+delay is jittered so feeds spread out instead of hitting Supabase together.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+
+from supabase import Client
+
+from sportsapp.backend.app.jobs.engine import FeedRun
+from sportsapp.backend.app.jobs.feeds import FeedSpec
+
+logger = logging.getLogger(__name__)
+
+LIVE, SOON, IDLE = "live", "soon", "idle"
+
+PREGAME_MINUTES = int(os.getenv("INGEST_PREGAME_MINUTES", "30"))
+CALENDAR_REFRESH_SECONDS = int(os.getenv("INGEST_CALENDAR_REFRESH", "300"))
+JITTER = float(os.getenv("INGEST_JITTER", "0.2"))
+
+LIVE_STATUSES = {"InProgress", "Live", "Halftime", "Delayed"}
+FINISHED_STATUSES = {"Final", "F/OT", "F/SO", "Closed", "Canceled", "Cancelled", "Postponed", "Forfeit", "Suspended"}
+
+# How long an event can run past its start time while still counting as live
+GAME_LENGTH_HOURS = {"NBA": 3, "NFL": 4, "MLB": 4, "NHL": 3, "UFC": 6}
+DEFAULT_GAME_LENGTH_HOURS = 3
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def classify(events: Iterable[dict], now: datetime) -> Dict[str, str]:
+    """Sport -> live/soon/idle for a list of ``events`` rows."""
+    states: Dict[str, str] = {}
+    for event in events:
+        sport = event.get("sport")
+        status = event.get("status") or ""
+        start = _parse_time(event.get("start_time"))
+        if not sport or status in FINISHED_STATUSES:
+            continue
+        game_length = timedelta(hours=GAME_LENGTH_HOURS.get(sport, DEFAULT_GAME_LENGTH_HOURS))
+        if status in LIVE_STATUSES or (start and start <= now <= start + game_length):
+            states[sport] = LIVE
+        elif start and now < start <= now + timedelta(minutes=PREGAME_MINUTES) and states.get(sport) != LIVE:
+            states[sport] = SOON
+    return states
+
+
+class EventCalendar:
+    """Cached view of which sports have live or imminent events."""
+
+    def __init__(self, db: Client, refresh_seconds: int = CALENDAR_REFRESH_SECONDS):
+        self.db = db
+        self.refresh_seconds = refresh_seconds
+        self._states: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _load(self) -> list:
+        now = datetime.now(timezone.utc)
+        longest = max(GAME_LENGTH_HOURS.values(), default=DEFAULT_GAME_LENGTH_HOURS)
+        res = (
+            self.db.table("events")
+            .select("sport, start_time, status")
+            .gte("start_time", (now - timedelta(hours=longest)).isoformat())
+            .lte("start_time", (now + timedelta(minutes=PREGAME_MINUTES)).isoformat())
+            .execute()
+        )
+        return res.data or []
+
+    async def refresh(self, force: bool = False) -> Dict[str, str]:
+        async with self._lock:
+            if force or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+                try:
+                    events = await asyncio.to_thread(self._load)
+                    self._states = classify(events, datetime.now(timezone.utc))
+                except Exception as e:
+                    # Keep the last known states; a failed read must not stop ingestion
+                    logger.warning(f"Could not read event calendar: {e}")
+                self._loaded_at = time.monotonic()
+            return dict(self._states)
+
+    async def state(self, sport: Optional[str]) -> str:
+        if not sport:
+            return IDLE
+        return (await self.refresh()).get(sport, IDLE)
+
+
+def jittered(seconds: float, jitter: float = JITTER) -> float:
+    return max(1.0, seconds * random.uniform(1 - jitter, 1 + jitter))
+
+
+class AdaptiveCadence:
+    """Next-run delays per feed from game state and recent results."""
+
+    def __init__(self):
+        self._quiet_runs: Dict[str, int] = {}
+
+    def next_delay(self, spec: FeedSpec, run: Optional[FeedRun], state: str) -> float:
+        """Seconds until `spec` should run again."""
+        changed = run is not None and run.status in ("ok", "partial") and (run.inserted or run.updated or run.failed)
+        if changed or run is None:
+            self._quiet_runs[spec.name] = 0
+        else:
+            self._quiet_runs[spec.name] = self._quiet_runs.get(spec.name, 0) + 1
+
+        if state in (LIVE, SOON) and spec.live_interval_minutes:
+            return jittered(spec.live_interval_minutes * 60)
+
+        quiet = self._quiet_runs[spec.name]
+        minutes = min(spec.interval_minutes * 2 ** quiet, max(spec.max_interval_minutes, spec.interval_minutes))
+        return jittered(minutes * 60)
+
+    def reset(self, spec: FeedSpec):
+        self._quiet_runs[spec.name] = 0
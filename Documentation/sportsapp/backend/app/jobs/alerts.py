@@ -0,0 +1,342 @@
+"""
+Alert matching: user subscriptions evaluated against ingest change events.
+
+Subscriptions (``alert_subscriptions``) are compiled into a hash index keyed
+by (kind, entity_type, entity_id), e.g. ("game_start", "team", "14"). Write
+hooks on the ingest engine turn the rows each batch actually changed into
+``Change`` events, and every change looks up only the subscriptions under
+its own key, so a batch costs what changed times who follows it, never a
+scan of every subscription.
+
+Kinds and the entities they follow:
+
+- ``game_start`` / ``game_final`` (event ext_ref or team id): the game goes
+  live / finishes
+- ``player_status`` (player id): the player's status changes, e.g. Active -> Out;
+  the worker seeds last-seen statuses from ``players`` at startup
+  (``AlertEngine.bootstrap``), so a move is caught across restarts
+- ``line_move`` (odds event_ref): a line in ``market`` (optionally at one
+  ``book``) moves by at least ``threshold`` from where it stood at the last
+  alert
+
+Matches become rows in ``alert_deliveries``, unique on (subscription_id,
+dedupe_key): repeats within a batch collapse in memory, and a repeat after a
+restart is dropped by the database (insert-only upsert). Each ingest batch
+writes its deliveries in one batched upsert; sending them on (push, email,
+Supabase Realtime) is left to whatever reads that table.
+
+The index pulls rows whose ``updated_at`` moved at most every
+``ALERTS_REFRESH_SECONDS`` (re-reading a short overlap, see
+``db/scan.py``); the API deactivates subscriptions rather than deleting
+them so that refresh sees removals.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from supabase import Client
+
+from sportsapp.backend.app.db.repository import ALERT_KINDS, DEFAULT_LINE_MARKET
+from sportsapp.backend.app.db.scan import scan_rows
+from sportsapp.backend.app.db.upsert import batched_upsert
+from sportsapp.backend.app.jobs import odds
+from sportsapp.backend.app.jobs.adaptive import LIVE_STATUSES
+from sportsapp.backend.app.jobs.engine import WRITE_HOOKS
+from sportsapp.backend.app.jobs.standings import COMPLETED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+ALERTS_REFRESH_SECONDS = float(os.getenv("ALERTS_REFRESH_SECONDS", "30"))
+# A game first seen (e.g. after a restart) only alerts if it started this recently
+ALERTS_RECENT_HOURS = float(os.getenv("ALERTS_RECENT_HOURS", "6"))
+# Delivery keys remembered per process so a re-emitted change is not rewritten
+ALERTS_SENT_CACHE = int(os.getenv("ALERTS_SENT_CACHE", "100000"))
+
+SUBSCRIPTION_FIELDS = ("id", "user_id", "kind", "entity_type", "entity_id", "threshold", "market", "book")
+DELIVERY_CONFLICT = "subscription_id,dedupe_key"
+
+Row = Dict[str, Any]
+IndexKey = Tuple[str, str, str]  # (kind, entity_type, entity_id)
+
+
+class Subscription:
+    __slots__ = SUBSCRIPTION_FIELDS
+
+    def __init__(self, row: Row):
+        for field in SUBSCRIPTION_FIELDS:
+            setattr(self, field, row.get(field))
+        self.entity_id = str(self.entity_id)
+
+    @property
+    def key(self) -> IndexKey:
+        return self.kind, self.entity_type, self.entity_id
+
+
+class Change:
+    """Something ingest just wrote that subscriptions may follow."""
+
+    __slots__ = ("kind", "entity_type", "entity_id", "key", "data")
+
+    def __init__(self, kind: str, entity_type: str, entity_id: Any, key: str, data: Row):
+        self.kind = kind
+        self.entity_type = entity_type
+        self.entity_id = str(entity_id)
+        self.key = key  # dedupe key: the same real-world change always gets the same one
+        self.data = data
+
+
+class SubscriptionIndex:
+    """Active subscriptions by (kind, entity_type, entity_id)."""
+
+    def __init__(self):
+        self.by_key: Dict[IndexKey, Dict[Any, Subscription]] = {}
+        self.by_id: Dict[Any, Subscription] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def put(self, row: Row):
+        """Add, replace or (inactive / unknown kind) remove one subscription row."""
+        self.remove(row.get("id"))
+        if not row.get("active", True) or row.get("entity_type") not in ALERT_KINDS.get(row.get("kind"), ()):
+            return
+        subscription = Subscription(row)
+        self.by_id[subscription.id] = subscription
+        self.by_key.setdefault(subscription.key, {})[subscription.id] = subscription
+
+    def remove(self, subscription_id: Any):
+        subscription = self.by_id.pop(subscription_id, None)
+        if subscription is None:
+            return
+        bucket = self.by_key.get(subscription.key)
+        if bucket is not None:
+            bucket.pop(subscription_id, None)
+            if not bucket:
+                del self.by_key[subscription.key]
+
+    def match(self, change: Change) -> Iterable[Subscription]:
+        bucket = self.by_key.get((change.kind, change.entity_type, change.entity_id))
+        return bucket.values() if bucket else ()
+
+
+def _player_ids(db: Client, ext_refs: List[str]) -> Dict[str, Any]:
+    """players.id for each ext_ref (runs in a thread)."""
+    res = db.table("players").select("id, ext_ref").in_("ext_ref", ext_refs).execute()
+    return {str(row["ext_ref"]): row["id"] for row in res.data}
+
+
+class AlertEngine:
+    """Turns ingest writes into change events and matches them against the subscription index."""
+
+    def __init__(self):
+        self.index = SubscriptionIndex()
+        self.high_water: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        self.loaded = False
+        # Last seen state, to alert on transitions rather than on every write
+        self.event_statuses: Dict[str, str] = {}
+        self.player_statuses: Dict[str, str] = {}
+        # (subscription id, book, outcome) -> number at the last line_move alert
+        self.baselines: Dict[Tuple[Any, str, str], float] = {}
+        self.sent: "OrderedDict[Tuple[Any, str], None]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    # -- subscriptions
+
+    def load(self, rows: Iterable[Row]):
+        for row in rows:
+            self.index.put(row)
+            stamp = row.get("updated_at")
+            if stamp is not None and (self.high_water is None or str(stamp) > self.high_water):
+                self.high_water = str(stamp)
+
+    async def refresh(self, db: Client, force: bool = False):
+        """Pull subscription changes if the index is older than ``ALERTS_REFRESH_SECONDS``."""
+        now = time.monotonic()
+        if not force and self.refreshed_at is not None and now - self.refreshed_at < ALERTS_REFRESH_SECONDS:
+            return
+        try:
+            self.load(await asyncio.to_thread(
+                scan_rows, db, "alert_subscriptions", (*SUBSCRIPTION_FIELDS, "active", "updated_at"),
+                since=self.high_water,
+            ))
+        except Exception as e:
+            # Keep matching against what is loaded; a failed read must not stop ingestion
+            logger.warning(f"Could not refresh alert subscriptions: {e}")
+        self.refreshed_at = now
+
+    async def bootstrap(self, db: Client) -> bool:
+        """Seed last-seen player statuses from ``players`` so the first move after a
+        restart alerts; False if that failed."""
+        try:
+            rows = await asyncio.to_thread(scan_rows, db, "players", ("ext_ref", "status"))
+        except Exception as e:
+            logger.warning(f"Could not load player statuses for alerts ({e}); will retry on the next write")
+            return False
+        self.player_statuses = {str(row["ext_ref"]): row.get("status") or "" for row in rows if row.get("ext_ref")}
+        self.loaded = True
+        logger.info(f"Alerts tracking the status of {len(self.player_statuses)} players")
+        return True
+
+    # -- change events
+
+    def event_changes(self, rows: Iterable[Row], now: Optional[datetime] = None) -> List[Change]:
+        """game_start / game_final changes for event rows whose status moved."""
+        now = now or datetime.now(timezone.utc)
+        recent = (now - timedelta(hours=ALERTS_RECENT_HOURS)).isoformat()
+        changes = []
+        for row in rows:
+            ref = str(row.get("ext_ref") or "")
+            status = row.get("status") or ""
+            if not ref:
+                continue
+            previous = self.event_statuses.get(ref)
+            self.event_statuses[ref] = status
+            if status == previous:
+                continue
+            kind = "game_start" if status in LIVE_STATUSES else "game_final" if status in COMPLETED_STATUSES else None
+            if kind is None or (kind == "game_start" and previous in LIVE_STATUSES):
+                continue
+            if previous is None:
+                start = row.get("start_time")
+                if not start or str(start).replace("Z", "+00:00") < recent:
+                    continue
+            data = {"event": ref, "sport": row.get("sport"), "status": status, "start_time": row.get("start_time"),
+                    "home_team_id": row.get("home_team_id"), "away_team_id": row.get("away_team_id"),
+                    "home_score": row.get("home_score"), "away_score": row.get("away_score")}
+            key = f"{kind}:{ref}"
+            changes.append(Change(kind, "event", ref, key, data))
+            for side in ("home_team_id", "away_team_id"):
+                if row.get(side) is not None:
+                    changes.append(Change(kind, "team", row[side], key, data))
+        return changes
+
+    def player_status_moves(self, rows: Iterable[Row]) -> List[Tuple[str, Row]]:
+        """(ext_ref, data) for players whose status changed since last seen."""
+        moves = []
+        for row in rows:
+            ref = str(row.get("ext_ref") or "")
+            status = row.get("status") or ""
+            if not ref:
+                continue
+            previous = self.player_statuses.get(ref)
+            self.player_statuses[ref] = status
+            if previous is not None and previous != status:
+                moves.append((ref, {"player": ref, "sport": row.get("sport"), "first_name": row.get("first_name"),
+                                    "last_name": row.get("last_name"), "previous_status": previous,
+                                    "status": status, "updated_at": row.get("updated_at")}))
+        return moves
+
+    def odds_changes(self, rows: Iterable[Row]) -> List[Change]:
+        """line_move candidates for written quotes, carrying the line's previous value."""
+        changes = []
+        for row in rows:
+            previous = odds.book.lines.get(odds.line_key(row))
+            data = {**row, "previous_price": previous[0] if previous else None,
+                    "previous_point": previous[1] if previous else None}
+            key = f"line_move:{row.get('event_ref')}:{row.get('market')}:{row.get('book')}:{row.get('outcome')}:{row.get('recorded_at')}"
+            changes.append(Change("line_move", "event", row.get("event_ref"), key, data))
+        return changes
+
+    # -- matching
+
+    def _line_moved(self, subscription: Subscription, data: Row) -> bool:
+        if data.get("market") != (subscription.market or DEFAULT_LINE_MARKET):
+            return False
+        if subscription.book and data.get("book") != subscription.book:
+            return False
+        # Spreads and totals move by points; h2h only has a price
+        value = data.get("point") if data.get("point") is not None else data.get("price")
+        if value is None:
+            return False
+        baseline_key = (subscription.id, data.get("book"), data.get("outcome"))
+        baseline = self.baselines.get(baseline_key)
+        if baseline is None:
+            previous = data.get("previous_point") if data.get("point") is not None else data.get("previous_price")
+            baseline = previous if previous is not None else value
+        if abs(value - baseline) >= (subscription.threshold or 1.0):
+            self.baselines[baseline_key] = value
+            return True
+        self.baselines.setdefault(baseline_key, baseline)
+        return False
+
+    def evaluate(self, changes: Iterable[Change]) -> List[Row]:
+        """Deliveries for `changes`, one per (subscription, dedupe key) not already sent."""
+        deliveries: Dict[Tuple[Any, str], Row] = {}
+        created_at = datetime.now(timezone.utc).isoformat()
+        for change in changes:
+            for subscription in self.index.match(change):
+                dedupe = (subscription.id, change.key)
+                if dedupe in deliveries or dedupe in self.sent:
+                    continue
+                if change.kind == "line_move" and not self._line_moved(subscription, change.data):
+                    continue
+                deliveries[dedupe] = {
+                    "subscription_id": subscription.id, "user_id": subscription.user_id, "dedupe_key": change.key,
+                    "kind": change.kind, "entity_type": change.entity_type, "entity_id": change.entity_id,
+                    "payload": change.data, "created_at": created_at,
+                }
+        return list(deliveries.values())
+
+    async def deliver(self, db: Client, deliveries: List[Row]):
+        """Write `deliveries` in one batched insert-only upsert."""
+        if not deliveries:
+            return
+        result = await batched_upsert(db, "alert_deliveries", deliveries, on_conflict=DELIVERY_CONFLICT,
+                                      ignore_duplicates=True)
+        failed = {(row["subscription_id"], row["dedupe_key"]) for row, _ in result.failed}
+        for row, error in result.failed:
+            logger.error(f"Failed to write alert {row['dedupe_key']} for subscription {row['subscription_id']}: {error}")
+        for row in deliveries:
+            dedupe = (row["subscription_id"], row["dedupe_key"])
+            if dedupe not in failed:
+                self.sent[dedupe] = None
+        while len(self.sent) > ALERTS_SENT_CACHE:
+            self.sent.popitem(last=False)
+        print(f"🔔 {len(deliveries) - len(failed)} alert(s) delivered, {len(failed)} failed")
+
+    async def _process(self, db: Client, changes: List[Change]):
+        if not changes:
+            return
+        await self.refresh(db)
+        await self.deliver(db, self.evaluate(changes))
+
+    # -- ingest write hooks
+
+    async def on_events_written(self, db: Client, rows: List[Row]):
+        async with self._lock:
+            await self._process(db, self.event_changes(rows))
+
+    async def on_players_written(self, db: Client, rows: List[Row]):
+        async with self._lock:
+            if not self.loaded:
+                # The rows just written are already stored, so this batch's moves are lost; track from here
+                await self.bootstrap(db)
+                return
+            moves = self.player_status_moves(rows)
+            if not moves:
+                return
+            ids = await asyncio.to_thread(_player_ids, db, [ref for ref, _ in moves])
+            # Keyed by the write's updated_at stamp, so a re-emitted row maps to the same delivery
+            changes = [
+                Change("player_status", "player", ids[ref],
+                       f"player_status:{ref}:{data['status']}:{data['updated_at']}", data)
+                for ref, data in moves if ref in ids
+            ]
+            await self._process(db, changes)
+
+    async def on_odds_written(self, db: Client, rows: List[Row]):
+        async with self._lock:
+            await self._process(db, self.odds_changes(rows))
+
+
+# Shared by the ingest hooks below
+alerts = AlertEngine()
+
+WRITE_HOOKS.setdefault("events", []).append(alerts.on_events_written)
+WRITE_HOOKS.setdefault("players", []).append(alerts.on_players_written)
+WRITE_HOOKS.setdefault("odds_latest", []).append(alerts.on_odds_written)
@@ -0,0 +1,169 @@
+"""
+Ingest engine: runs any registered ``FeedSpec``.
+
+Every feed goes through the same path: a conditional streaming GET on the
+shared HTTP pool, the streaming pipeline into the feed's mapper, and a
+``TableSink`` that upserts only changed rows in batches (stamping
+``updated_at``, which the API's incremental refreshes read), then invalidation
+of the API's cached responses for tables that changed. Tables with derived
+data register a write hook (``WRITE_HOOKS``), e.g. events -> standings
+(``jobs/standings.py``) or alerts (``jobs/alerts.py``), which sees every
+batch the database accepted.
+``run_feeds`` fans
+out across feeds concurrently, bounded by one process-wide limit
+(``INGEST_CONCURRENCY``) that also applies to scheduler-triggered runs.
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from supabase import Client
+
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.connection import supabase_service
+from sportsapp.backend.app.db.fingerprints import FingerprintStore
+from sportsapp.backend.app.db.upsert import batched_upsert
+from sportsapp.backend.app.jobs.feeds import FeedSpec, get_feeds
+from sportsapp.backend.app.jobs.http_client import mark_processed, open_stream
+from sportsapp.backend.app.jobs.pipeline import iter_json_items, run_pipeline
+from sportsapp.backend.app.jobs.standings import materializer as standings
+
+SPORTSDATA_BASE_URL = "https://api.sportsdata.io/v3"
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "4"))
+
+# Fingerprints of the rows each table last accepted, shared by all feeds
+fingerprints = FingerprintStore()
+
+# table -> callbacks run with (db, rows) after each batch of rows lands in it
+WRITE_HOOKS: Dict[str, List[Callable[[Client, List[dict]], Awaitable[None]]]] = {
+    "events": [standings.on_events_written],
+}
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _feed_slots() -> asyncio.Semaphore:
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(max(1, INGEST_CONCURRENCY))
+        _semaphore_loop = loop
+    return _semaphore
+
+
+async def run_write_hooks(db: Client, table: str, rows: List[dict]):
+    """Run `table`'s write hooks on rows the database accepted; a failing hook never fails ingest."""
+    for hook in WRITE_HOOKS.get(table, ()) if rows else ():
+        try:
+            await hook(db, rows)
+        except Exception as e:
+            print(f"❌ {table} write hook {getattr(hook, '__qualname__', hook)} failed: {e}")
+
+
+class TableSink:
+    """Pipeline writer: upserts only changed rows into one table and keeps run totals."""
+
+    def __init__(self, db: Client, table: str, conflict_key: str = "ext_ref"):
+        self.db = db
+        self.table = table
+        self.conflict_key = conflict_key
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.requests = 0
+        self.failed = []
+
+    async def __call__(self, rows):
+        key = self.conflict_key
+        changes = fingerprints.diff(self.table, rows, key=key)
+        # Stamped here rather than in the mapper so the timestamp never enters a fingerprint
+        now = datetime.now(timezone.utc).isoformat()
+        stamped = [{**row, "updated_at": now} for row in changes.changed]
+        result = await batched_upsert(self.db, self.table, stamped, on_conflict=key)
+
+        failed_refs = {str(row.get(key)) for row, _ in result.failed}
+        accepted = [row for row in changes.changed if str(row.get(key)) not in failed_refs]
+        fingerprints.record(self.table, accepted, key=key)
+        # Hooks see rows as written, stamp included (alerts key deliveries by it)
+        await run_write_hooks(self.db, self.table, [row for row in stamped if str(row.get(key)) not in failed_refs])
+
+        self.inserted += sum(1 for row in changes.inserted if str(row.get(key)) not in failed_refs)
+        self.updated += sum(1 for row in changes.updated if str(row.get(key)) not in failed_refs)
+        self.skipped += changes.skipped
+        self.requests += result.requests
+        self.failed.extend(result.failed)
+
+
+@dataclass
+class FeedRun:
+    """Outcome of one feed run."""
+    feed: str
+    status: str  # "ok", "not_modified", "partial", "error"
+    records: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+
+
+def feed_url(spec: FeedSpec) -> str:
+    return f"{SPORTSDATA_BASE_URL}/{spec.path}?key={os.getenv('SPORTS_DATAIO_KEY', '')}"
+
+
+async def run_feed(spec: FeedSpec, db: Optional[Client] = None) -> FeedRun:
+    """Run one feed within the process-wide concurrency limit."""
+    db = db or supabase_service
+    async with _feed_slots():
+        if spec.runner is not None:
+            return await spec.runner(spec, db)
+        return await stream_feed(spec, db)
+
+
+async def stream_feed(spec: FeedSpec, db: Client) -> FeedRun:
+    """Stream one feed into its table; a 304 from the provider skips the run.
+
+    Runners that only need to prepare the spec (e.g. resolve its path or
+    mapper, ``jobs/events.py``) finish by calling this.
+    """
+    url = feed_url(spec)
+    headers = {"Ocp-Apim-Subscription-Key": os.getenv("SPORTS_DATAIO_KEY", "")}
+    sink = TableSink(db, spec.table, spec.conflict_key)
+
+    try:
+        async with open_stream(url, headers=headers) as resp:
+            if resp.status_code == 304:
+                print(f"{spec.name}: unchanged since last run (304); skipping.")
+                return FeedRun(spec.name, "not_modified")
+            if resp.status_code != 200:
+                await resp.aread()
+                print(f"❌ {spec.name}: API Error: {resp.status_code} - {resp.text}")
+                return FeedRun(spec.name, "error", error=f"HTTP {resp.status_code}")
+            stats = await run_pipeline(iter_json_items(resp, spec.items_prefix), spec.mapper, sink)
+    except Exception as e:
+        print(f"❌ {spec.name}: ingest failed: {e}")
+        return FeedRun(spec.name, "error", error=str(e))
+
+    for row, error in sink.failed:
+        print(f"❌ Failed to upsert {spec.label} {spec.describe(row)}: {error}")
+    print(f"✅ {spec.name}: {stats.records} records streamed, {sink.inserted} inserted, "
+          f"{sink.updated} updated, {sink.skipped} unchanged, {len(sink.failed)} failed "
+          f"({sink.requests} request(s))")
+    if not sink.failed:
+        mark_processed(url, resp)
+    if sink.inserted or sink.updated:
+        # Only tables this run actually changed lose their cached API responses
+        await response_cache.invalidate(spec.table)
+
+    return FeedRun(
+        spec.name, "partial" if sink.failed else "ok", records=stats.records,
+        inserted=sink.inserted, updated=sink.updated, skipped=sink.skipped, failed=len(sink.failed),
+    )
+
+
+async def run_feeds(names: Optional[List[str]] = None, db: Optional[Client] = None) -> List[FeedRun]:
+    """Run the named feeds (default: all registered) concurrently."""
+    return list(await asyncio.gather(*(run_feed(spec, db) for spec in get_feeds(names))))
@@ -0,0 +1,102 @@
+"""
+Game schedule and score feeds into the ``events`` table.
+
+Each feed streams the current regular season's games from SportsDataIO
+(``{sport}/scores/json/Games/{season}``) through the normal engine path, so
+only games whose status or score changed are written. Those writes drive
+the ``events`` write hooks: standings (``jobs/standings.py``) and game
+alerts (``jobs/alerts.py``), and the scheduler's live-game cadence reads
+the same rows.
+
+Games name their teams by SportsDataIO TeamID, while ``events`` references
+``teams.id``, so every run first loads the sport's ``ext_ref -> id`` map
+(teams are ingested as ``{sport}_{TeamID}``, see ``jobs/feeds.py``). A game
+whose teams are not ingested yet is still written, without team ids.
+"""
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from supabase import Client
+
+from sportsapp.backend.app.jobs.engine import FeedRun, stream_feed
+from sportsapp.backend.app.jobs.feeds import FeedSpec, register_feed
+
+Record = Dict[str, Any]
+Row = Dict[str, Any]
+
+# Month each sport's season starts in, and whether SportsDataIO names the
+# season by the year it ends in (2025-26 NBA is "2026") or starts in
+SEASON_STARTS = {"NBA": (10, True), "NHL": (10, True), "NFL": (9, False), "MLB": (3, False)}
+
+
+def current_season(sport: str, now: Optional[datetime] = None) -> int:
+    """SportsDataIO season year for the season in progress (or just finished) at `now`."""
+    now = now or datetime.now(timezone.utc)
+    start_month, named_by_end = SEASON_STARTS[sport]
+    # Before the start month the season that began last year is still on (or just over)
+    started = now.year if now.month >= start_month else now.year - 1
+    if named_by_end:
+        return started + 1
+    return started
+
+
+def _utc(value) -> Optional[str]:
+    """SportsDataIO's DateTimeUTC ("2025-10-21T23:30:00") as an ISO timestamp with offset."""
+    if not value:
+        return None
+    return value if value.endswith("Z") or "+" in value[10:] else f"{value}+00:00"
+
+
+def game_mapper(sport: str, team_ids: Dict[str, Any]) -> Callable[[Record], Optional[Row]]:
+    """Mapper for a SportsDataIO Game record of `sport` -> events row."""
+    def map_game(game: Record) -> Optional[Row]:
+        if not game.get("GameID"):
+            return None
+        return {
+            "sport": sport,
+            "ext_ref": f"{sport}_{game['GameID']}",
+            "season": game.get("Season"),
+            "status": game.get("Status"),
+            "start_time": _utc(game.get("DateTimeUTC")),
+            "home_team_id": team_ids.get(f"{sport}_{game.get('HomeTeamID')}"),
+            "away_team_id": team_ids.get(f"{sport}_{game.get('AwayTeamID')}"),
+            "home_score": game.get("HomeTeamScore"),
+            "away_score": game.get("AwayTeamScore"),
+        }
+    return map_game
+
+
+def describe_game(row: Row) -> str:
+    return f"{row.get('ext_ref')} ({row.get('status')})"
+
+
+def _team_ids(db: Client, sport: str) -> Dict[str, Any]:
+    """teams.id by ext_ref for one sport (runs in a worker thread)."""
+    res = db.table("teams").select("id, ext_ref").eq("sport", sport).execute()
+    return {row["ext_ref"]: row["id"] for row in res.data}
+
+
+async def run_games_feed(spec: FeedSpec, db: Client) -> FeedRun:
+    """Resolve this season's path and the team ids, then stream the games like any other feed."""
+    try:
+        team_ids = await asyncio.to_thread(_team_ids, db, spec.sport)
+    except Exception as e:
+        print(f"❌ {spec.name}: could not load {spec.sport} team ids ({e}); skipping this run")
+        return FeedRun(spec.name, "error", error=str(e))
+    season = current_season(spec.sport)
+    return await stream_feed(
+        replace(spec, path=spec.path.format(season=season), mapper=game_mapper(spec.sport, team_ids), runner=None),
+        db,
+    )
+
+
+# Same game shape (HomeTeamID, HomeTeamScore) in both APIs
+for _sport in ("NBA", "NHL"):
+    register_feed(FeedSpec(
+        name=f"{_sport.lower()}_games", path=f"{_sport.lower()}/scores/json/Games/{{season}}",
+        mapper=game_mapper(_sport, {}), table="events", label="game", describe=describe_game,
+        sport=_sport, interval_minutes=30, live_interval_minutes=2, max_interval_minutes=360,
+        runner=run_games_feed,
+    ))
@@ -0,0 +1,122 @@
+"""
+Registry of SportsDataIO ingest feeds.
+
+Each feed is a ``FeedSpec``: which endpoint to stream, how to map one record
+to a row, which table and conflict key to upsert into, and how often the
+scheduler should run it. ``jobs/engine.py`` executes any spec, so adding a
+sport or feed is a mapper plus a ``register_feed`` call, not another copy of
+the fetch/map/upsert loop.
+
+Cadence fields are read by the scheduler (see ``jobs/adaptive.py``). Feeds
+from other providers register themselves with a ``runner`` (``jobs/odds.py``).
+"""
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+Record = Dict[str, Any]
+Row = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    """One ingest feed: endpoint -> mapper -> table."""
+    name: str
+    path: str  # under https://api.sportsdata.io/v3/, e.g. "nba/scores/json/Teams"
+    mapper: Callable[[Record], Optional[Row]]
+    table: str
+    label: str  # singular noun for log lines ("team", "fighter")
+    describe: Callable[[Row], str]
+    conflict_key: str = "ext_ref"
+    sport: Optional[str] = None  # events.sport this feed follows, for game-aware cadence
+    interval_minutes: float = 15  # normal cadence when nothing is on
+    live_interval_minutes: Optional[float] = None  # cadence while the sport has live/imminent events
+    max_interval_minutes: float = 240  # ceiling when backing off after unchanged runs
+    items_prefix: str = "item"  # ijson path of the record array in the response
+    # Custom run for feeds that are not one row per record (e.g. odds, jobs/odds.py); returns a FeedRun
+    runner: Optional[Callable[["FeedSpec", Any], Awaitable[Any]]] = None
+
+
+FEEDS: Dict[str, FeedSpec] = {}
+
+
+def register_feed(spec: FeedSpec) -> FeedSpec:
+    if spec.name in FEEDS:
+        raise ValueError(f"Feed {spec.name!r} is already registered")
+    FEEDS[spec.name] = spec
+    return spec
+
+
+def get_feeds(names: Optional[List[str]] = None) -> List[FeedSpec]:
+    """Registered feeds, optionally limited to `names` (unknown names raise KeyError)."""
+    if not names:
+        return list(FEEDS.values())
+    return [FEEDS[name] for name in names]
+
+
+# Schema: sport, ext_ref, team_id, first_name, last_name, position, status, market, nickname
+# (+ updated_at, stamped by TableSink; see supabase/migrations)
+def map_ufc_fighter(fighter: Record) -> Row:
+    """SportsDataIO FightersBasic record -> players row (only fields that exist in schema)."""
+    return {
+        "sport": "UFC",
+        "ext_ref": str(fighter.get("FighterID", fighter.get("FighterKey", ""))),  # Use FighterID or FighterKey as unique ref
+        "team_id": None,  # UFC: No teams
+        "first_name": fighter.get("FirstName", ""),
+        "last_name": fighter.get("LastName", ""),
+        "position": fighter.get("WeightClass", ""),  # e.g., "Welterweight"
+        "status": fighter.get("Status", "Active"),
+        "market": fighter.get("WeightClass", ""),  # Weight class as market
+        "nickname": fighter.get("Nickname", ""),  # Optional nickname
+    }
+
+
+# Schema: sport, ext_ref, name, short_name, market (+ updated_at, stamped by TableSink)
+# IMPORTANT: Make ext_ref unique per sport to avoid conflicts between NFL/NBA/etc
+def team_mapper(sport: str) -> Callable[[Record], Row]:
+    """Mapper for a SportsDataIO Teams record of `sport` -> teams row."""
+    def map_team(team: Record) -> Row:
+        full_name = team.get("FullName") or f"{team.get('City', '')} {team.get('Name', '')}".strip()
+        grouping = team.get("Conference") or team.get("League") or ""
+        return {
+            "sport": sport,
+            "ext_ref": f"{sport}_{team.get('TeamID', '')}",  # Prepend sport to make unique across sports
+            "name": full_name,  # Full name: "Los Angeles Lakers"
+            "short_name": team.get("Key", ""),  # Short abbreviation: "LAL"
+            "market": f"{grouping} {team.get('Division') or ''}".strip(),  # e.g., "Western Pacific"
+        }
+    return map_team
+
+
+def describe_fighter(row: Row) -> str:
+    return f"{row.get('first_name', 'Unknown')} {row.get('last_name', '')} ({row.get('ext_ref')})"
+
+
+def describe_team(row: Row) -> str:
+    return f"{row.get('name', 'Unknown')} ({row.get('short_name')})"
+
+
+register_feed(FeedSpec(
+    name="nba_teams", path="nba/scores/json/Teams", mapper=team_mapper("NBA"),
+    table="teams", label="team", describe=describe_team,
+    sport="NBA", interval_minutes=5, live_interval_minutes=2,
+))
+register_feed(FeedSpec(
+    name="ufc_fighters", path="mma/scores/json/FightersBasic", mapper=map_ufc_fighter,
+    table="players", label="fighter", describe=describe_fighter,
+    sport="UFC", interval_minutes=10, live_interval_minutes=5,
+))
+register_feed(FeedSpec(
+    name="nfl_teams", path="nfl/scores/json/Teams", mapper=team_mapper("NFL"),
+    table="teams", label="team", describe=describe_team,
+    sport="NFL", interval_minutes=15, live_interval_minutes=5,
+))
+register_feed(FeedSpec(
+    name="mlb_teams", path="mlb/scores/json/teams", mapper=team_mapper("MLB"),
+    table="teams", label="team", describe=describe_team,
+    sport="MLB", interval_minutes=60,
+))
+register_feed(FeedSpec(
+    name="nhl_teams", path="nhl/scores/json/teams", mapper=team_mapper("NHL"),
+    table="teams", label="team", describe=describe_team,
+    sport="NHL", interval_minutes=60,
+))
@@ -0,0 +1,168 @@
+"""
+Shared HTTP client for the SportsDataIO ingest jobs.
+
+One pooled ``httpx.AsyncClient`` per process (per event loop) replaces a
+fresh client per request, so the NBA/NFL/UFC jobs share keep-alive
+connections (and HTTP/2 when the ``h2`` package is installed) instead of
+paying a TLS handshake on every run.
+
+``fetch`` adds two things on top of the pool:
+
+- retries with jittered exponential backoff on transport errors, 429 and
+  5xx responses, honoring ``Retry-After``
+- conditional GETs: the ETag / Last-Modified of the last response that was
+  fully processed is sent back as ``If-None-Match`` / ``If-Modified-Since``,
+  and a 304 lets the caller skip the run without decoding any JSON
+
+Validators are only remembered once the caller reports the response as
+processed (``mark_processed``), so a run that failed halfway is retried in
+full rather than short-circuited by a 304.
+
+``open_stream`` is the streaming variant: same retries and validators, but
+the body is left unread so large feeds can be parsed incrementally.
+"""
+import asyncio
+import logging
+import os
+import random
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.getenv("INGEST_HTTP_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.getenv("INGEST_HTTP_MAX_KEEPALIVE", "10"))
+TIMEOUT = httpx.Timeout(float(os.getenv("INGEST_HTTP_TIMEOUT", "20")), connect=5.0)
+MAX_RETRIES = int(os.getenv("INGEST_HTTP_RETRIES", "3"))
+BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# url -> validators of the last response the caller finished processing
+_validators: Dict[str, Dict[str, str]] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide client, creating it for the running event loop if needed."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=HTTP2,
+            timeout=TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=60.0,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client():
+    """Close the shared client (call on shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    value = response.headers.get("Retry-After") if response is not None else None
+    if value:
+        try:
+            return min(MAX_BACKOFF, max(0.0, float(value)))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+                return min(MAX_BACKOFF, max(0.0, (when - datetime.now(timezone.utc)).total_seconds()))
+            except (TypeError, ValueError):
+                pass
+    return min(MAX_BACKOFF, BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+async def fetch(url: str, headers: Optional[Dict[str, str]] = None, conditional: bool = True) -> httpx.Response:
+    """GET `url` through the shared pool with retries; may return a 304 when `conditional`."""
+    request_headers = dict(headers or {})
+    if conditional:
+        request_headers.update(_validators.get(url, {}))
+
+    client = get_client()
+    attempt = 0
+    while True:
+        try:
+            response = await client.get(url, headers=request_headers)
+        except httpx.TransportError as e:
+            if attempt >= MAX_RETRIES:
+                raise
+            delay = _retry_delay(None, attempt)
+            logger.warning(f"GET {httpx.URL(url).path} failed ({e!r}); retrying in {delay:.1f}s")
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+                return response
+            delay = _retry_delay(response, attempt)
+            logger.warning(f"GET {httpx.URL(url).path} returned {response.status_code}; retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+@asynccontextmanager
+async def open_stream(url: str, headers: Optional[Dict[str, str]] = None,
+                      conditional: bool = True) -> AsyncIterator[httpx.Response]:
+    """Like `fetch`, but yields the response with its body still unread."""
+    request_headers = dict(headers or {})
+    if conditional:
+        request_headers.update(_validators.get(url, {}))
+
+    client = get_client()
+    attempt = 0
+    while True:
+        request = client.build_request("GET", url, headers=request_headers)
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError as e:
+            if attempt >= MAX_RETRIES:
+                raise
+            delay = _retry_delay(None, attempt)
+            logger.warning(f"GET {httpx.URL(url).path} failed ({e!r}); retrying in {delay:.1f}s")
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+                break
+            delay = _retry_delay(response, attempt)
+            await response.aclose()
+            logger.warning(f"GET {httpx.URL(url).path} returned {response.status_code}; retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+def mark_processed(url: str, response: httpx.Response):
+    """Remember `response`'s validators so the next fetch of `url` can come back 304."""
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+    if validators:
+        _validators[url] = validators
+    else:
+        _validators.pop(url, None)
@@ -1,10 +1,6 @@
-import httpx
-import os
 import sys
-from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
-from supabase import Client
 
 # Get the sportsapp directory (4 levels up from this file)
 # ingest_nba.py -> jobs -> app -> backend -> sportsapp
@@ -20,137 +16,34 @@ if str(PROJECT_ROOT) not in sys.path:
 # Load .env from sportsapp directory
 load_dotenv(dotenv_path=ENV_FILE)
 
-# Import Supabase client after path setup
-from sportsapp.backend.app.db.connection import supabase_service
-
-API_KEY = os.getenv("SPORTS_DATAIO_KEY")
+# Import the engine after path setup; feeds themselves are declared in jobs/feeds.py
+from sportsapp.backend.app.jobs.engine import run_feed, run_feeds
+from sportsapp.backend.app.jobs.feeds import FEEDS
+from sportsapp.backend.app.jobs import events  # noqa: F401  registers the game/score feeds
+from sportsapp.backend.app.jobs import odds  # noqa: F401  registers the odds feeds (when ODDS_API_KEY is set)
+from sportsapp.backend.app.jobs import alerts  # noqa: F401  registers the alert write hooks
 
 async def ingest_ufc_data():
-    """Fetch UFC events, fighters, and stats; insert to Supabase."""
-    base_url = "https://api.sportsdata.io/v3/mma"
-    headers = {"Ocp-Apim-Subscription-Key": API_KEY}
-    
-#https://api.sportsdata.io/v3/mma/scores/json/FightersBasic?key=8402dba692fc47e1b7ce0c514a2f6c84
+    """Fetch UFC fighters and upsert them as players in Supabase."""
+    return await run_feed(FEEDS["ufc_fighters"])
 
-    db = supabase_service
-    
-    async with httpx.AsyncClient() as client:
-        # 1. Fetch upcoming/recent events (fights)
-        resp = await client.get(f"{base_url}/scores/json/FightersBasic?key={API_KEY}", headers=headers)
-        if resp.status_code != 200:
-            print(f"API Error: {resp.status_code} - {resp.text}")
-            return
-        fighter_data = resp.json()  # List of fight events
-    
-    print(f"Fetched {len(fighter_data)} UFC Fighters (scrambled trial data).")
-    
-    # Insert fighters as players (only use fields that exist in schema)
-    # Schema: sport, ext_ref, team_id, first_name, last_name, position, status, market, nickname
-    success_count = 0
-    for fighter in fighter_data[:10]:  # Limit for test
-        player_data = {
-            "sport": "UFC",
-            "ext_ref": str(fighter.get("FighterID", fighter.get("FighterKey", ""))),  # Use FighterID or FighterKey as unique ref
-            "team_id": None,  # UFC: No teams
-            "first_name": fighter.get("FirstName", ""),
-            "last_name": fighter.get("LastName", ""),
-            "position": fighter.get("WeightClass", ""),  # e.g., "Welterweight"
-            "status": fighter.get("Status", "Active"),
-            "market": fighter.get("WeightClass", ""),  # Weight class as market
-            "nickname": fighter.get("Nickname", ""),  # Optional nickname
-        }
-        
-        try:
-            res = db.table("players").upsert(player_data, on_conflict="ext_ref").execute()
-            success_count += 1
-            print(f"✅ Fighter upserted: {player_data['first_name']} {player_data['last_name']} ({player_data['ext_ref']})")
-        except Exception as e:
-            print(f"❌ Failed to upsert fighter {player_data.get('first_name', 'Unknown')}: {e}")
-    
-    print(f"\n✅ Successfully processed {success_count}/{min(10, len(fighter_data))} fighters")
-        
 async def ingest_nba_teams():
     """Fetch NBA teams from API and insert/update in Supabase."""
-    base_url = "https://api.sportsdata.io/v3/nba"
-    headers = {"Ocp-Apim-Subscription-Key": API_KEY}
-    
-    db = supabase_service
-    
-    async with httpx.AsyncClient() as client:
-        # Fetch all NBA teams
-        resp = await client.get(f"{base_url}/scores/json/Teams?key={API_KEY}", headers=headers)
-        if resp.status_code != 200:
-            print(f"API Error: {resp.status_code} - {resp.text}")
-            return
-        teams_data = resp.json()
-    
-    print(f"Fetched {len(teams_data)} NBA teams from API.")
-    
-    # Insert/update teams in database
-    # Schema: sport, ext_ref, name, short_name, market
-    # IMPORTANT: Make ext_ref unique per sport to avoid conflicts between NFL/NBA/etc
-    success_count = 0
-    for team in teams_data:
-        team_data = {
-            "sport": "NBA",
-            "ext_ref": f"NBA_{team.get('TeamID', '')}",  # Prepend sport to make unique across sports
-            "name": team.get("FullName", ""),  # Full name: "Los Angeles Lakers"
-            "short_name": team.get("Key", ""),  # Short abbreviation: "LAL"
-            "market": f"{team.get('Conference', '')} {team.get('Division', '')}".strip()  # e.g., "Western Pacific"
-        }
-        try:
-            res = db.table("teams").upsert(team_data, on_conflict="ext_ref").execute()
-            success_count += 1
-            print(f"✅ Team upserted: {team_data['name']} ({team_data['short_name']}) - {team_data['market']}")
-        except Exception as e:
-            print(f"❌ Failed to upsert team {team_data.get('name', 'Unknown')}: {e}")
-    
-    print(f"\n✅ Successfully processed {success_count}/{len(teams_data)} teams")
-        
+    return await run_feed(FEEDS["nba_teams"])
 
 async def ingest_nfl_teams():
     """Fetch NFL teams from API and insert/update in Supabase."""
-    base_url = "https://api.sportsdata.io/v3/nfl"
-    headers = {"Ocp-Apim-Subscription-Key": API_KEY}
-    
-    db = supabase_service
-    
-    async with httpx.AsyncClient() as client:
-        # Fetch all NFL teams
-        resp = await client.get(f"{base_url}/scores/json/Teams?key={API_KEY}", headers=headers)
-        if resp.status_code != 200:
-            print(f"API Error: {resp.status_code} - {resp.text}")
-            return
-        teams_data = resp.json()
-    
-    print(f"Fetched {len(teams_data)} NFL teams from API.")
-    
-    # Insert/update teams in database
-    # Schema: sport, ext_ref, name, short_name, market
-    # IMPORTANT: Make ext_ref unique per sport to avoid conflicts between NFL/NBA/etc
-    success_count = 0
-    for team in teams_data:
-        team_data = {
-            "sport": "NFL",
-            "ext_ref": f"NFL_{team.get('TeamID', '')}",  # Prepend sport to make unique across sports
-            "name": team.get("FullName", ""),  # Full name: "Arizona Cardinals"
-            "short_name": team.get("Key", ""),  # Short abbreviation: "ARI"
-            "market": f"{team.get('Conference', '')} {team.get('Division', '')}".strip()  # e.g., "NFC West"
-        }
-        
-        try:
-            res = db.table("teams").upsert(team_data, on_conflict="ext_ref").execute()
-            success_count += 1
-            print(f"✅ Team upserted: {team_data['name']} ({team_data['short_name']}) - {team_data['market']}")
-        except Exception as e:
-            print(f"❌ Failed to upsert team {team_data.get('name', 'Unknown')}: {e}")
-    
-    print(f"\n✅ Successfully processed {success_count}/{len(teams_data)} teams")
+    return await run_feed(FEEDS["nfl_teams"])
 
-# Run the test
+# Run the test: python ingest_nba.py [feed_name ...] (default: every registered feed)
 if __name__ == "__main__":
     import asyncio
-    # Choose which function to run
-    asyncio.run(ingest_ufc_data())
-    asyncio.run(ingest_nfl_teams())
-    asyncio.run(ingest_nba_teams())
\ No newline at end of file
+    from sportsapp.backend.app.jobs.http_client import close_client
+
+    async def main():
+        try:
+            await run_feeds(sys.argv[1:])
+        finally:
+            await close_client()
+
+    asyncio.run(main())
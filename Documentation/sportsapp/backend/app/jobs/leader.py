@@ -0,0 +1,126 @@
+"""
+Leader election for the ingest worker.
+
+Any number of workers may be started; only the one holding the leader lock
+runs the scheduler, the others poll and take over when it goes away.
+
+- ``AdvisoryLeaderLock``: a session-level Postgres advisory lock, used when
+  ``INGEST_LOCK_DSN`` (or ``DATABASE_URL``) points at the database. Works
+  across hosts; the lock is released when the holder's connection drops.
+- ``FileLeaderLock``: an exclusive ``flock`` on ``INGEST_LOCK_FILE``. Works
+  for workers on one host; the kernel releases it when the holder exits.
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = os.getenv("INGEST_LOCK_FILE", "/tmp/fanalytics-ingest.lock")
+LOCK_DSN = os.getenv("INGEST_LOCK_DSN") or os.getenv("DATABASE_URL")
+# Arbitrary but fixed advisory lock key shared by every worker
+LOCK_KEY = int(os.getenv("INGEST_LOCK_KEY", "724930115"))
+POLL_SECONDS = float(os.getenv("INGEST_LEADER_POLL", "15"))
+
+
+class FileLeaderLock:
+    """Host-local leader lock on a file."""
+
+    def __init__(self, path: str = LOCK_FILE):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def try_acquire(self) -> bool:
+        import fcntl
+
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self._fd = fd
+        return True
+
+    def is_held(self) -> bool:
+        return self._fd is not None
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __str__(self):
+        return f"file lock {self.path}"
+
+
+class AdvisoryLeaderLock:
+    """Cluster-wide leader lock on a Postgres session advisory lock."""
+
+    def __init__(self, dsn: str, key: int = LOCK_KEY):
+        self.dsn = dsn
+        self.key = key
+        self._conn = None
+
+    def try_acquire(self) -> bool:
+        import psycopg2
+
+        if self._conn is not None:
+            return True
+        conn = psycopg2.connect(self.dsn, connect_timeout=5, application_name="fanalytics-ingest")
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_lock(%s)", (self.key,))
+            acquired = cur.fetchone()[0]
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def is_held(self) -> bool:
+        """False once the session (and with it the lock) is gone."""
+        if self._conn is None:
+            return False
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except Exception:
+            self._conn = None
+            return False
+
+    def release(self):
+        if self._conn is not None:
+            try:
+                with self._conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (self.key,))
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    def __str__(self):
+        return f"advisory lock {self.key}"
+
+
+def leader_lock():
+    """The advisory lock when a database DSN is configured, else the file lock."""
+    if LOCK_DSN:
+        return AdvisoryLeaderLock(LOCK_DSN)
+    return FileLeaderLock()
+
+
+async def wait_for_leadership(lock, poll_seconds: float = POLL_SECONDS):
+    """Block until `lock` is acquired, retrying every `poll_seconds`."""
+    while True:
+        try:
+            if await asyncio.to_thread(lock.try_acquire):
+                return
+        except Exception as e:
+            logger.warning(f"Leader lock attempt failed: {e}")
+        await asyncio.sleep(poll_seconds)
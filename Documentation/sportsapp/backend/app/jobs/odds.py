@@ -0,0 +1,262 @@
+"""
+Odds ingestion from The Odds API.
+
+Odds move far more often than teams or players, so these feeds do not go
+through the one-row-per-record ``TableSink``. Each poll streams a sport's
+games, flattens them into quotes (event, market, book, outcome -> price,
+point) and compares every quote with the last value written (``LineBook``).
+Only quotes that moved are written, in batches:
+
+- appended to ``odds_history``, a compact time series per (event, market,
+  book); the conflict key includes ``recorded_at`` so a retried batch does
+  not duplicate rows
+- upserted into ``odds_latest``, one row per (event, market, book, outcome),
+  which the API mirrors in memory (``db/odds.py``)
+
+A poll in which nothing moved writes nothing and, like a 304 elsewhere,
+lets the scheduler back off. The book is loaded from ``odds_latest`` on the
+first run, so a restarted worker does not append every line again. Lines of
+events that started more than ``BOOK_RETENTION_HOURS`` ago are dropped from
+the book and deleted from ``odds_latest`` (``odds_history`` keeps them).
+
+The feeds are registered only when ``ODDS_API_KEY`` is set; regions and
+markets come from ``ODDS_REGIONS`` and ``ODDS_MARKETS``.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from supabase import Client
+
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.scan import scan_rows
+from sportsapp.backend.app.db.upsert import DEFAULT_BATCH_SIZE, batched_upsert
+from sportsapp.backend.app.jobs.engine import FeedRun, run_write_hooks
+from sportsapp.backend.app.jobs.feeds import FeedSpec, register_feed
+from sportsapp.backend.app.jobs.http_client import open_stream
+from sportsapp.backend.app.jobs.pipeline import iter_json_items
+
+ODDS_API_URL = "https://api.the-odds-api.com/v4"
+ODDS_REGIONS = os.getenv("ODDS_REGIONS", "us")
+ODDS_MARKETS = os.getenv("ODDS_MARKETS", "h2h,spreads,totals")
+
+LATEST_CONFLICT = "event_ref,market,book,outcome"
+HISTORY_CONFLICT = "event_ref,market,book,outcome,recorded_at"
+HISTORY_COLUMNS = ("event_ref", "market", "book", "outcome", "price", "point", "recorded_at")
+LATEST_COLUMNS = ("event_ref", "market", "book", "outcome", "price", "point", "commence_time")
+
+# Lines of events that started this long ago are dropped from the in-memory book
+BOOK_RETENTION_HOURS = 24
+
+Record = Dict[str, Any]
+Row = Dict[str, Any]
+LineKey = Tuple[str, str, str, str]  # (event_ref, market, book, outcome)
+
+
+def _number(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def event_mapper(sport: str):
+    """Mapper for an Odds API game -> the event fields repeated on its odds_latest rows."""
+    def map_event(game: Record) -> Optional[Row]:
+        if not game.get("id"):
+            return None
+        return {
+            "event_ref": str(game["id"]),
+            "sport": sport,
+            "home_team": game.get("home_team"),
+            "away_team": game.get("away_team"),
+            "commence_time": game.get("commence_time"),
+        }
+    return map_event
+
+
+def flatten_game(event: Row, game: Record, polled_at: str) -> List[Row]:
+    """One quote row per (book, market, outcome) of a game."""
+    quotes = []
+    for bookmaker in game.get("bookmakers") or []:
+        for market in bookmaker.get("markets") or []:
+            recorded_at = market.get("last_update") or bookmaker.get("last_update") or polled_at
+            for outcome in market.get("outcomes") or []:
+                quotes.append({
+                    **event,
+                    "market": market.get("key"),
+                    "book": bookmaker.get("key"),
+                    "outcome": outcome.get("name"),
+                    "price": _number(outcome.get("price")),
+                    "point": _number(outcome.get("point")),
+                    "recorded_at": recorded_at,
+                })
+    return quotes
+
+
+def line_key(row: Row) -> LineKey:
+    return (str(row.get("event_ref")), row.get("market"), row.get("book"), row.get("outcome"))
+
+
+def describe_quote(row: Row) -> str:
+    return f"{row.get('event_ref')} {row.get('market')} {row.get('book')} {row.get('outcome')}"
+
+
+class LineBook:
+    """Last written (price, point) per line, to write only what moved."""
+
+    def __init__(self):
+        self.lines: Dict[LineKey, Tuple[Any, Any]] = {}
+        self.starts: Dict[str, Optional[str]] = {}
+        self.loaded = False
+
+    def moved(self, quotes: Iterable[Row]) -> Tuple[List[Row], List[Row], int]:
+        """Split `quotes` into (new lines, moved lines, unchanged count)."""
+        new, moved, unchanged = [], [], 0
+        for quote in quotes:
+            previous = self.lines.get(line_key(quote))
+            if previous is None:
+                new.append(quote)
+            elif previous != (quote["price"], quote["point"]):
+                moved.append(quote)
+            else:
+                unchanged += 1
+        return new, moved, unchanged
+
+    def record(self, quotes: Iterable[Row]):
+        """Remember `quotes` as written; call only with rows the database accepted."""
+        for quote in quotes:
+            self.lines[line_key(quote)] = (quote["price"], quote["point"])
+            self.starts[str(quote.get("event_ref"))] = quote.get("commence_time")
+
+    def prune(self, now: datetime) -> Set[str]:
+        """Forget lines of events that started long ago (they no longer move); returns their refs."""
+        cutoff = (now - timedelta(hours=BOOK_RETENTION_HOURS)).isoformat()
+        stale = {ref for ref, start in self.starts.items() if start and str(start).replace("Z", "+00:00") < cutoff}
+        if stale:
+            self.lines = {key: value for key, value in self.lines.items() if key[0] not in stale}
+            for ref in stale:
+                del self.starts[ref]
+        return stale
+
+
+def _delete_lines(db: Client, refs: List[str]):
+    """Remove finished events' rows from odds_latest (runs in a worker thread)."""
+    for start in range(0, len(refs), 100):
+        db.table("odds_latest").delete().in_("event_ref", refs[start:start + 100]).execute()
+
+
+# Shared by every odds feed in this process
+book = LineBook()
+
+
+async def write_quotes(db: Client, quotes: List[Row]) -> Tuple[List[Row], List[Tuple[Row, str]]]:
+    """Append `quotes` to odds_history and upsert them into odds_latest; returns (accepted, failed)."""
+    now = datetime.now(timezone.utc).isoformat()
+    history = [{column: quote.get(column) for column in HISTORY_COLUMNS} for quote in quotes]
+    latest = [{**quote, "updated_at": now} for quote in quotes]
+    history_result, latest_result = await asyncio.gather(
+        batched_upsert(db, "odds_history", history, on_conflict=HISTORY_CONFLICT),
+        batched_upsert(db, "odds_latest", latest, on_conflict=LATEST_CONFLICT),
+    )
+    failed = history_result.failed + latest_result.failed
+    # A line is only remembered once both writes landed, so a failed one is retried next poll
+    failed_keys = {line_key(row) for row, _ in failed}
+    return [quote for quote in quotes if line_key(quote) not in failed_keys], failed
+
+
+def odds_url(spec: FeedSpec) -> str:
+    return (f"{ODDS_API_URL}/{spec.path}?apiKey={os.getenv('ODDS_API_KEY', '')}"
+            f"&regions={ODDS_REGIONS}&markets={ODDS_MARKETS}&oddsFormat=american&dateFormat=iso")
+
+
+async def run_odds_feed(spec: FeedSpec, db: Client) -> FeedRun:
+    """Poll one sport's odds and write the lines that moved since the last poll."""
+    if not book.loaded:
+        try:
+            book.record(await asyncio.to_thread(scan_rows, db, "odds_latest", LATEST_COLUMNS))
+            book.loaded = True
+        except Exception as e:
+            print(f"❌ {spec.name}: could not load current lines ({e}); skipping this run")
+            return FeedRun(spec.name, "error", error=str(e))
+
+    now = datetime.now(timezone.utc)
+    polled_at = now.isoformat()
+    games = new_count = moved_count = unchanged = 0
+    pending: List[Row] = []
+    failed: List[Tuple[Row, str]] = []
+
+    async def flush():
+        accepted, rejected = await write_quotes(db, pending)
+        # Hooks run before the book moves on, so they can still read each line's previous value
+        await run_write_hooks(db, "odds_latest", accepted)
+        book.record(accepted)
+        failed.extend(rejected)
+        pending.clear()
+
+    try:
+        async with open_stream(odds_url(spec), conditional=False) as resp:
+            if resp.status_code != 200:
+                await resp.aread()
+                print(f"❌ {spec.name}: API Error: {resp.status_code} - {resp.text}")
+                return FeedRun(spec.name, "error", error=f"HTTP {resp.status_code}")
+            remaining = resp.headers.get("x-requests-remaining")
+            async for game in iter_json_items(resp, spec.items_prefix):
+                games += 1
+                event = spec.mapper(game)
+                if event is None:
+                    continue
+                new, moved, same = book.moved(flatten_game(event, game, polled_at))
+                new_count += len(new)
+                moved_count += len(moved)
+                unchanged += same
+                pending.extend(new)
+                pending.extend(moved)
+                if len(pending) >= DEFAULT_BATCH_SIZE:
+                    await flush()
+            if pending:
+                await flush()
+    except Exception as e:
+        print(f"❌ {spec.name}: odds ingest failed: {e}")
+        return FeedRun(spec.name, "error", error=str(e))
+
+    for row, error in failed:
+        print(f"❌ Failed to write {spec.label} {spec.describe(row)}: {error}")
+    failed_keys = {line_key(row) for row, _ in failed}
+    inserted = new_count - sum(1 for key in failed_keys if key not in book.lines)
+    updated = moved_count - sum(1 for key in failed_keys if key in book.lines)
+    print(f"✅ {spec.name}: {games} games, {inserted} new lines, {updated} moved, {unchanged} unchanged, "
+          f"{len(failed_keys)} failed" + (f" ({remaining} API requests left)" if remaining else ""))
+    if inserted or updated:
+        await response_cache.invalidate("odds")
+    stale = book.prune(now)
+    if stale:
+        try:
+            await asyncio.to_thread(_delete_lines, db, sorted(stale))
+        except Exception as e:
+            # Harmless to leave; the next prune after a restart finds them again
+            print(f"❌ {spec.name}: could not delete lines of {len(stale)} finished events: {e}")
+
+    return FeedRun(
+        spec.name, "partial" if failed else "ok", records=games,
+        inserted=inserted, updated=updated, skipped=unchanged, failed=len(failed_keys),
+    )
+
+
+# Odds API sport keys for the sports the app follows (same as lib/odds.ts)
+ODDS_SPORTS = {
+    "NBA": "basketball_nba",
+    "NCAAB": "basketball_ncaab",
+    "NFL": "americanfootball_nfl",
+    "MLB": "baseball_mlb",
+}
+
+if os.getenv("ODDS_API_KEY"):
+    for _sport, _api_sport in ODDS_SPORTS.items():
+        register_feed(FeedSpec(
+            name=f"{_sport.lower()}_odds", path=f"sports/{_api_sport}/odds", mapper=event_mapper(_sport),
+            table="odds_latest", label="line", describe=describe_quote, conflict_key=LATEST_CONFLICT,
+            sport=_sport, interval_minutes=30, live_interval_minutes=5, max_interval_minutes=240,
+            runner=run_odds_feed,
+        ))
@@ -0,0 +1,133 @@
+"""
+Streaming ingest pipeline: fetch -> transform -> write.
+
+A feed response is parsed incrementally (``ijson`` when installed), each
+record goes through a per-feed mapper, and mapped rows are grouped into
+batches that flow through a bounded ``asyncio.Queue`` into a writer.
+
+The queue is the backpressure: when the writer falls behind, the producer
+blocks on ``put`` and stops reading the socket, so at most ``max_pending``
+batches (plus the one being filled and the one being written) are in memory
+no matter how large the feed is. Parsing the next batch overlaps with
+writing the previous one.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from sportsapp.backend.app.db.upsert import DEFAULT_BATCH_SIZE
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+Row = Dict[str, Any]
+Mapper = Callable[[Record], Optional[Row]]
+Sink = Callable[[List[Row]], Awaitable[Any]]
+
+_DONE = object()
+
+
+async def iter_json_items(response: httpx.Response, prefix: str = "item") -> AsyncIterator[Any]:
+    """Yield the items of a JSON array response as the bytes arrive.
+
+    `prefix` is an ijson path (``"item"`` for a top-level array). Without
+    ijson the body is read and decoded in one piece, which works but loses
+    the flat memory profile.
+    """
+    if ijson is None:
+        data = json.loads(await response.aread())
+        for key in prefix.split(".")[:-1]:
+            data = data[key]
+        for item in data:
+            yield item
+        return
+
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, prefix, use_float=True)
+    async for chunk in response.aiter_bytes():
+        parser.send(chunk)
+        for item in items:
+            yield item
+        del items[:]
+    parser.close()
+    for item in items:
+        yield item
+
+
+@dataclass
+class PipelineStats:
+    """Counts from one pipeline run."""
+    records: int = 0
+    rows: int = 0
+    dropped: int = 0
+    batches: int = 0
+
+
+async def run_pipeline(
+    records: AsyncIterator[Record],
+    mapper: Mapper,
+    sink: Sink,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending: int = 2,
+) -> PipelineStats:
+    """Map `records` into rows and hand them to `sink` in batches of `batch_size`.
+
+    A mapper returning None (or raising) drops that record. Errors from the
+    source or the sink stop the run and are re-raised.
+    """
+    stats = PipelineStats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_pending))
+
+    async def produce():
+        batch: List[Row] = []
+        try:
+            async for record in records:
+                stats.records += 1
+                try:
+                    row = mapper(record)
+                except Exception as e:
+                    logger.warning(f"Dropping record that failed to map: {e!r}")
+                    row = None
+                if row is None:
+                    stats.dropped += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+        except asyncio.CancelledError:
+            # The sink failed and the consumer is gone; nothing will read a done marker
+            raise
+        except BaseException:
+            # Wake the consumer; awaiting the producer re-raises the source error
+            await queue.put(_DONE)
+            raise
+        await queue.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                break
+            await sink(batch)
+            stats.batches += 1
+            stats.rows += len(batch)
+    except BaseException:
+        producer.cancel()
+        # Let the producer unwind (closing the source) before the caller closes the response
+        await asyncio.gather(producer, return_exceptions=True)
+        raise
+    await producer
+    return stats
@@ -1,5 +1,8 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import os
+import random
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import logging
 
@@ -7,41 +10,77 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from sportsapp.backend.app.jobs.ingest_nba import ingest_nba_teams, ingest_ufc_data, ingest_nfl_teams
+from sportsapp.backend.app.db.connection import supabase_service
+from sportsapp.backend.app.jobs.adaptive import IDLE, AdaptiveCadence, EventCalendar, jittered
+from sportsapp.backend.app.jobs.engine import run_feed
+from sportsapp.backend.app.jobs.feeds import FeedSpec, get_feeds
+from sportsapp.backend.app.jobs import events  # noqa: F401  registers the game/score feeds
+from sportsapp.backend.app.jobs import odds  # noqa: F401  registers the odds feeds (when ODDS_API_KEY is set)
+from sportsapp.backend.app.jobs import alerts  # noqa: F401  registers the alert write hooks
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
 
-def setup_jobs():
-    """Configure background jobs for data ingestion."""
-    # NBA: Every 5 minutes (frequent for live scores)
-    scheduler.add_job(
-        ingest_nba_teams,
-        "interval",
-        minutes=5,
-        id="nba_ingest",
-        max_instances=1,
-        replace_existing=True
-    )
-    # UFC: Every 10 minutes (less frequent, event-based)
+# Comma-separated feed names to schedule; empty means every registered feed
+INGEST_FEEDS = [name.strip() for name in os.getenv("INGEST_FEEDS", "").split(",") if name.strip()]
+
+calendar = EventCalendar(supabase_service)
+cadence = AdaptiveCadence()
+
+def _job_id(spec: FeedSpec) -> str:
+    return f"{spec.name}_ingest"
+
+def _schedule(spec: FeedSpec, delay: float):
     scheduler.add_job(
-        ingest_ufc_data,
-        "interval",
-        minutes=10,
-        id="ufc_ingest",
+        run_adaptive,
+        "date",
+        run_date=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        args=[spec],
+        id=_job_id(spec),
         max_instances=1,
         replace_existing=True
     )
-    # NFL: Every 15 minutes (less frequent, event-based)
+
+async def run_adaptive(spec: FeedSpec):
+    """Run one feed, then schedule its next run from game state and what changed."""
+    run = None
+    try:
+        run = await run_feed(spec)
+    finally:
+        state = await calendar.state(spec.sport)
+        delay = cadence.next_delay(spec, run, state)
+        _schedule(spec, delay)
+        logger.info(f"{spec.name}: {state}, next run in {delay / 60:.1f}min")
+
+async def watch_calendar():
+    """Pull a backed-off feed forward as soon as its sport goes live or is about to start."""
+    states = await calendar.refresh(force=True)
+    now = datetime.now(timezone.utc)
+    for spec in get_feeds(INGEST_FEEDS):
+        if states.get(spec.sport, IDLE) == IDLE or not spec.live_interval_minutes:
+            continue
+        job = scheduler.get_job(_job_id(spec))
+        live_due = now + timedelta(minutes=spec.live_interval_minutes)
+        if job is not None and job.next_run_time and job.next_run_time > live_due:
+            cadence.reset(spec)
+            job.modify(next_run_time=now + timedelta(seconds=jittered(30)))
+            logger.info(f"{spec.name}: {spec.sport} is {states[spec.sport]}, polling now")
+
+def setup_jobs():
+    """Start each feed on a staggered, game-state-aware cadence (see jobs/adaptive.py)."""
+    feeds = get_feeds(INGEST_FEEDS)
+    for spec in feeds:
+        # Stagger first runs so the feeds don't hit the provider and Supabase together
+        _schedule(spec, random.uniform(1, min(60, spec.interval_minutes * 60)))
     scheduler.add_job(
-        ingest_nfl_teams,
+        watch_calendar,
         "interval",
-        minutes=15,
-        id="nfl_ingest",
+        seconds=calendar.refresh_seconds,
+        id="event_calendar",
         max_instances=1,
         replace_existing=True
     )
     scheduler.start()
-    logger.info("Scheduler started: NBA (5min), UFC (10min)")
\ No newline at end of file
+    logger.info("Scheduler started: " + ", ".join(f"{spec.name} ({spec.interval_minutes:g}min)" for spec in feeds))
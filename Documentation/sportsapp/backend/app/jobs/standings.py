@@ -0,0 +1,311 @@
+"""
+Incrementally maintained standings and team leaderboards.
+
+Standings used to exist only as a scraped Sports Reference page. The ingest
+worker now keeps them itself, from the ``events`` rows it writes:
+
+- a ``StandingsBook`` holds running totals per (sport, season, team) and
+  applies each completed event once (keyed by ``ext_ref``); a corrected
+  score replaces the event's previous contribution instead of adding twice
+- ``TopN`` leaderboards (wins, points scored) keep the best ``N`` teams in a
+  min-heap over the running totals, so a new result touches that small heap
+  instead of re-sorting every team
+- after each upserted batch, only the (sport, season) keys it touched are
+  re-ranked and written to the ``standings`` and ``leaderboards`` summary
+  tables, and the API's cached ``standings`` responses are invalidated
+
+The book is rebuilt from the completed events already in the table when the
+worker takes leadership (``bootstrap``), so restarts do not lose history.
+The API reads the summary tables: one indexed lookup per (sport, season).
+
+Event rows need ``sport``, ``season``, ``status``, ``home_team_id``,
+``away_team_id``, ``home_score`` and ``away_score``.
+"""
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from supabase import Client
+
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.scan import scan_rows
+from sportsapp.backend.app.db.upsert import batched_upsert
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose score is final; Canceled/Postponed games do not count
+COMPLETED_STATUSES = {"Final", "F/OT", "F/SO", "Closed"}
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", "10"))
+LEADERBOARD_STATS = ("wins", "points_for")
+EVENT_COLUMNS = ("ext_ref", "sport", "season", "status", "start_time", "home_team_id", "away_team_id",
+                 "home_score", "away_score")
+
+Row = Dict[str, Any]
+Key = Tuple[str, Any]  # (sport, season)
+
+
+class TeamStanding:
+    """Running totals for one team in one season."""
+
+    __slots__ = ("team_id", "wins", "losses", "ties", "points_for", "points_against",
+                 "home_wins", "home_losses", "away_wins", "away_losses", "results")
+
+    def __init__(self, team_id: Any):
+        self.team_id = team_id
+        self.wins = self.losses = self.ties = 0
+        self.points_for = self.points_against = 0
+        self.home_wins = self.home_losses = self.away_wins = self.away_losses = 0
+        # ext_ref -> (start_time, "W"/"L"/"T") for streak and last-10
+        self.results: Dict[str, Tuple[str, str]] = {}
+
+    def apply(self, ref: str, start: str, scored: int, allowed: int, home: bool, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) one game."""
+        result = "W" if scored > allowed else "L" if scored < allowed else "T"
+        if result == "W":
+            self.wins += sign
+            if home:
+                self.home_wins += sign
+            else:
+                self.away_wins += sign
+        elif result == "L":
+            self.losses += sign
+            if home:
+                self.home_losses += sign
+            else:
+                self.away_losses += sign
+        else:
+            self.ties += sign
+        self.points_for += sign * scored
+        self.points_against += sign * allowed
+        if sign > 0:
+            self.results[ref] = (start, result)
+        else:
+            self.results.pop(ref, None)
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.ties
+
+    @property
+    def win_pct(self) -> float:
+        return (self.wins + 0.5 * self.ties) / self.games if self.games else 0.0
+
+    def form(self) -> Tuple[str, str]:
+        """(streak, last 10) such as ("W3", "7-3")."""
+        ordered = [result for _, result in sorted(self.results.values())]
+        if not ordered:
+            return "", "0-0"
+        count = 0
+        for result in reversed(ordered):
+            if result != ordered[-1]:
+                break
+            count += 1
+        recent = ordered[-10:]
+        last10 = f"{recent.count('W')}-{recent.count('L')}"
+        if "T" in recent:
+            last10 += f"-{recent.count('T')}"
+        return f"{ordered[-1]}{count}", last10
+
+
+class TopN:
+    """Top-N of running totals: a min-heap of the current leaders plus all totals."""
+
+    def __init__(self, n: int = LEADERBOARD_SIZE):
+        self.n = n
+        self.totals: Dict[Hashable, float] = {}
+        self.heap: List[Tuple[float, Hashable]] = []
+        self.members: Set[Hashable] = set()
+
+    def add(self, key: Hashable, delta: float):
+        value = self.totals.get(key, 0) + delta
+        self.totals[key] = value
+        if delta < 0 and key in self.members:
+            # A leader went down (score correction): someone outside may now belong
+            self._rebuild()
+        elif key in self.members:
+            self.heap = [(value if k == key else v, k) for v, k in self.heap]
+            heapq.heapify(self.heap)
+        elif len(self.heap) < self.n:
+            heapq.heappush(self.heap, (value, key))
+            self.members.add(key)
+        elif value > self.heap[0][0]:
+            _, evicted = heapq.heapreplace(self.heap, (value, key))
+            self.members.discard(evicted)
+            self.members.add(key)
+
+    def _rebuild(self):
+        self.heap = [(v, k) for k, v in heapq.nlargest(self.n, self.totals.items(), key=lambda kv: kv[1])]
+        heapq.heapify(self.heap)
+        self.members = {k for _, k in self.heap}
+
+    def top(self) -> List[Tuple[Hashable, float]]:
+        return [(k, v) for v, k in sorted(self.heap, key=lambda vk: vk[0], reverse=True)]
+
+
+class StandingsBook:
+    """Standings and leaderboards for every (sport, season), updated one event at a time."""
+
+    def __init__(self, leaderboard_size: int = LEADERBOARD_SIZE):
+        self.leaderboard_size = leaderboard_size
+        self.teams: Dict[Key, Dict[Any, TeamStanding]] = {}
+        self.leaders: Dict[Tuple[str, Any, str], TopN] = {}
+        # ext_ref -> the contribution currently applied, to replace it on corrections
+        self.applied: Dict[str, Tuple[Key, Any, Any, int, int, str]] = {}
+        self._tables: Dict[Key, List[Row]] = {}
+
+    def _team(self, key: Key, team_id: Any) -> TeamStanding:
+        teams = self.teams.setdefault(key, {})
+        team = teams.get(team_id)
+        if team is None:
+            team = teams[team_id] = TeamStanding(team_id)
+        return team
+
+    def _leaderboard(self, key: Key, stat: str) -> TopN:
+        board = self.leaders.get((*key, stat))
+        if board is None:
+            board = self.leaders[(*key, stat)] = TopN(self.leaderboard_size)
+        return board
+
+    def _contribute(self, ref: str, entry: Tuple[Key, Any, Any, int, int, str], sign: int):
+        key, home_id, away_id, home_score, away_score, start = entry
+        self._team(key, home_id).apply(ref, start, home_score, away_score, home=True, sign=sign)
+        self._team(key, away_id).apply(ref, start, away_score, home_score, home=False, sign=sign)
+        for team_id, scored, allowed in ((home_id, home_score, away_score), (away_id, away_score, home_score)):
+            self._leaderboard(key, "wins").add(team_id, sign * (scored > allowed))
+            self._leaderboard(key, "points_for").add(team_id, sign * scored)
+        self._tables.pop(key, None)
+
+    def apply(self, row: Row) -> Set[Key]:
+        """Apply one event row; returns the (sport, season) keys whose standings changed.
+
+        A correction that moves an event to another season or sport changes
+        both the old key (its contribution is removed) and the new one.
+        """
+        ref = str(row.get("ext_ref") or row.get("id") or "")
+        previous = self.applied.get(ref)
+        entry = None
+        if (row.get("status") in COMPLETED_STATUSES and row.get("home_score") is not None
+                and row.get("away_score") is not None and row.get("home_team_id") is not None
+                and row.get("away_team_id") is not None and ref):
+            entry = ((row.get("sport"), row.get("season")), row["home_team_id"], row["away_team_id"],
+                     int(row["home_score"]), int(row["away_score"]), str(row.get("start_time") or ""))
+        if entry == previous:
+            return set()
+        changed = set()
+        if previous is not None:
+            self._contribute(ref, previous, -1)
+            del self.applied[ref]
+            changed.add(previous[0])
+        if entry is not None:
+            self._contribute(ref, entry, 1)
+            self.applied[ref] = entry
+            changed.add(entry[0])
+        return changed
+
+    def apply_many(self, rows: Iterable[Row]) -> Set[Key]:
+        changed = set()
+        for row in rows:
+            changed |= self.apply(row)
+        return changed
+
+    def table(self, sport: str, season: Any) -> List[Row]:
+        """Ranked standings rows for one (sport, season); cached until the next change."""
+        key = (sport, season)
+        cached = self._tables.get(key)
+        if cached is not None:
+            return cached
+        teams = sorted(self.teams.get(key, {}).values(),
+                       key=lambda t: (t.win_pct, t.wins, t.points_for - t.points_against), reverse=True)
+        leader = teams[0] if teams else None
+        rows = []
+        for rank, team in enumerate(teams, 1):
+            streak, last10 = team.form()
+            rows.append({
+                "sport": sport,
+                "season": season,
+                "team_id": team.team_id,
+                "rank": rank,
+                "wins": team.wins,
+                "losses": team.losses,
+                "ties": team.ties,
+                "win_pct": round(team.win_pct, 4),
+                "games_back": ((leader.wins - team.wins) + (team.losses - leader.losses)) / 2,
+                "points_for": team.points_for,
+                "points_against": team.points_against,
+                "point_diff": team.points_for - team.points_against,
+                "home_record": f"{team.home_wins}-{team.home_losses}",
+                "away_record": f"{team.away_wins}-{team.away_losses}",
+                "streak": streak,
+                "last10": last10,
+            })
+        self._tables[key] = rows
+        return rows
+
+    def leaderboard(self, sport: str, season: Any, stat: str) -> List[Row]:
+        board = self.leaders.get((sport, season, stat))
+        if board is None:
+            return []
+        return [
+            {"sport": sport, "season": season, "stat": stat, "rank": rank, "team_id": team_id, "value": value}
+            for rank, (team_id, value) in enumerate(board.top(), 1)
+        ]
+
+
+class StandingsMaterializer:
+    """Keeps a ``StandingsBook`` in step with ingest writes and persists what changed."""
+
+    def __init__(self, book: Optional[StandingsBook] = None):
+        self.book = book or StandingsBook()
+        self.loaded = False
+        self._lock = asyncio.Lock()
+
+    async def bootstrap(self, db: Client) -> bool:
+        """Rebuild the book from events already in the table; False if that failed."""
+        try:
+            rows = await asyncio.to_thread(
+                scan_rows, db, "events", EVENT_COLUMNS, where={"status": COMPLETED_STATUSES},
+            )
+        except Exception as e:
+            logger.warning(f"Could not load events for standings ({e}); will retry on the next write")
+            return False
+        self.book = StandingsBook(self.book.leaderboard_size)
+        keys = self.book.apply_many(rows)
+        self.loaded = True
+        await self.persist(db, keys)
+        logger.info(f"Standings rebuilt from {len(rows)} completed events ({len(keys)} sport seasons)")
+        return True
+
+    async def on_events_written(self, db: Client, rows: List[Row]):
+        """Ingest hook: fold newly written event rows in and persist the seasons they touched."""
+        async with self._lock:
+            if not self.loaded:
+                # The rows just written are in the table, so bootstrapping covers them
+                await self.bootstrap(db)
+                return
+            await self.persist(db, self.book.apply_many(rows))
+
+    async def persist(self, db: Client, keys: Iterable[Key]):
+        keys = [k for k in keys if k[0] is not None]
+        if not keys:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        standings, leaders = [], []
+        for sport, season in keys:
+            standings.extend({**row, "updated_at": now} for row in self.book.table(sport, season))
+            for stat in LEADERBOARD_STATS:
+                leaders.extend({**row, "updated_at": now} for row in self.book.leaderboard(sport, season, stat))
+        results = await asyncio.gather(
+            batched_upsert(db, "standings", standings, on_conflict="sport,season,team_id"),
+            batched_upsert(db, "leaderboards", leaders, on_conflict="sport,season,stat,rank"),
+        )
+        for table, result in zip(("standings", "leaderboards"), results):
+            for row, error in result.failed:
+                logger.error(f"Failed to write {table} row for team {row.get('team_id')}: {error}")
+        await response_cache.invalidate("standings")
+
+
+# The ingest engine calls this for every batch written to events
+materializer = StandingsMaterializer()
@@ -0,0 +1,88 @@
+"""
+Standalone ingest worker.
+
+The API no longer runs the scheduler, so ingestion happens once no matter how
+many uvicorn workers serve requests. Run this next to the API:
+
+    python sportsapp/backend/app/jobs/worker.py
+
+Several workers can be started for failover; only the leader (see
+``jobs/leader.py``) runs jobs, the others wait to take over.
+"""
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Get the sportsapp directory (4 levels up from this file)
+# worker.py -> jobs -> app -> backend -> sportsapp
+SPORTSAPP_DIR = Path(__file__).resolve().parent.parent.parent.parent
+ENV_FILE = SPORTSAPP_DIR / ".env"
+
+# Add the parent directory (containing sportsapp) to sys.path so imports work
+PROJECT_ROOT = SPORTSAPP_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Load .env from sportsapp directory
+load_dotenv(dotenv_path=ENV_FILE)
+
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.connection import supabase_service
+from sportsapp.backend.app.jobs.alerts import alerts
+from sportsapp.backend.app.jobs.http_client import close_client
+from sportsapp.backend.app.jobs.leader import leader_lock, wait_for_leadership
+from sportsapp.backend.app.jobs.scheduler import scheduler, setup_jobs
+from sportsapp.backend.app.jobs.standings import materializer as standings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LOCK_CHECK_SECONDS = 30
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    lock = leader_lock()
+    logger.info(f"Waiting for ingest leadership ({lock})")
+    leadership = asyncio.create_task(wait_for_leadership(lock))
+    stopping = asyncio.create_task(stop.wait())
+    await asyncio.wait({leadership, stopping}, return_when=asyncio.FIRST_COMPLETED)
+    if stop.is_set():
+        leadership.cancel()
+        await asyncio.to_thread(lock.release)
+        return 0
+
+    logger.info("Acquired ingest leadership; starting scheduler")
+    lost = False
+    try:
+        response_cache.warn_if_local("ingest worker")
+        # Standings and alert state are kept in memory from here on; start from what is already stored
+        await standings.bootstrap(supabase_service)
+        await alerts.bootstrap(supabase_service)
+        setup_jobs()
+        # Step down if the lock is lost (e.g. the database session dropped)
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=LOCK_CHECK_SECONDS)
+            except asyncio.TimeoutError:
+                if not await asyncio.to_thread(lock.is_held):
+                    logger.error("Lost ingest leadership; stopping so another worker can take over")
+                    lost = True
+                    break
+    finally:
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+        await close_client()
+        await asyncio.to_thread(lock.release)
+        logger.info("Ingest worker stopped")
+    # Non-zero exit lets a process manager restart a worker that lost the lock
+    return 1 if lost else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
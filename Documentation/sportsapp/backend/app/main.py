@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import asyncio
 import sys
 from pathlib import Path
 import logging
@@ -10,8 +10,12 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from sportsapp.backend.app.jobs.scheduler import setup_jobs
-from sportsapp.backend.app.api import events, teams, players
+from sportsapp.backend.app.api import alerts, batch, events, odds, teams, players, search, standings, stats
+from sportsapp.backend.app.db.cache import response_cache
+from sportsapp.backend.app.db.odds import odds_board
+from sportsapp.backend.app.db.repository import repository
+from sportsapp.backend.app.db.snapshot import snapshot
+from sportsapp.backend.app.stats.engine import engine as stats_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,11 +31,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor for list endpoints
 )
 
 app.include_router(events.router)
 app.include_router(teams.router)
 app.include_router(players.router)
+app.include_router(search.router)
+app.include_router(stats.router)
+app.include_router(standings.router)
+app.include_router(odds.router)
+app.include_router(alerts.router)
+# Several list queries in one round trip for dashboard pages
+app.include_router(batch.router)
 
 # Health check endpoint
 @app.get("/health")
@@ -39,11 +51,35 @@ async def health_check():
     logger.info("Health check requested")
     return {"status": "ok"}
 
-# Start scheduler on app startup
+# Listen for cache invalidations published by the ingest worker, and load
+# the teams/players snapshot, search index and current odds in the background (refreshed on those invalidations)
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Starting FastAPI app and scheduler")
-    setup_jobs()
+    response_cache.on_invalidate(snapshot.poke)
+    response_cache.on_invalidate(odds_board.poke)
+    await response_cache.start()
+    await snapshot.start()
+    await odds_board.start()
+    # Materialize every scraped season up front so the first /stats request is not a cold Parquet read
+    app.state.stats_preload = asyncio.create_task(preload_stats())
+
+async def preload_stats():
+    try:
+        loaded = await asyncio.to_thread(stats_engine.preload)
+        logger.info(f"Stats engine: {loaded} seasons materialized")
+    except Exception as e:
+        logger.warning(f"Stats preload failed: {e}")
+
+# Release pooled database and cache connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    await snapshot.close()
+    await odds_board.close()
+    await response_cache.close()
+    await repository.close()
+
+# Ingestion runs in its own process (jobs/worker.py) so that every uvicorn
+# worker serves requests only and feeds are ingested exactly once
 
 # Placeholder for routers (to be added later)
 # app.include_router(events.router, prefix="/events", tags=["events"])
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""
+Vectorized season stats over the scraped Sports Reference dataset.
+
+The bulk scraper (``scripts/scrape_sports_refs.py --output-dir``) writes one
+Parquet file per (sport, stat_type, year)::
+
+    <STATS_DATASET_DIR>/sport=basketball/stat_type=totals/year=2024/part-0.parquet
+
+Each partition is loaded once into a ``SeasonStats`` materialization: the
+player rows as float64 NumPy columns (one row per player; for traded
+players the combined TOT/2TM row), their league percentiles for every stat
+computed in one ``rank(pct=True)`` pass, and the per-team rows for splits.
+Leaderboard sort orders are computed on first use per (stat, per, order)
+and kept, so a league-wide leaderboard is a mask and a slice over a cached
+argsort rather than a scan per request.
+
+Materializations are cached per partition and rebuilt when the file's
+mtime changes (a re-scrape replaces it).
+"""
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sportsapp.backend.app.stats.schema import COMBINED_TEAM, is_counting_stat, lower_is_better
+
+STATS_DATASET_DIR = os.getenv("STATS_DATASET_DIR", "sports_ref_dataset")
+
+# Never stats, even when a season's values happen to parse as numbers
+LABEL_COLUMNS = {"Player", "Name", "Player-additional", "Team", "Tm", "Pos", "Lg", "Awards", "Notes",
+                 "Stat_Type", "Rk", "Year"}
+
+PER_MODES = ("game", "36")
+# Never normalized per game / per 36 (rates and "%" columns are left as is too)
+UNSCALED = {"Age", "G", "GS"}
+
+Row = Dict[str, Any]
+
+
+def _first_present(columns: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
+    return next((c for c in candidates if c in columns), None)
+
+
+def _clean(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(float(value), 4)
+
+
+class SeasonStats:
+    """One (sport, stat_type, year) partition, materialized for fast queries."""
+
+    def __init__(self, sport: str, stat_type: str, year: int, df: pd.DataFrame):
+        self.sport = sport
+        self.stat_type = stat_type
+        self.year = year
+
+        name_col = _first_present(df.columns, ("Player", "Name"))
+        if name_col is None:
+            raise ValueError(f"{sport} {stat_type} {year} has no Player/Name column")
+        team_col = _first_present(df.columns, ("Team", "Tm"))
+        key_col = "Player-additional" if "Player-additional" in df.columns else name_col
+
+        df = df[df[name_col].notna() & (df[name_col].astype(str) != "League Average")].reset_index(drop=True)
+        teams = df[team_col].astype(str) if team_col else pd.Series("", index=df.index)
+        combined = teams.str.match(COMBINED_TEAM)
+
+        # A traded player's season is their combined (TOT/2TM) line, wherever the table lists it
+        combined_first = combined.sort_values(ascending=False, kind="stable").index
+        chosen = df.loc[combined_first, key_col].drop_duplicates(keep="first").index
+        players = df.loc[df.index.isin(chosen)]
+        self.names = players[name_col].astype(str).to_numpy(dtype=object)
+        self.teams = teams.loc[players.index].to_numpy(dtype=object)
+        self.positions = players["Pos"].astype(str).to_numpy(dtype=object) if "Pos" in players else None
+
+        stat_columns = [c for c in df.columns if c not in LABEL_COLUMNS]
+        numeric = df[stat_columns].apply(pd.to_numeric, errors="coerce").astype("float64")
+        numeric = numeric.loc[:, numeric.notna().any()]
+        self.stats: List[str] = list(numeric.columns)
+
+        # Only counting stats scale per game / per 36, decided by name: indexes such as
+        # OPS+ or ORtg are whole numbers too. A per-game table holds the totals' counts / G
+        counting_type = "totals" if stat_type == "per_game" else stat_type
+        self.scalable = {c for c in self.stats if c not in UNSCALED and is_counting_stat(sport, counting_type, c)}
+
+        player_numeric = numeric.loc[players.index]
+        self.columns: Dict[str, np.ndarray] = {c: player_numeric[c].to_numpy() for c in self.stats}
+        self._index = {name.lower(): i for i, name in reversed(list(enumerate(self.names)))}
+
+        # League-relative percentiles for every stat in one vectorized pass
+        # Lower-is-better stats rank ascending and their percentiles are inverted
+        self.lower_is_better = lower_is_better(sport, stat_type)
+        signed = player_numeric.copy()
+        lower = [c for c in self.stats if c in self.lower_is_better]
+        signed[lower] = -signed[lower]
+        ranks = signed.rank(pct=True)
+        self.percentiles: Dict[str, np.ndarray] = {c: ranks[c].to_numpy() for c in self.stats}
+
+        # Per-team lines (traded players counted once per team) for splits
+        self.team_frame = numeric.loc[~combined.to_numpy()].assign(_team=teams[~combined].to_numpy())
+
+        self._orders: Dict[Tuple[str, Optional[str], bool], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    def values(self, stat: str, per: Optional[str] = None) -> np.ndarray:
+        """`stat` for every player, optionally per game or per 36 minutes (rates are returned as is)."""
+        if stat not in self.columns:
+            raise KeyError(f"Unknown stat {stat!r} for {self.sport} {self.stat_type} (have: {', '.join(self.stats)})")
+        values = self.columns[stat]
+        if per is None or stat not in self.scalable:
+            return values
+        if per == "game":
+            if self.stat_type == "per_game":
+                return values
+            games = self.columns.get("G")
+            if games is None:
+                raise ValueError("per=game needs a G column")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(games > 0, values / games, np.nan)
+        if per == "36":
+            minutes = self.columns.get("MP")
+            if minutes is None:
+                raise ValueError("per=36 needs an MP column")
+            # Same ratio whether the table holds totals or per-game values
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(minutes > 0, values / minutes * 36, np.nan)
+        raise ValueError(f"Unknown per {per!r} (use: {', '.join(PER_MODES)})")
+
+    def _order(self, stat: str, per: Optional[str], ascending: bool) -> np.ndarray:
+        key = (stat, per, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            values = self.values(stat, per)
+            # NaNs last either way
+            order = np.argsort(values if ascending else -values, kind="stable")
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def leaders(self, stat: str, per: Optional[str] = None, limit: int = 10, min_games: int = 0,
+                team: Optional[str] = None, ascending: Optional[bool] = None) -> List[Row]:
+        """Top `limit` players by `stat`; lower-is-better stats rank ascending by default."""
+        if ascending is None:
+            ascending = stat in self.lower_is_better
+        values = self.values(stat, per)
+        order = self._order(stat, per, ascending)
+
+        mask = ~np.isnan(values)
+        if min_games:
+            games = self.columns.get("G")
+            if games is None:
+                raise ValueError("min_games needs a G column")
+            mask &= games >= min_games
+        if team:
+            mask &= self.teams == team
+        picked = order[mask[order]][:limit]
+
+        # The precomputed percentiles cover raw values over the whole league
+        percentiles = self._pool_percentiles(values, mask, ascending) if (min_games or team or per) else None
+        return [
+            {
+                "rank": rank,
+                "player": self.names[i],
+                "team": self.teams[i],
+                "value": _clean(values[i]),
+                "percentile": _clean(percentiles[i] if percentiles is not None else self.percentiles[stat][i]),
+            }
+            for rank, i in enumerate(picked, 1)
+        ]
+
+    @staticmethod
+    def _pool_percentiles(values: np.ndarray, mask: np.ndarray, ascending: bool) -> np.ndarray:
+        """Percentiles within the qualified pool only."""
+        pool = pd.Series(np.where(mask, -values if ascending else values, np.nan))
+        return pool.rank(pct=True).to_numpy()
+
+    def player(self, name: str, per: Optional[str] = None) -> Row:
+        i = self._index.get(name.lower())
+        if i is None:
+            raise KeyError(f"No player named {name!r} in {self.sport} {self.stat_type} {self.year}")
+        return {
+            "player": self.names[i],
+            "team": self.teams[i],
+            "position": self.positions[i] if self.positions is not None else None,
+            "stats": {s: _clean(self.values(s, per)[i]) for s in self.stats},
+            "percentiles": {s: _clean(self.percentiles[s][i]) for s in self.stats},
+        }
+
+    def team_splits(self, stats: Sequence[str], agg: str = "sum") -> List[Row]:
+        """`stats` aggregated per team over its players' lines."""
+        unknown = [s for s in stats if s not in self.columns]
+        if unknown:
+            raise KeyError(f"Unknown stats: {', '.join(unknown)}")
+        if agg not in ("sum", "mean", "max"):
+            raise ValueError("agg must be sum, mean or max")
+        grouped = self.team_frame.groupby("_team", sort=True)[list(stats)].agg(agg)
+        players = self.team_frame.groupby("_team", sort=True).size()
+        return [
+            {"team": team, "players": int(players[team]), **{s: _clean(v) for s, v in row.items()}}
+            for team, row in grouped.iterrows()
+        ]
+
+
+class StatsEngine:
+    """Loads and caches ``SeasonStats`` for every partition of the dataset."""
+
+    def __init__(self, root: str = STATS_DATASET_DIR):
+        self.root = root
+        self._seasons: Dict[Tuple[str, str, int], Tuple[float, SeasonStats]] = {}
+        self._lock = threading.Lock()
+
+    def partition_path(self, sport: str, stat_type: str, year: int) -> str:
+        # Same layout as scripts/sports_ref_dataset.PartitionedDatasetWriter
+        return os.path.join(self.root, f"sport={sport}", f"stat_type={stat_type}", f"year={year}", "part-0.parquet")
+
+    def catalog(self) -> Dict[str, Dict[str, List[int]]]:
+        """{sport: {stat_type: [years]}} available on disk."""
+        found: Dict[str, Dict[str, List[int]]] = {}
+        if not os.path.isdir(self.root):
+            return found
+        for sport_dir in sorted(os.listdir(self.root)):
+            if not sport_dir.startswith("sport="):
+                continue
+            sport = sport_dir.split("=", 1)[1]
+            for type_dir in sorted(os.listdir(os.path.join(self.root, sport_dir))):
+                if not type_dir.startswith("stat_type="):
+                    continue
+                years = [
+                    int(d.split("=", 1)[1])
+                    for d in os.listdir(os.path.join(self.root, sport_dir, type_dir))
+                    if d.startswith("year=") and d.split("=", 1)[1].isdigit()
+                ]
+                found.setdefault(sport, {})[type_dir.split("=", 1)[1]] = sorted(years)
+        return found
+
+    def season(self, sport: str, stat_type: str, year: int) -> SeasonStats:
+        """The materialized partition; FileNotFoundError if it was never scraped."""
+        path = self.partition_path(sport, stat_type, year)
+        mtime = os.stat(path).st_mtime
+        key = (sport, stat_type, year)
+        cached = self._seasons.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with self._lock:
+            cached = self._seasons.get(key)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, SeasonStats(sport, stat_type, year, pd.read_parquet(path)))
+                self._seasons[key] = cached
+        return cached[1]
+
+    def preload(self) -> int:
+        """Materialize every partition on disk; returns how many were loaded."""
+        loaded = 0
+        for sport, stat_types in self.catalog().items():
+            for stat_type, years in stat_types.items():
+                for year in years:
+                    self.season(sport, stat_type, year)
+                    loaded += 1
+        return loaded
+
+    def rolling(self, sport: str, stat_type: str, name: str, stat: str, per: Optional[str] = None,
+                window: int = 3, years: Optional[Sequence[int]] = None) -> List[Row]:
+        """A player's `stat` by season with its rolling mean over `window` seasons played."""
+        years = years if years is not None else self.catalog().get(sport, {}).get(stat_type, [])
+        seasons, values, teams = [], [], []
+        for year in years:
+            season = self.season(sport, stat_type, year)
+            i = season._index.get(name.lower())
+            if i is None:
+                continue
+            seasons.append(year)
+            values.append(season.values(stat, per)[i])
+            teams.append(season.teams[i])
+        if not seasons:
+            raise KeyError(f"No {sport} {stat_type} seasons for {name!r}")
+        rolling = pd.Series(values, dtype="float64").rolling(window, min_periods=1).mean().to_numpy()
+        return [
+            {"year": y, "team": t, "value": _clean(v), "rolling": _clean(r)}
+            for y, t, v, r in zip(seasons, teams, values, rolling)
+        ]
+
+
+# Shared by the /stats router
+engine = StatsEngine()
@@ -0,0 +1,50 @@
+"""
+Column semantics of the scraped Sports Reference dataset.
+
+A copy of the constants the stats engine needs from the scraper's
+``scripts/sports_ref_schema.py``, which writes the dataset, so the backend
+does not import from outside its own package. ``tests/test_stats_engine.py``
+fails if the two drift apart.
+"""
+import re
+from typing import FrozenSet, Optional
+
+# Team labels Sports Reference uses for a traded player's combined line
+COMBINED_TEAM = re.compile(r"^(TOT|\dTM)$")
+
+# Stats where a lower value is better, per (sport, stat_type); a stat type of
+# None applies to every table of that sport
+LOWER_IS_BETTER = {
+    ("basketball", None): frozenset({"TOV", "PF", "TOV%"}),
+    ("baseball", "batting"): frozenset({"CS", "GDP"}),
+    ("baseball", "pitching"): frozenset({"ERA", "WHIP", "FIP", "L", "BB", "H9", "HR9", "BB9"}),
+    ("baseball", "fielding"): frozenset({"E"}),
+}
+
+# Counting stats per (sport, stat_type), by name: indexes such as OPS+ or
+# ORtg are whole numbers too but are not counts
+COUNTING_STATS = {
+    ("basketball", "totals"): frozenset({
+        "G", "GS", "MP", "FG", "FGA", "3P", "3PA", "2P", "2PA", "FT", "FTA", "ORB", "DRB", "TRB",
+        "AST", "STL", "BLK", "TOV", "PF", "PTS", "Trp-Dbl",
+    }),
+    ("baseball", "batting"): frozenset({
+        "G", "PA", "AB", "R", "H", "2B", "3B", "HR", "RBI", "SB", "CS", "BB", "SO", "TB", "GDP",
+        "HBP", "SH", "SF", "IBB",
+    }),
+    ("baseball", "pitching"): frozenset({
+        "W", "L", "G", "GS", "GF", "CG", "SHO", "SV", "IP", "H", "R", "ER", "HR", "BB", "IBB", "SO",
+        "HBP", "BK", "WP", "BF",
+    }),
+    ("baseball", "fielding"): frozenset({"G", "GS", "CG", "Inn", "Ch", "PO", "A", "E", "DP"}),
+}
+
+
+def lower_is_better(sport: str, stat_type: Optional[str]) -> FrozenSet[str]:
+    """Stats of a (sport, stat_type) table that rank ascending."""
+    return LOWER_IS_BETTER.get((sport, None), frozenset()) | LOWER_IS_BETTER.get((sport, stat_type), frozenset())
+
+
+def is_counting_stat(sport: str, stat_type: Optional[str], stat: str) -> bool:
+    """True if `stat` of a (sport, stat_type) table is a count (sums over seasons, scales per game)."""
+    return stat in COUNTING_STATS.get((sport, stat_type), frozenset())
@@ -0,0 +1,121 @@
+"""
+Throughput benchmark for alert matching (jobs/alerts.py).
+
+Compiles a synthetic set of subscriptions (default 100k, spread over game,
+team, player and line-move alerts) into a ``SubscriptionIndex`` and replays
+a stream of ingest changes through ``AlertEngine.evaluate``, then reports
+changes and deliveries per second. The same changes are also matched by
+scanning every subscription, on a small sample, for comparison.
+
+Nothing is written: deliveries are built but never sent to the database.
+Importing the jobs needs the usual SUPABASE_* variables to be set.
+
+Usage:
+    python sportsapp/backend/benchmarks/alerts_throughput.py [--subscriptions 100000] [--changes 50000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# benchmarks -> backend -> sportsapp; its parent must be importable
+PROJECT_ROOT = Path(__file__).resolve().parents[2].parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sportsapp.backend.app.jobs.alerts import AlertEngine, Change
+
+EVENTS = 2000
+TEAMS = 150
+PLAYERS = 8000
+BOOKS = ["draftkings", "fanduel", "betmgm", "caesars"]
+
+
+def subscriptions(count: int):
+    rng = random.Random(1)
+    rows = []
+    for i in range(1, count + 1):
+        kind = rng.choices(["game_start", "game_final", "player_status", "line_move"], [3, 3, 2, 2])[0]
+        if kind == "player_status":
+            entity_type, entity_id = "player", rng.randint(1, PLAYERS)
+        elif kind == "line_move":
+            entity_type, entity_id = "event", f"odds{rng.randint(1, EVENTS)}"
+        elif rng.random() < 0.5:
+            entity_type, entity_id = "team", rng.randint(1, TEAMS)
+        else:
+            entity_type, entity_id = "event", f"ev{rng.randint(1, EVENTS)}"
+        rows.append({
+            "id": i, "user_id": f"user{rng.randint(1, count // 5)}", "kind": kind, "entity_type": entity_type,
+            "entity_id": entity_id, "threshold": rng.choice([0.5, 1, 1.5, 2]) if kind == "line_move" else None,
+            "market": "spreads" if kind == "line_move" else None,
+            "book": rng.choice([None, *BOOKS]) if kind == "line_move" else None,
+        })
+    return rows
+
+
+def changes(count: int):
+    """A mix of game transitions, player status moves and spread quotes."""
+    rng = random.Random(2)
+    stream = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.2:
+            kind = rng.choice(["game_start", "game_final"])
+            ref = f"ev{rng.randint(1, EVENTS)}"
+            data = {"event": ref, "status": "InProgress" if kind == "game_start" else "Final"}
+            stream.append(Change(kind, "event", ref, f"{kind}:{ref}", data))
+            for _ in range(2):
+                stream.append(Change(kind, "team", rng.randint(1, TEAMS), f"{kind}:{ref}", data))
+        elif roll < 0.3:
+            player = rng.randint(1, PLAYERS)
+            stream.append(Change("player_status", "player", player, f"player_status:{player}:{i}", {"status": "Out"}))
+        else:
+            ref = f"odds{rng.randint(1, EVENTS)}"
+            point = rng.choice([-7.5, -7, -6.5, -6, -5.5, -5, -4.5])
+            data = {"event_ref": ref, "market": "spreads", "book": rng.choice(BOOKS), "outcome": "Home",
+                    "point": point, "price": -110, "previous_point": -6, "previous_price": -110,
+                    "recorded_at": str(i)}
+            stream.append(Change("line_move", "event", ref, f"line_move:{ref}:{i}", data))
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--subscriptions", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=500, help="Changes per evaluate() call, like one ingest batch")
+    parser.add_argument("--scan-sample", type=int, default=200, help="Changes matched by full scan for comparison")
+    args = parser.parse_args()
+
+    rows = subscriptions(args.subscriptions)
+    engine = AlertEngine()
+    start = time.perf_counter()
+    engine.load(rows)
+    build = time.perf_counter() - start
+
+    stream = changes(args.changes)
+    delivered = 0
+    start = time.perf_counter()
+    for i in range(0, len(stream), args.batch):
+        delivered += len(engine.evaluate(stream[i:i + args.batch]))
+    elapsed = time.perf_counter() - start
+
+    sample = stream[:args.scan_sample]
+    everything = list(engine.index.by_id.values())
+    start = time.perf_counter()
+    for change in sample:
+        [s for s in everything
+         if (s.kind, s.entity_type, s.entity_id) == (change.kind, change.entity_type, change.entity_id)]
+    scan = (time.perf_counter() - start) / len(sample)
+
+    print(f"{len(engine.index)} subscriptions under {len(engine.index.by_key)} keys; "
+          f"index built in {build * 1000:.0f} ms")
+    print(f"{len(stream)} changes in {elapsed * 1000:.0f} ms: {len(stream) / elapsed:,.0f} changes/s, "
+          f"{delivered} deliveries ({delivered / elapsed:,.0f}/s), {elapsed / len(stream) * 1e6:.1f} us per change")
+    print(f"full scan of every subscription: {scan * 1e6:.0f} us per change "
+          f"({scan / (elapsed / len(stream)):,.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
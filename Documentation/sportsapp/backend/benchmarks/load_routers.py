@@ -0,0 +1,136 @@
+"""
+Load benchmark for the list routers: blocking supabase client vs async repository.
+
+Starts a local stub of Supabase's PostgREST endpoint (fixed artificial
+latency per query), points the app at it, and fires concurrent requests at
+``/teams/`` in-process:
+
+- before: the original handler, calling the synchronous ``supabase`` client
+  inside ``async def`` (reproduced here, since the router no longer does)
+- after: the real ``/teams/`` router, going through ``db/repository.py``
+
+Usage:
+    python sportsapp/backend/benchmarks/load_routers.py [--requests 400] [--concurrency 50] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Tuple
+
+# benchmarks -> backend -> sportsapp; its parent must be importable
+PROJECT_ROOT = Path(__file__).resolve().parents[2].parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Any well-formed JWT is accepted by the client; the stub ignores it
+STUB_KEY = "eyJhbGciOiJIUzI1NiJ9.e30.c3R1Yg"
+
+
+def serve_stub(latency: float, rows: int, ports):
+    body = json.dumps([
+        {"id": i, "sport": "NBA", "name": f"Team {i}", "short_name": f"T{i}", "market": "West"}
+        for i in range(rows)
+    ]).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256
+
+    server = Server(("127.0.0.1", 0), Handler)
+    ports.put(server.server_port)
+    server.serve_forever()
+
+
+def start_stub(latency: float, rows: int) -> Tuple[multiprocessing.Process, int]:
+    """Run the stub in its own process so it does not compete with the app for the GIL."""
+    ports = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_stub, args=(latency, rows, ports), daemon=True)
+    process.start()
+    return process, ports.get(timeout=10)
+
+
+async def load(app, path: str, total: int, concurrency: int) -> float:
+    """Requests per second for `total` GETs of `path`, `concurrency` at a time."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm up connections
+        remaining = iter(range(total))
+
+        async def user():
+            for _ in remaining:
+                res = await client.get(path)
+                res.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--rows", type=int, default=30)
+    args = parser.parse_args()
+
+    stub, port = start_stub(args.latency_ms / 1000, args.rows)
+    stub_url = f"http://127.0.0.1:{port}"
+    os.environ.update(SUPABASE_URL=stub_url, SUPABASE_ANON_KEY=STUB_KEY, SUPABASE_SERVICE_ROLE_KEY=STUB_KEY)
+
+    from fastapi import FastAPI
+    from sportsapp.backend.app.db.connection import supabase_anon
+    from sportsapp.backend.app.db.repository import repository
+    from sportsapp.backend.app.main import app
+
+    # Per-request INFO logs would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+
+    legacy = FastAPI()
+
+    @legacy.get("/teams/")
+    async def list_teams_blocking(limit: int = 50):
+        res = supabase_anon.table("teams").select("id, sport, name, short_name, market").limit(limit).execute()
+        return res.data
+
+    async def run():
+        before = await load(legacy, "/teams/", args.requests, args.concurrency)
+        after = await load(app, "/teams/", args.requests, args.concurrency)
+        await repository.close()
+        return before, after
+
+    before, after = asyncio.run(run())
+    stub.terminate()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, "
+          f"{args.latency_ms:g} ms upstream latency")
+    print(f"  before (blocking client):  {before:8.1f} req/s")
+    print(f"  after  (async repository): {after:8.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
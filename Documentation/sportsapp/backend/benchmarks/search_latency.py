@@ -0,0 +1,80 @@
+"""
+Latency benchmark for ``/search`` ranking (db/search.py).
+
+Builds a search index over a synthetic catalog and replays every prefix of
+randomly chosen player names, the way a search box sends one query per
+keystroke, then reports the p50/p99 time spent in ``SearchIndex.search``.
+
+Usage:
+    python sportsapp/backend/benchmarks/search_latency.py [--players 8000] [--teams 150] [--sample 300]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# benchmarks -> backend -> sportsapp; its parent must be importable
+PROJECT_ROOT = Path(__file__).resolve().parents[2].parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sportsapp.backend.app.db.search import SearchIndex
+
+FIRST_NAMES = ["James", "Michael", "Chris", "Jon", "Anthony", "Kevin", "Stephen", "Jayson", "Luka", "Nikola",
+               "Giannis", "Tom", "Patrick", "Aaron", "Josh", "Connor", "Sidney", "Mike", "Shohei", "Jalen"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Garcia", "Rodriguez", "Wilson",
+              "Martinez", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White"]
+SPORTS = ["NBA", "NFL", "MLB", "NHL", "UFC"]
+
+
+def catalog(players: int, teams: int):
+    rng = random.Random(1)
+    team_records = [
+        SimpleNamespace(id=i, sport=rng.choice(SPORTS), name=f"City{i} Team{i}", short_name=f"C{i}")
+        for i in range(1, teams + 1)
+    ]
+    player_records = [
+        SimpleNamespace(
+            id=i, sport=rng.choice(SPORTS), status="Active", team_id=rng.randint(1, teams), nickname=None,
+            first_name=rng.choice(FIRST_NAMES) + rng.choice(["", "a", "o", "ie"]),
+            last_name=rng.choice(LAST_NAMES) + rng.choice(["", "son", "er", "ez", "ski"]) + rng.choice(string.ascii_lowercase),
+        )
+        for i in range(1, players + 1)
+    ]
+    return team_records, player_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--players", type=int, default=8000)
+    parser.add_argument("--teams", type=int, default=150)
+    parser.add_argument("--sample", type=int, default=300, help="Names whose every prefix is queried")
+    args = parser.parse_args()
+
+    teams, players = catalog(args.players, args.teams)
+    start = time.perf_counter()
+    index = SearchIndex.from_records(teams, players)
+    build = time.perf_counter() - start
+
+    queries = []
+    for player in random.Random(2).sample(players, args.sample):
+        full = f"{player.first_name} {player.last_name}".lower()
+        queries.extend(full[:k] for k in range(1, len(full) + 1))
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    print(f"{args.players} players, {args.teams} teams; index built in {build * 1000:.0f} ms")
+    print(f"{len(queries)} keystroke queries: p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Shared setup for the backend tests.
+
+Run from the repository root with ``python -m pytest Documentation/sportsapp/backend/tests``.
+"""
+import os
+import sys
+from pathlib import Path
+
+# tests -> backend -> sportsapp; its parent must be importable
+PROJECT_ROOT = Path(__file__).resolve().parents[2].parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# db/connection.py builds its clients at import time; the tests never call them
+for name, value in (("SUPABASE_URL", "https://test.supabase.co"), ("SUPABASE_ANON_KEY", "test"),
+                    ("SUPABASE_SERVICE_ROLE_KEY", "test")):
+    os.environ.setdefault(name, value)
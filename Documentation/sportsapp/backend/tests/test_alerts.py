@@ -0,0 +1,76 @@
+from sportsapp.backend.app.jobs.alerts import AlertEngine, Change, SubscriptionIndex
+
+
+def subscription(id, kind="game_start", entity_type="team", entity_id=14, active=True, **extra):
+    return {"id": id, "user_id": "u1", "kind": kind, "entity_type": entity_type, "entity_id": entity_id,
+            "active": active, **extra}
+
+
+def line_move(point=-3.5, price=-110, previous_point=None, previous_price=None, book="fanduel", market="spreads",
+              recorded_at="t1"):
+    data = {"event_ref": "e1", "market": market, "book": book, "outcome": "BOS", "point": point, "price": price,
+            "previous_point": previous_point, "previous_price": previous_price, "recorded_at": recorded_at}
+    return Change("line_move", "event", "e1", f"line_move:e1:{market}:{book}:BOS:{recorded_at}", data)
+
+
+def test_index_matches_only_its_own_key():
+    index = SubscriptionIndex()
+    index.put(subscription(1))
+    index.put(subscription(2, entity_id="14"))
+    index.put(subscription(3, entity_id=15))
+    index.put(subscription(4, kind="game_final"))
+
+    matched = index.match(Change("game_start", "team", 14, "game_start:e1", {}))
+    assert sorted(s.id for s in matched) == [1, 2]
+    assert list(index.match(Change("game_start", "team", 99, "game_start:e2", {}))) == []
+
+
+def test_index_replaces_and_removes():
+    index = SubscriptionIndex()
+    index.put(subscription(1))
+    index.put(subscription(1, entity_id=15))
+    assert list(index.match(Change("game_start", "team", 14, "k", {}))) == []
+    assert [s.id for s in index.match(Change("game_start", "team", 15, "k", {}))] == [1]
+
+    # Deactivated, unknown kind or a kind/entity mismatch: dropped from the index
+    index.put(subscription(1, active=False))
+    index.put(subscription(2, kind="nonsense"))
+    index.put(subscription(3, kind="player_status", entity_type="team"))
+    assert len(index) == 0 and index.by_key == {}
+    index.remove(42)
+
+
+def engine_with(*rows):
+    engine = AlertEngine()
+    engine.load(rows)
+    return engine
+
+
+def test_line_move_alerts_from_the_last_alerted_number():
+    engine = engine_with(subscription(1, kind="line_move", entity_type="event", entity_id="e1", threshold=1.0))
+    assert engine.evaluate([line_move(point=-4.0, previous_point=-3.5)]) == []
+    # Drifts add up against the baseline, not the previous tick
+    (delivery,) = engine.evaluate([line_move(point=-4.5, previous_point=-4.0, recorded_at="t2")])
+    assert (delivery["subscription_id"], delivery["payload"]["point"]) == (1, -4.5)
+    assert engine.evaluate([line_move(point=-5.0, previous_point=-4.5, recorded_at="t3")]) == []
+    assert len(engine.evaluate([line_move(point=-3.5, previous_point=-5.0, recorded_at="t4")])) == 1
+
+
+def test_line_move_filters_on_market_and_book_and_uses_price_for_moneylines():
+    engine = engine_with(
+        subscription(1, kind="line_move", entity_type="event", entity_id="e1", threshold=2.0, book="draftkings"),
+        subscription(2, kind="line_move", entity_type="event", entity_id="e1", threshold=15, market="h2h"))
+    assert engine.evaluate([line_move(point=-7.5, previous_point=-3.5)]) == []
+    at_book = line_move(point=-7.5, previous_point=-3.5, book="draftkings")
+    assert [d["subscription_id"] for d in engine.evaluate([at_book])] == [1]
+    moneyline = line_move(point=None, price=-140, previous_price=-120, market="h2h", recorded_at="t2")
+    assert [d["subscription_id"] for d in engine.evaluate([moneyline])] == [2]
+
+
+def test_repeated_change_is_delivered_once():
+    engine = engine_with(subscription(1), subscription(2, entity_type="event", entity_id="e1"))
+    changes = [Change("game_start", "team", 14, "game_start:e1", {}),
+               Change("game_start", "event", "e1", "game_start:e1", {})]
+    assert sorted(d["subscription_id"] for d in engine.evaluate(changes + changes)) == [1, 2]
+    engine.sent[(1, "game_start:e1")] = None
+    assert [d["subscription_id"] for d in engine.evaluate(changes)] == [2]
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+from sportsapp.backend.app.db.odds import downsample
+from sportsapp.backend.app.jobs.odds import LineBook
+
+
+def quote(ref="e1", book="fanduel", outcome="BOS", price=-110, point=-3.5, start="2026-01-10T00:00:00Z"):
+    return {"event_ref": ref, "market": "spreads", "book": book, "outcome": outcome, "price": price, "point": point,
+            "commence_time": start}
+
+
+def test_only_new_and_moved_lines_are_written():
+    book = LineBook()
+    new, moved, unchanged = book.moved([quote(), quote(outcome="NYK", point=3.5)])
+    assert (len(new), moved, unchanged) == (2, [], 0)
+    book.record(new)
+
+    polled = [quote(), quote(outcome="NYK", point=4.0), quote(price=-105)]
+    new, moved, unchanged = book.moved(polled)
+    # The same line twice in one poll: compared with the last write, not with each other
+    assert (new, moved, unchanged) == ([], polled[1:], 1)
+
+
+def test_unrecorded_lines_stay_new_until_written():
+    book = LineBook()
+    book.moved([quote()])
+    assert len(book.moved([quote()])[0]) == 1
+
+
+def test_prune_forgets_events_that_started_long_ago():
+    book = LineBook()
+    book.record([quote(ref="old", start="2026-01-08T12:00:00Z"), quote(ref="today", start="2026-01-10T00:00:00Z"),
+                 quote(ref="unknown", start=None)])
+    assert book.prune(datetime(2026, 1, 10, 6, tzinfo=timezone.utc)) == {"old"}
+    assert {key[0] for key in book.lines} == {"today", "unknown"}
+    assert len(book.moved([quote(ref="old")])[0]) == 1
+    assert book.prune(datetime(2026, 1, 10, 6, tzinfo=timezone.utc)) == set()
+
+
+def history(recorded_at, price, point=-3.5, book="fanduel", id=None):
+    return {"id": id, "book": book, "outcome": "BOS", "price": price, "point": point, "recorded_at": recorded_at}
+
+
+def test_downsample_buckets_open_high_low_close():
+    rows = [history("2026-01-10T00:05:00+00:00", -105, -4.0), history("2026-01-10T00:00:10+00:00", -110),
+            history("2026-01-10T00:02:00+00:00", -120), history("2026-01-10T02:30:00+00:00", -115, -4.5),
+            history(None, -200)]
+    (series,) = downsample(rows, 3600)
+    assert (series["book"], series["outcome"]) == ("fanduel", "BOS")
+    first, second = series["points"]
+    assert first == {"t": "2026-01-10T00:00:00+00:00", "open": -110, "high": -105, "low": -120, "close": -105,
+                     "point": -4.0, "changes": 3}
+    # History only holds changes: the quiet 01:00 bucket is not emitted
+    assert (second["t"], second["open"], second["changes"]) == ("2026-01-10T02:00:00+00:00", -115, 1)
+
+
+def test_downsample_keeps_books_apart_and_tolerates_missing_prices():
+    rows = [history("2026-01-10T00:00:00+00:00", None, book="b"), history("2026-01-10T00:01:00+00:00", -110, book="b"),
+            history("2026-01-10T00:00:00+00:00", -110, book="a")]
+    a, b = downsample(rows, 300)
+    assert (a["book"], b["book"]) == ("a", "b")
+    assert b["points"][0]["high"] == b["points"][0]["low"] == b["points"][0]["close"] == -110
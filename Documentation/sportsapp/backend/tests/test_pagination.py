@@ -0,0 +1,32 @@
+import pytest
+
+from sportsapp.backend.app.db.pagination import decode_cursor, encode_cursor, paginate
+
+EVENT_KEYS = ("start_time", "id")
+
+
+def test_cursor_round_trips_and_is_url_safe():
+    values = {"start_time": "2026-01-02T19:30:00+00:00", "id": 4711}
+    cursor = encode_cursor(values)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor, EVENT_KEYS) == values
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", encode_cursor({"id": 1}), encode_cursor([1, 2]), "e30"])
+def test_malformed_or_foreign_cursor_is_rejected(cursor):
+    # "e30" is {} in base64; a teams cursor ({"id": ...}) is not an events cursor
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, EVENT_KEYS)
+
+
+def test_extra_row_means_next_page_from_the_last_row_returned():
+    rows = [{"id": i, "start_time": f"2026-01-0{i}", "name": f"e{i}"} for i in range(1, 5)]
+    page, cursor = paginate(rows, 3, EVENT_KEYS, ["name"])
+    # Key columns were only fetched for the cursor, so they are projected away
+    assert page == [{"name": "e1"}, {"name": "e2"}, {"name": "e3"}]
+    assert decode_cursor(cursor, EVENT_KEYS) == {"start_time": "2026-01-03", "id": 3}
+
+
+def test_last_page_has_no_cursor():
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    assert paginate(rows, 2, ("id",), ["id", "name"]) == (rows, None)
@@ -0,0 +1,63 @@
+import random
+from types import SimpleNamespace
+
+from sportsapp.backend.app.db.search import SearchIndex, normalize, prefix_distance
+
+
+def reference_prefix_distance(query, term):
+    """Plain dynamic-programming edit distance to the closest prefix of `term`"""
+    row = list(range(len(query) + 1))
+    best = row[-1]
+    for j, ch in enumerate(term, 1):
+        previous, row = row, [j]
+        for i, q in enumerate(query, 1):
+            row.append(min(previous[i] + 1, row[i - 1] + 1, previous[i - 1] + (q != ch)))
+        best = min(best, row[-1])
+    return best
+
+
+def test_prefix_distance_cases():
+    assert prefix_distance("lebron", "lebron") == 0
+    assert prefix_distance("leb", "lebron") == 0
+    assert prefix_distance("lebrn", "lebron") == 1
+    assert prefix_distance("lbron", "lebron") == 1
+    assert prefix_distance("jmaes", "james") == 2
+    assert prefix_distance("abc", "") == 3
+    assert prefix_distance("", "anything") == 0
+
+
+def test_prefix_distance_matches_dynamic_programming():
+    rng = random.Random(3)
+    for _ in range(2000):
+        query = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 12)))
+        term = "".join(rng.choice("abcde") for _ in range(rng.randint(0, 14)))
+        assert prefix_distance(query, term) == reference_prefix_distance(query, term), (query, term)
+
+
+def index():
+    teams = [SimpleNamespace(id=1, sport="NBA", name="Los Angeles Lakers", short_name="LAL"),
+             SimpleNamespace(id=2, sport="NBA", name="Boston Celtics", short_name="BOS")]
+    players = [
+        SimpleNamespace(id=10, sport="NBA", first_name="LeBron", last_name="James", team_id=1, status="Active"),
+        SimpleNamespace(id=11, sport="NBA", first_name="Bronny", last_name="James", team_id=1, status="Active"),
+        SimpleNamespace(id=12, sport="NBA", first_name="Jaylen", last_name="Brown", team_id=2, status="Active"),
+        SimpleNamespace(id=13, sport="NFL", first_name="Le'Veon", last_name="Bell", team_id=None, status="Retired"),
+    ]
+    return SearchIndex.from_records(teams, players)
+
+
+def test_typos_prefixes_and_word_order_find_the_same_player():
+    search = index()
+    for query in ("lebron james", "james lebron", "lebron ja", "lebrn", "LeBron"):
+        results = search.search(query)
+        assert results[0]["id"] == 10, query
+    assert search.search("lebron")[0]["team"] == "Los Angeles Lakers"
+
+
+def test_filters_and_unrelated_queries():
+    search = index()
+    assert [r["id"] for r in search.search("celt")] == [2]
+    assert all(r["type"] == "team" for r in search.search("los", kind="team"))
+    assert search.search("bell", sport="NBA") == []
+    assert search.search("zzzzqx") == []
+    assert normalize("Le'Veon") == "le veon"
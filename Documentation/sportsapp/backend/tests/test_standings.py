@@ -0,0 +1,71 @@
+import random
+
+from sportsapp.backend.app.jobs.standings import StandingsBook, TopN
+
+
+def game(ref, home_score, away_score, season=2026, sport="NBA", status="Final", home=1, away=2):
+    return {"ext_ref": ref, "sport": sport, "season": season, "status": status, "start_time": f"2026-01-{ref:0>2}",
+            "home_team_id": home, "away_team_id": away, "home_score": home_score, "away_score": away_score}
+
+
+def record(book, team_id, sport="NBA", season=2026):
+    team = book.teams[(sport, season)][team_id]
+    return team.wins, team.losses, team.points_for, team.points_against
+
+
+def test_score_correction_replaces_the_previous_result():
+    book = StandingsBook()
+    assert book.apply(game("1", 100, 90)) == {("NBA", 2026)}
+    assert book.apply(game("1", 100, 90)) == set()
+
+    assert book.apply(game("1", 95, 99)) == {("NBA", 2026)}
+    assert record(book, 1) == (0, 1, 95, 99)
+    assert record(book, 2) == (1, 0, 99, 95)
+    assert book.leaderboard("NBA", 2026, "wins")[0]["team_id"] == 2
+
+
+def test_event_leaving_completed_status_is_removed():
+    book = StandingsBook()
+    book.apply(game("1", 100, 90))
+    assert book.apply(game("1", None, None, status="Postponed")) == {("NBA", 2026)}
+    assert record(book, 1) == (0, 0, 0, 0)
+    assert book.table("NBA", 2026)[0]["wins"] == 0
+
+
+def test_season_correction_changes_both_seasons():
+    book = StandingsBook()
+    book.apply(game("1", 100, 90, season=2025))
+    book.apply(game("2", 80, 70, season=2025))
+
+    assert book.apply(game("1", 100, 90, season=2026)) == {("NBA", 2025), ("NBA", 2026)}
+    assert record(book, 1, season=2025) == (1, 0, 80, 70)
+    assert record(book, 1, season=2026) == (1, 0, 100, 90)
+    assert [row["value"] for row in book.leaderboard("NBA", 2025, "points_for")] == [80, 70]
+
+
+def test_sport_correction_changes_both_sports():
+    book = StandingsBook()
+    book.apply(game("1", 3, 2, sport="NBA"))
+    assert book.apply(game("1", 3, 2, sport="NHL")) == {("NBA", 2026), ("NHL", 2026)}
+    assert book.apply_many([game("1", 3, 2, sport="NHL"), game("2", 1, 4, sport="NHL")]) == {("NHL", 2026)}
+
+
+def test_top_n_matches_a_full_sort_through_corrections():
+    rng = random.Random(7)
+    board = TopN(3)
+    totals = {}
+    for _ in range(2000):
+        key = rng.randrange(12)
+        delta = rng.choice([1, 2, 5, -1, -3])
+        board.add(key, delta)
+        totals[key] = totals.get(key, 0) + delta
+        expected = sorted(totals.values(), reverse=True)[:3]
+        assert [value for _, value in board.top()] == expected
+
+
+def test_top_n_promotes_an_outsider_when_a_leader_drops():
+    board = TopN(2)
+    for key, value in (("a", 10), ("b", 8), ("c", 6)):
+        board.add(key, value)
+    board.add("a", -7)
+    assert board.top() == [("b", 8), ("c", 6)]
@@ -0,0 +1,58 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sportsapp.backend.app.stats import schema
+from sportsapp.backend.app.stats.engine import SeasonStats
+
+# The scraper's copy of the schema, when the backend is checked out with it
+SCRIPTS_SCHEMA = Path(__file__).resolve().parents[4] / "scripts" / "sports_ref_schema.py"
+
+
+def batting():
+    return pd.DataFrame({
+        "Player": ["Traded", "Traded", "Traded", "Stayed"],
+        "Team": ["NYY", "BOS", "2TM", "SEA"],
+        "G": [50, 50, 100, 100],
+        "HR": [5, 10, 15, 30],
+        "OPS+": [90, 110, 100, 150],
+        "BA": [0.25, 0.26, 0.255, 0.3],
+    })
+
+
+def test_traded_player_uses_combined_line_wherever_listed():
+    season = SeasonStats("baseball", "batting", 2024, batting())
+    assert list(season.names) == ["Traded", "Stayed"]
+    assert season.player("Traded")["team"] == "2TM"
+    assert season.player("Traded")["stats"]["HR"] == 15
+    # Per-team lines are still there for team splits
+    assert {row["team"] for row in season.team_splits(["HR"])} == {"NYY", "BOS", "SEA"}
+
+
+def test_only_counting_stats_scale_per_game():
+    season = SeasonStats("baseball", "batting", 2024, batting())
+    assert season.player("Stayed", per="game")["stats"]["HR"] == 0.3
+    # Whole-number indexes and rates are returned as is
+    assert season.player("Stayed", per="game")["stats"]["OPS+"] == 150
+    assert season.player("Stayed", per="game")["stats"]["BA"] == 0.3
+
+
+def test_per_game_table_scales_its_counts_per_36():
+    df = pd.DataFrame({"Player": ["A"], "Team": ["BOS"], "G": [80], "MP": [24.0], "PTS": [20.0], "ORtg": [120]})
+    season = SeasonStats("basketball", "per_game", 2024, df)
+    assert season.values("PTS", per="36")[0] == 30.0
+    assert season.values("ORtg", per="36")[0] == 120
+    assert np.isnan(SeasonStats("basketball", "per_game", 2024, df.assign(MP=0.0)).values("PTS", per="36")[0])
+
+
+@pytest.mark.skipif(not SCRIPTS_SCHEMA.exists(), reason="scripts/ not checked out alongside the backend")
+def test_schema_copy_matches_the_scraper():
+    spec = importlib.util.spec_from_file_location("sports_ref_schema", SCRIPTS_SCHEMA)
+    scraper = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(scraper)
+    assert schema.COMBINED_TEAM.pattern == scraper.COMBINED_TEAM.pattern
+    assert schema.LOWER_IS_BETTER == scraper.LOWER_IS_BETTER
+    assert schema.COUNTING_STATS == scraper.COUNTING_STATS
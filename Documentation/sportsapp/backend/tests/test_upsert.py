@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+from sportsapp.backend.app.db.upsert import batched_upsert
+
+
+class FakeDB:
+    """A Supabase client whose upserts fail for any batch holding a bad row"""
+
+    def __init__(self, bad_ids=()):
+        self.bad_ids = set(bad_ids)
+        self.batches = []
+        self.rows = {}
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return Upsert(self)
+
+
+class Upsert:
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+
+    def upsert(self, rows, on_conflict, ignore_duplicates=False):
+        self.pending = rows
+        return self
+
+    def execute(self):
+        with self.db.lock:
+            self.db.batches.append(len(self.pending))
+        bad = [row["id"] for row in self.pending if row["id"] in self.db.bad_ids]
+        if bad:
+            raise ValueError(f"invalid input for id {bad[0]}")
+        with self.db.lock:
+            self.db.rows.update((row["id"], row) for row in self.pending)
+
+
+def rows(n):
+    return [{"id": i, "name": f"row {i}"} for i in range(n)]
+
+
+def test_bad_row_is_isolated_by_bisection():
+    db = FakeDB(bad_ids={5})
+    result = asyncio.run(batched_upsert(db, "players", rows(8), "id", batch_size=8))
+
+    assert result.succeeded == 7
+    assert [(row["id"], error) for row, error in result.failed] == [(5, "invalid input for id 5")]
+    assert sorted(db.rows) == [0, 1, 2, 3, 4, 6, 7]
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: log2(n) extra requests, not one per row
+    assert result.requests == len(db.batches) == 7
+
+
+def test_chunks_and_duplicate_keys():
+    db = FakeDB()
+    batch = rows(10) + [{"id": 3, "name": "corrected"}]
+    result = asyncio.run(batched_upsert(db, "players", batch, "id", batch_size=4, parallel=3))
+
+    assert (result.succeeded, result.failed, result.total) == (10, [], 10)
+    assert sorted(db.batches) == [2, 4, 4]
+    # The last row for a key wins and the batch never carries the key twice
+    assert db.rows[3]["name"] == "corrected"
+
+
+def test_bad_rows_in_several_chunks():
+    db = FakeDB(bad_ids={0, 9})
+    result = asyncio.run(batched_upsert(db, "players", rows(12), "id", batch_size=6))
+    assert sorted(row["id"] for row, _ in result.failed) == [0, 9]
+    assert result.succeeded == 10
+
+
+def test_empty_input_sends_nothing():
+    db = FakeDB()
+    assert asyncio.run(batched_upsert(db, "players", [], "id")).requests == 0
+    assert db.batches == []
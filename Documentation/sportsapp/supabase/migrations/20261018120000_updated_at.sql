@@ -0,0 +1,19 @@
+-- updated_at on the ingested reference tables.
+--
+-- The ingest worker stamps updated_at on every row it upserts
+-- (jobs/engine.py TableSink), and the API's in-memory snapshot and the
+-- incremental scans read only rows whose updated_at moved
+-- (db/repository.py Repository.scan, db/scan.py scan_rows).
+-- Existing rows get now(), so the first incremental read after this
+-- migration re-reads them once.
+--
+-- Apply with the Supabase CLI (supabase db push) or paste into the SQL editor.
+
+alter table teams add column if not exists updated_at timestamptz not null default now();
+alter table players add column if not exists updated_at timestamptz not null default now();
+alter table events add column if not exists updated_at timestamptz not null default now();
+
+-- Incremental scans filter on updated_at and page by id (the primary key)
+create index if not exists teams_updated_at_idx on teams (updated_at);
+create index if not exists players_updated_at_idx on players (updated_at);
+create index if not exists events_updated_at_idx on events (updated_at);
@@ -0,0 +1,67 @@
+-- Game feed columns on events, and the standings it drives.
+--
+-- jobs/events.py upserts SportsDataIO games into events on ext_ref
+-- ("NBA_<GameID>") with their scores; jobs/standings.py folds completed
+-- games into standings and leaderboards, upserted on their primary keys
+-- and read by /standings through the anon key.
+--
+-- Apply with the Supabase CLI (supabase db push) or paste into the SQL editor.
+
+alter table events add column if not exists ext_ref text;
+alter table events add column if not exists home_score integer;
+alter table events add column if not exists away_score integer;
+
+-- The ingest upsert's conflict target; rows entered by hand may leave it null
+do $$
+begin
+    if not exists (select 1 from pg_constraint where conname = 'events_ext_ref_key') then
+        alter table events add constraint events_ext_ref_key unique (ext_ref);
+    end if;
+end $$;
+
+-- Standings rebuild: every completed game
+create index if not exists events_status_idx on events (status);
+
+create table if not exists standings (
+    sport text not null,
+    season integer not null,
+    team_id bigint not null references teams (id) on delete cascade,
+    rank integer not null,
+    wins integer not null default 0,
+    losses integer not null default 0,
+    ties integer not null default 0,
+    win_pct numeric,
+    games_back numeric,
+    points_for integer not null default 0,
+    points_against integer not null default 0,
+    point_diff integer not null default 0,
+    home_record text,
+    away_record text,
+    streak text,
+    last10 text,
+    updated_at timestamptz not null default now(),
+    primary key (sport, season, team_id)
+);
+
+-- /standings/{sport}/{season} reads in rank order
+create index if not exists standings_rank_idx on standings (sport, season, rank);
+
+create table if not exists leaderboards (
+    sport text not null,
+    season integer not null,
+    stat text not null,
+    rank integer not null,
+    team_id bigint not null references teams (id) on delete cascade,
+    value numeric,
+    updated_at timestamptz not null default now(),
+    primary key (sport, season, stat, rank)
+);
+
+-- Public reads; only the service role (ingest worker) writes
+alter table standings enable row level security;
+alter table leaderboards enable row level security;
+
+drop policy if exists "standings are public" on standings;
+create policy "standings are public" on standings for select using (true);
+drop policy if exists "leaderboards are public" on leaderboards;
+create policy "leaderboards are public" on leaderboards for select using (true);
@@ -0,0 +1,55 @@
+-- Betting lines written by jobs/odds.py and served by /odds.
+--
+-- odds_latest holds one row per (event, market, book, outcome) and is
+-- upserted on that key; the API mirrors it in memory by updated_at
+-- (db/odds.py). odds_history appends every change; its key includes
+-- recorded_at so a retried batch does not duplicate rows.
+--
+-- Apply with the Supabase CLI (supabase db push) or paste into the SQL editor.
+
+create table if not exists odds_latest (
+    id bigint generated always as identity primary key,
+    event_ref text not null,
+    sport text,
+    home_team text,
+    away_team text,
+    commence_time timestamptz,
+    market text not null,
+    book text not null,
+    outcome text not null,
+    price numeric,
+    point numeric,
+    recorded_at timestamptz,
+    updated_at timestamptz not null default now(),
+    -- LATEST_CONFLICT; also serves the per-event reads and deletes
+    constraint odds_latest_line_key unique (event_ref, market, book, outcome)
+);
+
+-- The board's incremental refresh
+create index if not exists odds_latest_updated_at_idx on odds_latest (updated_at);
+create index if not exists odds_latest_sport_idx on odds_latest (sport);
+
+create table if not exists odds_history (
+    id bigint generated always as identity primary key,
+    event_ref text not null,
+    market text not null,
+    book text not null,
+    outcome text not null,
+    price numeric,
+    point numeric,
+    recorded_at timestamptz not null,
+    -- HISTORY_CONFLICT
+    constraint odds_history_change_key unique (event_ref, market, book, outcome, recorded_at)
+);
+
+-- /odds/{event_ref}/history: one event market, optionally since a time
+create index if not exists odds_history_event_market_idx on odds_history (event_ref, market, recorded_at);
+
+-- Public reads; only the service role (ingest worker) writes
+alter table odds_latest enable row level security;
+alter table odds_history enable row level security;
+
+drop policy if exists "odds are public" on odds_latest;
+create policy "odds are public" on odds_latest for select using (true);
+drop policy if exists "odds history is public" on odds_history;
+create policy "odds history is public" on odds_history for select using (true);
@@ -0,0 +1,75 @@
+-- Per-user alerts: subscriptions managed through /alerts and the deliveries
+-- the ingest worker writes when one fires (jobs/alerts.py).
+--
+-- The API reads and writes subscriptions as the signed-in user
+-- (Repository.as_user), so row level security limits each user to their
+-- own rows. Subscriptions are switched off (active = false) rather than
+-- deleted, and the worker pulls changes by updated_at, so every update
+-- bumps it. Deliveries are unique on (subscription_id, dedupe_key): the
+-- worker's insert-only upsert drops a change it already delivered.
+--
+-- Apply with the Supabase CLI (supabase db push) or paste into the SQL editor.
+
+create table if not exists alert_subscriptions (
+    id bigint generated always as identity primary key,
+    user_id uuid not null default auth.uid() references auth.users (id) on delete cascade,
+    kind text not null check (kind in ('game_start', 'game_final', 'player_status', 'line_move')),
+    entity_type text not null check (entity_type in ('event', 'team', 'player')),
+    entity_id text not null,
+    threshold numeric check (threshold > 0),
+    market text check (market in ('h2h', 'spreads', 'totals')),
+    book text,
+    active boolean not null default true,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);
+
+-- The worker's incremental refresh; the API's per-user listing
+create index if not exists alert_subscriptions_updated_at_idx on alert_subscriptions (updated_at);
+create index if not exists alert_subscriptions_user_idx on alert_subscriptions (user_id, id);
+
+create or replace function alert_subscriptions_touch() returns trigger
+language plpgsql as $$
+begin
+    new.updated_at := now();
+    return new;
+end $$;
+
+drop trigger if exists alert_subscriptions_touch on alert_subscriptions;
+create trigger alert_subscriptions_touch before update on alert_subscriptions
+    for each row execute function alert_subscriptions_touch();
+
+create table if not exists alert_deliveries (
+    id bigint generated always as identity primary key,
+    subscription_id bigint not null references alert_subscriptions (id) on delete cascade,
+    user_id uuid not null references auth.users (id) on delete cascade,
+    dedupe_key text not null,
+    kind text not null,
+    entity_type text not null,
+    entity_id text not null,
+    payload jsonb,
+    created_at timestamptz not null default now(),
+    -- DELIVERY_CONFLICT
+    constraint alert_deliveries_dedupe_key unique (subscription_id, dedupe_key)
+);
+
+-- /alerts/deliveries: newest first, paged by id
+create index if not exists alert_deliveries_user_idx on alert_deliveries (user_id, id desc);
+
+alter table alert_subscriptions enable row level security;
+alter table alert_deliveries enable row level security;
+
+drop policy if exists "own subscriptions are readable" on alert_subscriptions;
+create policy "own subscriptions are readable" on alert_subscriptions
+    for select to authenticated using (user_id = auth.uid());
+drop policy if exists "own subscriptions can be created" on alert_subscriptions;
+create policy "own subscriptions can be created" on alert_subscriptions
+    for insert to authenticated with check (user_id = auth.uid());
+drop policy if exists "own subscriptions can be switched off" on alert_subscriptions;
+create policy "own subscriptions can be switched off" on alert_subscriptions
+    for update to authenticated using (user_id = auth.uid()) with check (user_id = auth.uid());
+
+-- Deliveries are written by the service role only
+drop policy if exists "own deliveries are readable" on alert_deliveries;
+create policy "own deliveries are readable" on alert_deliveries
+    for select to authenticated using (user_id = auth.uid());
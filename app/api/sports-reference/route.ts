@@ -10,7 +10,7 @@
  */
 
 import { NextRequest, NextResponse } from 'next/server';
-import { spawn } from 'child_process';
+import { spawn, type ChildProcess } from 'child_process';
 import path from 'path';
 
 // Type declarations for Node.js globals (workaround for missing @types/node)
@@ -28,9 +28,205 @@ declare const Buffer: {
 // Ensure this route uses Node.js runtime (required for child_process)
 export const runtime = 'nodejs';
 
+// Warm scraper pool sizing (each worker is one `scrape_sports_refs.py --serve` process)
+const MAX_WORKERS = Number(process.env.SCRAPER_WORKERS) || 2;
+const MAX_QUEUE = Number(process.env.SCRAPER_MAX_QUEUE) || 32;
+// Sports Reference allows ~20 requests a minute in total; each worker has its own
+// rate limiter, so the budget is split evenly across the pool
+const RATE_PER_MINUTE = Number(process.env.SCRAPER_RATE_PER_MINUTE) || 20;
+const WORKER_RATE = RATE_PER_MINUTE / 60 / MAX_WORKERS;
+const REQUEST_TIMEOUT_MS = 30000;
+
+interface ScrapeRequest {
+  sport: string;
+  year: number;
+  statType: string;
+  qwenFormat: boolean;
+  tokenBudget?: number;
+  rankBy?: string;
+  players?: string[];
+}
+
+interface ScrapeJob {
+  id: number;
+  request: ScrapeRequest;
+  resolve: (data: string) => void;
+  reject: (error: Error) => void;
+}
+
+interface ScrapeResponse {
+  id: number | null;
+  ok: boolean;
+  data?: string;
+  error?: string;
+}
+
+interface ScraperWorker {
+  child: ChildProcess;
+  buffer: string;
+  stderr: string;
+  job: ScrapeJob | null;
+  timer: ReturnType<typeof setTimeout> | null;
+}
+
+class QueueFullError extends Error {}
+
+/**
+ * Bounded pool of long-lived Python scraper processes.
+ *
+ * Workers speak JSON lines on stdin/stdout and handle one request at a time,
+ * so interpreter start-up, pandas/bs4 imports and the HTTP session are paid
+ * once per worker instead of once per request. Requests beyond the worker
+ * count wait in a FIFO queue; beyond MAX_QUEUE they are rejected.
+ */
+class ScraperPool {
+  private workers: ScraperWorker[] = [];
+  private queue: ScrapeJob[] = [];
+  private nextId = 1;
+
+  constructor(
+    private pythonCmd: string,
+    private scriptPath: string,
+    private maxWorkers: number,
+    private maxQueue: number
+  ) {}
+
+  run(request: ScrapeRequest): Promise<string> {
+    return new Promise((resolve, reject) => {
+      const job: ScrapeJob = { id: this.nextId++, request, resolve, reject };
+      const idle = this.workers.find((worker) => !worker.job);
+      if (idle) {
+        this.dispatch(idle, job);
+      } else if (this.workers.length < this.maxWorkers) {
+        this.dispatch(this.spawnWorker(), job);
+      } else if (this.queue.length < this.maxQueue) {
+        this.queue.push(job);
+      } else {
+        reject(new QueueFullError('Scraper queue is full'));
+      }
+    });
+  }
+
+  private spawnWorker(): ScraperWorker {
+    const child = spawn(this.pythonCmd, [this.scriptPath, '--serve', '--rate', String(WORKER_RATE)], {
+      cwd: process.cwd(),
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+    const worker: ScraperWorker = { child, buffer: '', stderr: '', job: null, timer: null };
+
+    child.stdout?.on('data', (data: string | { toString(): string }) => {
+      worker.buffer += data.toString();
+      let newline = worker.buffer.indexOf('\n');
+      while (newline >= 0) {
+        const line = worker.buffer.slice(0, newline).trim();
+        worker.buffer = worker.buffer.slice(newline + 1);
+        if (line) {
+          this.handleLine(worker, line);
+        }
+        newline = worker.buffer.indexOf('\n');
+      }
+    });
+
+    child.stderr?.on('data', (data: string | { toString(): string }) => {
+      // Keep only the tail; it is surfaced if the worker dies mid-request
+      worker.stderr = (worker.stderr + data.toString()).slice(-4000);
+    });
+
+    child.on('exit', (code: number | null) => {
+      this.removeWorker(worker, new Error(`Python script failed with code ${code}: ${worker.stderr}`));
+    });
+
+    child.on('error', (error: Error) => {
+      this.removeWorker(worker, error);
+    });
+
+    this.workers.push(worker);
+    return worker;
+  }
+
+  private dispatch(worker: ScraperWorker, job: ScrapeJob) {
+    worker.job = job;
+    worker.stderr = '';
+    worker.timer = setTimeout(() => {
+      // A stuck worker cannot be trusted with the next request; replace it
+      this.removeWorker(worker, new Error('Python script timeout'));
+      worker.child.kill();
+    }, REQUEST_TIMEOUT_MS);
+    worker.child.stdin?.write(`${JSON.stringify({ id: job.id, ...job.request })}\n`);
+  }
+
+  private handleLine(worker: ScraperWorker, line: string) {
+    let response: ScrapeResponse;
+    try {
+      response = JSON.parse(line);
+    } catch {
+      console.error('Ignoring malformed scraper output:', line);
+      return;
+    }
+
+    const job = worker.job;
+    if (!job || response.id !== job.id) {
+      return;
+    }
+
+    this.settle(worker);
+    if (response.ok) {
+      job.resolve(response.data ?? '');
+    } else {
+      job.reject(new Error(response.error || 'Scraper request failed'));
+    }
+    this.next(worker);
+  }
+
+  private settle(worker: ScraperWorker) {
+    if (worker.timer) {
+      clearTimeout(worker.timer);
+      worker.timer = null;
+    }
+    worker.job = null;
+  }
+
+  private next(worker: ScraperWorker) {
+    const job = this.queue.shift();
+    if (job) {
+      this.dispatch(worker, job);
+    }
+  }
+
+  private removeWorker(worker: ScraperWorker, error: Error) {
+    const index = this.workers.indexOf(worker);
+    if (index < 0) {
+      return;
+    }
+    this.workers.splice(index, 1);
+
+    const job = worker.job;
+    this.settle(worker);
+    job?.reject(error);
+
+    // Hand queued work to a replacement so it is not stranded
+    const queued = this.queue.shift();
+    if (queued) {
+      this.dispatch(this.spawnWorker(), queued);
+    }
+  }
+}
+
+// Reuse one pool across requests (and across hot reloads in development)
+const globalForScraper = globalThis as unknown as { scraperPool?: ScraperPool };
+
+function getScraperPool(): ScraperPool {
+  if (!globalForScraper.scraperPool) {
+    const scriptPath = path.join(process.cwd(), 'scripts', 'scrape_sports_refs.py');
+    const pythonCmd = process.platform === 'win32' ? 'python' : 'python3';
+    globalForScraper.scraperPool = new ScraperPool(pythonCmd, scriptPath, MAX_WORKERS, MAX_QUEUE);
+  }
+  return globalForScraper.scraperPool;
+}
+
 export async function POST(request: NextRequest) {
   try {
-    const { sport, year, statType } = await request.json();
+    const { sport, year, statType, tokenBudget, rankBy, players } = await request.json();
 
     if (!sport || !year || !statType) {
       return NextResponse.json(
@@ -54,11 +250,16 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // Call the Python scraper
-    const scriptPath = path.join(process.cwd(), 'scripts', 'scrape_sports_refs.py');
-    const pythonCmd = process.platform === 'win32' ? 'python' : 'python3';
-
-    const data = await runPythonScript(pythonCmd, scriptPath, sport, year.toString(), statType);
+    // Hand the request to a warm Python scraper worker
+    const data = await getScraperPool().run({
+      sport,
+      year,
+      statType,
+      qwenFormat: true,
+      tokenBudget: typeof tokenBudget === 'number' ? tokenBudget : undefined,
+      rankBy: typeof rankBy === 'string' ? rankBy : undefined,
+      players: Array.isArray(players) ? players.filter((p: unknown) => typeof p === 'string') : undefined
+    });
 
     return NextResponse.json({
       sport,
@@ -70,6 +271,12 @@ export async function POST(request: NextRequest) {
 
   } catch (error) {
     console.error('Sports reference API error:', error);
+    if (error instanceof QueueFullError) {
+      return NextResponse.json(
+        { error: 'Sports reference scraper is busy, try again shortly' },
+        { status: 503 }
+      );
+    }
     return NextResponse.json(
       { error: 'Failed to fetch sports reference data' },
       { status: 500 }
@@ -77,59 +284,13 @@ export async function POST(request: NextRequest) {
   }
 }
 
-function runPythonScript(pythonCmd: string, scriptPath: string, sport: string, year: string, statType: string): Promise<string> {
-  return new Promise((resolve, reject) => {
-    const args = [
-      scriptPath,
-      '--sport', sport,
-      '--year', year,
-      '--stat-type', statType,
-      '--qwen-format'
-    ];
-
-    const python = spawn(pythonCmd, args, {
-      cwd: process.cwd(),
-      stdio: ['pipe', 'pipe', 'pipe']
-    });
-
-    let stdout = '';
-    let stderr = '';
-
-    python.stdout.on('data', (data: string | { toString(): string }) => {
-      stdout += data.toString();
-    });
-
-    python.stderr.on('data', (data: string | { toString(): string }) => {
-      stderr += data.toString();
-    });
-
-    python.on('close', (code: number | null) => {
-      if (code !== 0) {
-        reject(new Error(`Python script failed with code ${code}: ${stderr}`));
-      } else {
-        resolve(stdout);
-      }
-    });
-
-    python.on('error', (error: Error) => {
-      reject(error);
-    });
-
-    // Set timeout (30 seconds)
-    setTimeout(() => {
-      python.kill();
-      reject(new Error('Python script timeout'));
-    }, 30000);
-  });
-}
-
 // GET endpoint for testing
 export async function GET() {
   return NextResponse.json({
     message: 'Sports Reference API',
     endpoints: [
       'POST /api/sports-reference',
-      'Body: { sport: "baseball"|"basketball", year: number, statType: string }'
+      'Body: { sport: "baseball"|"basketball", year: number, statType: string, tokenBudget?: number, rankBy?: string, players?: string[] }'
     ],
     examples: [
       {
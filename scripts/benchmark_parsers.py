@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+# Fanalytics - Sports Reference Parser Benchmark
+#
+# Compares the parser engines in sports_ref_parsers.py on saved pages:
+# median parse time and the peak memory the parse adds on top of the
+# already-loaded page. Each (engine, page) pair runs in a fresh process so
+# one engine's allocations cannot hide the other's peak.
+#
+# By default it runs on the fixture pages from sports_ref_fixtures.py, which
+# are generated the same on every machine, so results can be compared.
+#
+# Usage:
+# python benchmark_parsers.py            (the fixture pages)
+# python benchmark_parsers.py page1.html page2.html
+# python benchmark_parsers.py --cache    (every page in the scraper's page cache)
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import argparse
+import glob
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sports_ref_cache import DEFAULT_CACHE_DIR
+from sports_ref_fixtures import write_fixture_pages
+
+ENGINES = ['bs4', 'lxml']
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure(engine_name: str, path: str, repeat: int) -> dict:
+    """Parse one page with one engine inside the current (fresh) process"""
+    from sports_ref_parsers import BeautifulSoupEngine, LxmlEngine, extract_table
+
+    engine = LxmlEngine() if engine_name == 'lxml' else BeautifulSoupEngine()
+    with open(path, 'rb') as f:
+        content = f.read()
+    ids = ['per_game_stats', 'totals_stats', 'advanced_stats',
+           'batting_leaders_standard', 'pitching_leaders_standard', 'fielding_leaders_standard']
+
+    # Page and engine modules are loaded; anything above this is the parse itself
+    rss_before = _peak_rss_kb()
+
+    times = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = extract_table(engine, content, ids)
+        times.append(time.perf_counter() - start)
+        rows = len(table) if table is not None else 0
+
+    # Separate run for Python-heap peak; tracemalloc would skew the timings
+    tracemalloc.start()
+    extract_table(engine, content, ids)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'engine': engine_name,
+        'page': os.path.basename(path),
+        'size_kb': len(content) // 1024,
+        'rows': rows,
+        'median_ms': statistics.median(times) * 1000,
+        'py_peak_kb': py_peak // 1024,
+        'rss_growth_kb': _peak_rss_kb() - rss_before,
+    }
+
+
+def run(pages, repeat: int):
+    print(f"{'page':<28} {'engine':<6} {'KB':>6} {'rows':>6} {'median ms':>10} {'py peak KB':>11} {'RSS +KB':>8}")
+    for page in pages:
+        for engine in ENGINES:
+            result = subprocess.run(
+                [sys.executable, __file__, '--measure', engine, page, '--repeat', str(repeat)],
+                capture_output=True, text=True, check=True)
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{r['page'][:28]:<28} {r['engine']:<6} {r['size_kb']:>6} {r['rows']:>6} "
+                  f"{r['median_ms']:>10.1f} {r['py_peak_kb']:>11} {r['rss_growth_kb']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Sports Reference parser engines')
+    parser.add_argument('pages', nargs='*', help='Saved HTML pages (default: the generated fixture pages)')
+    parser.add_argument('--cache', action='store_true', help="Benchmark every page in the scraper's page cache")
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per engine and page')
+    parser.add_argument('--measure', nargs=2, metavar=('ENGINE', 'PAGE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure[0], args.measure[1], args.repeat)))
+        return
+
+    if args.pages or args.cache:
+        pages = args.pages or sorted(glob.glob(os.path.join(DEFAULT_CACHE_DIR, '*.body')))
+        if not pages:
+            print("No pages to benchmark; pass saved HTML files or scrape something first")
+            sys.exit(1)
+        run(pages, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        run(write_fixture_pages(directory), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,199 +6,240 @@
 # and formats the data for feeding into Qwen AI analysis.
 #
 # Installation:
-# pip install requests beautifulsoup4 pandas lxml pybaseball
+# pip install requests beautifulsoup4 pandas lxml pyarrow pybaseball
 #
 # Usage:
 # python scrape_sports_refs.py --sport baseball --year 2023 --stat-type batting
 # python scrape_sports_refs.py --sport basketball --year 2023 --stat-type per_game
+# python scrape_sports_refs.py --serve   (long-lived JSON-lines worker, see serve())
+# python scrape_sports_refs.py --sport basketball --years 1990-2024 --stat-types per_game,advanced \
+#     --output-dir data/sports_ref   (bulk backfill into a partitioned Parquet dataset)
+#
+# Single-season and bulk scrapes are also appended to the local history
+# store (--output-dir, --no-store to skip; --serve only with --store);
+# query it with sports_ref_store.py.
 #
 # @author Fanalytics Team
 # @created November 24, 2025
 # @license MIT
 #
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import argparse
 import json
-from typing import Dict, Any, Optional
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date
+from typing import Callable, Dict, Any, Iterator, List, Optional, Sequence, Tuple
 import sys
 import os
 
+from sports_ref_cache import HTTPCache, TableCache, DEFAULT_CACHE_DIR
+from sports_ref_context import DEFAULT_TOKEN_BUDGET, default_builder
+from sports_ref_dataset import parse_years
+from sports_ref_parsers import extract_table, extract_tables, get_engine
+from sports_ref_schema import coerce_stat_types
+from sports_ref_session import RateLimitedSession, DEFAULT_RATE
+from sports_ref_store import HistoricalStore, DEFAULT_STORE_DIR
+
+# URL patterns for different stat types
+BASEBALL_URLS = {
+    'batting': 'https://www.baseball-reference.com/leagues/majors/{year}-batting-leaders.shtml',
+    'pitching': 'https://www.baseball-reference.com/leagues/majors/{year}-pitching-leaders.shtml',
+    'fielding': 'https://www.baseball-reference.com/leagues/majors/{year}-fielding-leaders.shtml'
+}
+
+BASKETBALL_URLS = {
+    'per_game': 'https://www.basketball-reference.com/leagues/NBA_{year}_per_game.html',
+    'totals': 'https://www.basketball-reference.com/leagues/NBA_{year}_totals.html',
+    'advanced': 'https://www.basketball-reference.com/leagues/NBA_{year}_advanced.html',
+    'standings': 'https://www.basketball-reference.com/leagues/NBA_{year}_standings.html'
+}
+
+def page_url(sport: str, year: int, stat_type: str) -> str:
+    """Sports Reference URL for a (sport, year, stat_type) page"""
+    if sport == 'baseball':
+        if stat_type not in BASEBALL_URLS:
+            raise ValueError(f"Unknown stat_type: {stat_type}. Use 'batting', 'pitching', or 'fielding'")
+        return BASEBALL_URLS[stat_type].format(year=year)
+    if sport == 'basketball':
+        if stat_type not in BASKETBALL_URLS:
+            raise ValueError(f"Unknown stat_type: {stat_type}. Use 'per_game', 'totals', 'advanced', or 'standings'")
+        return BASKETBALL_URLS[stat_type].format(year=year)
+    raise ValueError(f"Unknown sport: {sport}. Use 'baseball' or 'basketball'")
+
+def season_is_final(sport: str, year: int, today: Optional[date] = None) -> bool:
+    """Whether a season is over, so its pages will not change upstream"""
+    today = today or date.today()
+    if year < today.year:
+        return True
+    # NBA seasons are named for the year they end in, and finish by July
+    return sport == 'basketball' and year == today.year and today.month >= 7
+
 class SportsReferenceScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, cache: Optional[HTTPCache] = None, table_cache: Optional[TableCache] = None,
+                 parser: str = 'lxml', rate: Optional[float] = DEFAULT_RATE, pool_size: int = 10):
+        # One pooled, per-host rate-limited session shared by every fetch thread
+        self.session = RateLimitedSession(rate=rate, pool_size=pool_size)
         # Set a reasonable user agent
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-
-    def scrape_baseball_stats(self, year: int, stat_type: str = 'batting') -> pd.DataFrame:
-        """Scrape baseball statistics from Baseball-Reference.com"""
-        try:
-            # URL patterns for different stat types
-            url_patterns = {
-                'batting': f'https://www.baseball-reference.com/leagues/majors/{year}-batting-leaders.shtml',
-                'pitching': f'https://www.baseball-reference.com/leagues/majors/{year}-pitching-leaders.shtml',
-                'fielding': f'https://www.baseball-reference.com/leagues/majors/{year}-fielding-leaders.shtml'
-            }
-
-            if stat_type not in url_patterns:
-                raise ValueError(f"Unknown stat_type: {stat_type}. Use 'batting', 'pitching', or 'fielding'")
-
-            url = url_patterns[stat_type]
-            print(f"Scraping: {url}")
-
+        self.cache = cache
+        self.table_cache = table_cache
+        self.parser = parser
+        self.engine = get_engine(parser)
+
+    def _load_page(self, url: str, sport: str, year: int,
+                   stat_type: str) -> Tuple[Optional[str], Optional[pd.DataFrame], Optional[bytes]]:
+        """Get a page ready for parsing, or its already-parsed table.
+
+        Returns (validator, table, content): `table` is set on a table-cache
+        hit, otherwise `content` holds the HTML to parse. With a table cache
+        the page is only revalidated (usually without touching the network)
+        and the HTML is never loaded on a hit.
+        """
+        if self.cache is None:
             response = self.session.get(url)
             response.raise_for_status()
+            return None, None, response.content
+
+        immutable = season_is_final(sport, year)
+        validator, content = self.cache.refresh(self.session, url, immutable=immutable)
+        if self.table_cache is not None:
+            df = self.table_cache.load(sport, year, stat_type, validator)
+            if df is not None:
+                # Lets the context builder memoize per page version
+                df.attrs['table_version'] = (sport, year, stat_type, validator)
+                # Already in the history store when it was first parsed
+                df.attrs['from_table_cache'] = True
+                return validator, df, None
+
+        if content is None:
+            content = self.cache.fetch(self.session, url, immutable=immutable)
+        return validator, None, content
+
+    def _remember_table(self, sport: str, year: int, stat_type: str, validator: Optional[str],
+                        df: pd.DataFrame):
+        if validator is None or df.empty:
+            return
+        df.attrs['table_version'] = (sport, year, stat_type, validator)
+        if self.table_cache is not None:
+            self.table_cache.store(sport, year, stat_type, validator, df)
+
+    def _scrape_page(self, url: str, sport: str, year: int, stat_type: str,
+                     parse: Callable[[bytes], pd.DataFrame]) -> pd.DataFrame:
+        """Fetch and parse one page, reusing cached pages and parsed tables"""
+        validator, df, content = self._load_page(url, sport, year, stat_type)
+        if df is not None:
+            print(f"Loaded {len(df)} {stat_type} records for {year} from table cache")
+            return df
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+        df = parse(content)
+        self._remember_table(sport, year, stat_type, validator, df)
+        return df
 
-            # Find the main stats table
-            table = soup.find('table', {'id': f'{stat_type}_leaders_standard'})
-            if not table:
-                # Fallback to any table with stats
-                table = soup.find('table', class_='stats_table')
+    def parse_page(self, sport: str, content: bytes, year: int, stat_type: str) -> pd.DataFrame:
+        """Parse an already-downloaded page for `sport`"""
+        if sport == 'baseball':
+            return self._parse_baseball_page(content, year, stat_type)
+        return self._parse_basketball_page(content, year, stat_type)
 
-            if not table:
-                raise ValueError(f"Could not find stats table for {stat_type}")
+    def scrape(self, sport: str, year: int, stat_type: str) -> pd.DataFrame:
+        """Dispatch to the sport-specific scraper"""
+        if sport == 'baseball':
+            return self.scrape_baseball_stats(year, stat_type)
+        if sport == 'basketball':
+            return self.scrape_basketball_stats(year, stat_type)
+        raise ValueError(f"Unknown sport: {sport}. Use 'baseball' or 'basketball'")
 
-            # Extract headers
-            headers = []
-            header_row = table.find('thead').find('tr')
-            for th in header_row.find_all('th'):
-                headers.append(th.get_text().strip())
+    def scrape_baseball_stats(self, year: int, stat_type: str = 'batting') -> pd.DataFrame:
+        """Scrape baseball statistics from Baseball-Reference.com"""
+        try:
+            url = page_url('baseball', year, stat_type)
+            print(f"Scraping: {url}")
 
-            # Extract data rows
-            rows = []
-            for tr in table.find('tbody').find_all('tr'):
-                if tr.get('class') and 'thead' in tr.get('class'):
-                    continue  # Skip header rows
+            return self._scrape_page(url, 'baseball', year, stat_type,
+                                     lambda content: self._parse_baseball_page(content, year, stat_type))
 
-                row_data = []
-                for td in tr.find_all('td'):
-                    row_data.append(td.get_text().strip())
+        except Exception as e:
+            print(f"Error scraping baseball stats: {e}")
+            return pd.DataFrame()
 
-                if row_data:  # Only add non-empty rows
-                    rows.append(row_data)
+    def _parse_baseball_page(self, content: bytes, year: int, stat_type: str) -> pd.DataFrame:
+        """Extract the leaders table from a Baseball-Reference page"""
+        # Find the main stats table, falling back to any table with stats
+        table = extract_table(self.engine, content, [f'{stat_type}_leaders_standard'])
 
-            # Create DataFrame
-            df = pd.DataFrame(rows, columns=headers[1:])  # Skip first empty header
-            df['Year'] = year
-            df['Stat_Type'] = stat_type
+        if table is None:
+            raise ValueError(f"Could not find stats table for {stat_type}")
 
-            print(f"Successfully scraped {len(df)} {stat_type} records for {year}")
-            return df
+        # Create DataFrame
+        df = table.to_frame()
+        df['Year'] = year
+        df['Stat_Type'] = stat_type
+        df = coerce_stat_types(df)
 
-        except Exception as e:
-            print(f"Error scraping baseball stats: {e}")
-            return pd.DataFrame()
+        print(f"Successfully scraped {len(df)} {stat_type} records for {year}")
+        return df
 
     def scrape_basketball_stats(self, year: int, stat_type: str = 'per_game') -> pd.DataFrame:
         """Scrape basketball statistics from Basketball-Reference.com"""
         try:
-            # URL patterns for different stat types
-            url_patterns = {
-                'per_game': f'https://www.basketball-reference.com/leagues/NBA_{year}_per_game.html',
-                'totals': f'https://www.basketball-reference.com/leagues/NBA_{year}_totals.html',
-                'advanced': f'https://www.basketball-reference.com/leagues/NBA_{year}_advanced.html',
-                'standings': f'https://www.basketball-reference.com/leagues/NBA_{year}_standings.html'
-            }
-
-            if stat_type not in url_patterns:
-                raise ValueError(f"Unknown stat_type: {stat_type}. Use 'per_game', 'totals', 'advanced', or 'standings'")
-
-            url = url_patterns[stat_type]
+            url = page_url('basketball', year, stat_type)
             print(f"Scraping: {url}")
 
-            response = self.session.get(url)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Handle standings differently (it's not a player stats table)
-            if stat_type == 'standings':
-                return self._scrape_basketball_standings(soup, year)
+            return self._scrape_page(url, 'basketball', year, stat_type,
+                                     lambda content: self._parse_basketball_page(content, year, stat_type))
 
-            # Find the main stats table
-            table = soup.find('table', {'id': f'per_game_stats'}) or \
-                   soup.find('table', {'id': f'totals_stats'}) or \
-                   soup.find('table', {'id': f'advanced_stats'})
-
-            if not table:
-                # Fallback to any table with stats
-                table = soup.find('table', class_='stats_table')
-
-            if not table:
-                raise ValueError(f"Could not find stats table for {stat_type}")
-
-            # Extract headers
-            headers = []
-            header_row = table.find('thead').find('tr')
-            for th in header_row.find_all('th'):
-                headers.append(th.get_text().strip())
-
-            # Extract data rows
-            rows = []
-            tbody = table.find('tbody')
-            if tbody:
-                for tr in tbody.find_all('tr'):
-                    if tr.get('class') and 'thead' in tr.get('class'):
-                        continue  # Skip header rows
+        except Exception as e:
+            print(f"Error scraping basketball stats: {e}")
+            return pd.DataFrame()
 
-                    row_data = []
-                    for td in tr.find_all('td'):
-                        row_data.append(td.get_text().strip())
+    def _parse_basketball_page(self, content: bytes, year: int, stat_type: str) -> pd.DataFrame:
+        """Extract the player stats (or standings) table from a Basketball-Reference page"""
+        # Handle standings differently (it's not a player stats table)
+        if stat_type == 'standings':
+            return self._scrape_basketball_standings(content, year)
 
-                    if row_data and len(row_data) > 1:  # Only add non-empty rows with data
-                        rows.append(row_data)
+        # Find the main stats table, falling back to any table with stats.
+        # Rows with a single cell are separators, not players.
+        table = extract_table(self.engine, content,
+                              ['per_game_stats', 'totals_stats', 'advanced_stats'], min_cells=2)
 
-            # Create DataFrame
-            if rows:
-                df = pd.DataFrame(rows, columns=headers[1:])  # Skip first empty header
-                df['Year'] = year
-                df['Stat_Type'] = stat_type
-                print(f"Successfully scraped {len(df)} {stat_type} records for {year}")
-                return df
-            else:
-                print(f"No data found for {stat_type} in {year}")
-                return pd.DataFrame()
+        if table is None:
+            raise ValueError(f"Could not find stats table for {stat_type}")
 
-        except Exception as e:
-            print(f"Error scraping basketball stats: {e}")
+        # Create DataFrame
+        if len(table):
+            df = table.to_frame()
+            df['Year'] = year
+            df['Stat_Type'] = stat_type
+            df = coerce_stat_types(df)
+            print(f"Successfully scraped {len(df)} {stat_type} records for {year}")
+            return df
+        else:
+            print(f"No data found for {stat_type} in {year}")
             return pd.DataFrame()
 
-    def _scrape_basketball_standings(self, soup: BeautifulSoup, year: int) -> pd.DataFrame:
+    def _scrape_basketball_standings(self, content: bytes, year: int) -> pd.DataFrame:
         """Scrape NBA standings specifically"""
         try:
-            # Find standings tables
-            tables = soup.find_all('table', {'id': lambda x: x and x.endswith('_standings')})
-
-            all_standings = []
+            # Find standings tables and stack their team rows
+            tables = extract_tables(self.engine, content, '_standings')
 
+            all_standings = None
             for table in tables:
-                # Extract headers
-                headers = []
-                header_row = table.find('thead').find('tr')
-                for th in header_row.find_all('th'):
-                    headers.append(th.get_text().strip())
-
-                # Extract team rows
-                for tr in table.find('tbody').find_all('tr'):
-                    row_data = []
-                    for td in tr.find_all('td'):
-                        row_data.append(td.get_text().strip())
-
-                    if row_data:
-                        all_standings.append(row_data)
-
-            if all_standings:
-                df = pd.DataFrame(all_standings, columns=headers[1:])
+                if all_standings is None:
+                    all_standings = table
+                else:
+                    all_standings.extend(table)
+
+            if all_standings is not None and len(all_standings):
+                df = all_standings.to_frame()
                 df['Year'] = year
                 df['Stat_Type'] = 'standings'
-                return df
+                return coerce_stat_types(df)
             else:
                 return pd.DataFrame()
 
@@ -206,61 +247,247 @@ class SportsReferenceScraper:
             print(f"Error scraping standings: {e}")
             return pd.DataFrame()
 
-    def format_for_qwen(self, df: pd.DataFrame, context: str = "") -> str:
-        """Format DataFrame data for Qwen AI consumption"""
+    def scrape_bulk(self, sport: str, years: Sequence[int], stat_types: Sequence[str],
+                    fetch_workers: int = 4,
+                    parse_workers: Optional[int] = None) -> Iterator[Tuple[int, str, pd.DataFrame]]:
+        """Scrape every (year, stat_type) page for a sport concurrently.
+
+        Pages are fetched by a thread pool through the shared rate-limited
+        session and parsed in a process pool so HTML work uses every core.
+        Results are yielded as (year, stat_type, df) as soon as each page is
+        done, in completion order; failed pages yield an empty DataFrame.
+        """
+        jobs = [(year, stat_type) for year in years for stat_type in stat_types]
+        for year, stat_type in jobs:
+            page_url(sport, year, stat_type)  # Reject bad stat types before any fetching
+
+        with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+             ProcessPoolExecutor(max_workers=parse_workers) as parse_pool:
+            fetches = {
+                fetch_pool.submit(self._load_page, page_url(sport, year, stat_type), sport, year, stat_type):
+                    (year, stat_type)
+                for year, stat_type in jobs
+            }
+            parses = {}
+            pending = set(fetches)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetches:
+                        year, stat_type = fetches.pop(future)
+                        try:
+                            validator, df, content = future.result()
+                        except Exception as e:
+                            print(f"Error fetching {sport} {stat_type} {year}: {e}")
+                            yield year, stat_type, pd.DataFrame()
+                            continue
+                        if df is not None:
+                            yield year, stat_type, df
+                            continue
+                        parse = parse_pool.submit(parse_page, sport, year, stat_type, content, self.parser)
+                        parses[parse] = (year, stat_type, validator)
+                        pending.add(parse)
+                    else:
+                        year, stat_type, validator = parses.pop(future)
+                        try:
+                            df = future.result()
+                        except Exception as e:
+                            print(f"Error parsing {sport} {stat_type} {year}: {e}")
+                            df = pd.DataFrame()
+                        self._remember_table(sport, year, stat_type, validator, df)
+                        yield year, stat_type, df
+
+    def format_for_qwen(self, df: pd.DataFrame, context: str = "", budget: int = DEFAULT_TOKEN_BUDGET,
+                        rank_by: Optional[str] = None, players: Sequence[str] = ()) -> str:
+        """Format DataFrame data for Qwen AI consumption within a token budget"""
+        return default_builder.build(df, context, budget=budget, rank_by=rank_by, players=players)
+
+# Per-process scrapers for parse_page, keyed by parser engine
+_parse_scrapers: Dict[str, SportsReferenceScraper] = {}
+
+def parse_page(sport: str, year: int, stat_type: str, content: bytes, parser: str = 'lxml') -> pd.DataFrame:
+    """Parse a downloaded page; module-level so process pools can pickle it"""
+    scraper = _parse_scrapers.get(parser)
+    if scraper is None:
+        scraper = _parse_scrapers[parser] = SportsReferenceScraper(parser=parser, rate=None)
+    return scraper.parse_page(sport, content, year, stat_type)
+
+def render_output(scraper: SportsReferenceScraper, df: pd.DataFrame, sport: str, year: int,
+                  stat_type: str, qwen_format: bool, budget: int = DEFAULT_TOKEN_BUDGET,
+                  rank_by: Optional[str] = None, players: Sequence[str] = ()) -> str:
+    """Render a scraped table as CSV or Qwen-ready text"""
+    if qwen_format:
+        context = f"Historical {sport} {stat_type} statistics for {year}"
+        return scraper.format_for_qwen(df, context, budget=budget, rank_by=rank_by, players=players)
+    return df.to_csv(index=False)
+
+def handle_request(scraper: SportsReferenceScraper, request: Dict[str, Any],
+                   store: Optional[HistoricalStore] = None) -> Dict[str, Any]:
+    """Run one JSON-lines request and build its response"""
+    request_id = request.get('id')
+    try:
+        sport = request['sport']
+        year = int(request['year'])
+        stat_type = request['statType']
+        df = scraper.scrape(sport, year, stat_type)
         if df.empty:
-            return "No data available"
-
-        # Limit to top 20 rows to avoid token limits
-        df_limited = df.head(20)
-
-        # Convert to string format
-        data_str = df_limited.to_string(index=False)
-
-        # Add context
-        formatted = f"{context}\n\nData:\n{data_str}"
-
-        # Add summary stats if numerical columns exist
-        numeric_cols = df_limited.select_dtypes(include=['number']).columns
-        if len(numeric_cols) > 0:
-            summary = df_limited[numeric_cols].describe()
-            formatted += f"\n\nSummary Statistics:\n{summary.to_string()}"
-
-        return formatted
+            return {'id': request_id, 'ok': False, 'error': 'No data scraped'}
+        store_scrape(store, sport, year, stat_type, df)
+        data = render_output(scraper, df, sport, year, stat_type, request.get('qwenFormat', True),
+                             budget=int(request.get('tokenBudget') or DEFAULT_TOKEN_BUDGET),
+                             rank_by=request.get('rankBy'), players=request.get('players') or ())
+        return {'id': request_id, 'ok': True, 'data': data}
+    except Exception as e:
+        return {'id': request_id, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+def build_scraper(cache_dir: Optional[str] = DEFAULT_CACHE_DIR, parser: str = 'lxml',
+                  **kwargs) -> SportsReferenceScraper:
+    """Create a scraper, with the page and table caches unless cache_dir is None"""
+    if not cache_dir:
+        return SportsReferenceScraper(parser=parser, **kwargs)
+    return SportsReferenceScraper(HTTPCache(cache_dir), TableCache(os.path.join(cache_dir, 'tables')),
+                                  parser=parser, **kwargs)
+
+def run_bulk(scraper: SportsReferenceScraper, sport: str, years: List[int], stat_types: List[str],
+             output_dir: str, fetch_workers: int, parse_workers: Optional[int]) -> int:
+    """Stream a bulk scrape into the history store; returns the failure count"""
+    store = HistoricalStore(output_dir)
+    failures = 0
+    total = len(years) * len(stat_types)
+    for done, (year, stat_type, df) in enumerate(
+            scraper.scrape_bulk(sport, years, stat_types, fetch_workers, parse_workers), start=1):
+        if df.empty:
+            failures += 1
+            print(f"[{done}/{total}] {sport} {stat_type} {year}: no data")
+            continue
+        path = store.append(sport, stat_type, year, df)
+        print(f"[{done}/{total}] {sport} {stat_type} {year}: {len(df)} rows -> {path}")
+
+    print(f"Wrote {store.writer.rows_written} rows in {store.writer.partitions_written} partitions to {output_dir}"
+          f" ({failures} failed)")
+    return failures
+
+def store_scrape(store: Optional[HistoricalStore], sport: str, year: int, stat_type: str, df: pd.DataFrame):
+    """Append a freshly parsed scrape to the history store; a failed write never fails the scrape.
+
+    Table-cache hits are skipped: each append rewrites the whole partition,
+    and the table was stored when it was parsed.
+    """
+    if store is None or df.empty or df.attrs.get('from_table_cache'):
+        return
+    try:
+        store.append(sport, stat_type, year, df)
+    except Exception as e:
+        print(f"Could not store {sport} {stat_type} {year}: {e}", file=sys.stderr)
+
+def serve(cache_dir: Optional[str] = DEFAULT_CACHE_DIR, parser: str = 'lxml',
+          store: Optional[HistoricalStore] = None, rate: Optional[float] = DEFAULT_RATE):
+    """Serve scrape requests as JSON lines over stdin/stdout.
+
+    Each input line is {"id", "sport", "year", "statType", "qwenFormat"}
+    (plus optional "tokenBudget", "rankBy", "players" for Qwen text) and
+    produces exactly one output line {"id", "ok", "data" | "error"}. The
+    scraper (and its requests.Session) stays warm for the life of the
+    process, so callers pay interpreter start-up and imports once. Requests
+    are handled one at a time; the caller runs a bounded pool of these
+    processes and queues work between them. Freshly parsed tables are also
+    appended to `store` when one is given (--store; off by default).
+    """
+    # Keep the protocol stream clean: progress prints go to stderr
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    scraper = build_scraper(cache_dir, parser, rate=rate)
+    for line in iter(sys.stdin.readline, ''):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {'id': None, 'ok': False, 'error': f"Invalid JSON: {e}"}
+        else:
+            response = handle_request(scraper, request, store)
+        protocol.write(json.dumps(response) + '\n')
+        protocol.flush()
 
 def main():
     parser = argparse.ArgumentParser(description='Scrape sports reference data for Qwen AI')
-    parser.add_argument('--sport', choices=['baseball', 'basketball'], required=True,
+    parser.add_argument('--sport', choices=['baseball', 'basketball'],
                        help='Sport to scrape')
-    parser.add_argument('--year', type=int, required=True,
+    parser.add_argument('--year', type=int,
                        help='Year to scrape')
-    parser.add_argument('--stat-type', required=True,
+    parser.add_argument('--stat-type',
                        help='Type of stats to scrape')
     parser.add_argument('--output', help='Output file path')
     parser.add_argument('--qwen-format', action='store_true',
                        help='Format output for Qwen AI consumption')
+    parser.add_argument('--token-budget', type=int, default=DEFAULT_TOKEN_BUDGET,
+                       help='Approximate token budget for --qwen-format output')
+    parser.add_argument('--rank-by',
+                       help='Column to rank rows by in --qwen-format output')
+    parser.add_argument('--players',
+                       help='Comma-separated players to put first in --qwen-format output')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a long-lived JSON-lines worker on stdin/stdout')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help='Directory for the on-disk page cache')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always download pages instead of using the cache')
+    parser.add_argument('--parser', choices=['lxml', 'bs4'], default='lxml',
+                       help='HTML parser engine (lxml falls back to bs4 when needed)')
+    parser.add_argument('--years',
+                       help='Bulk mode: years to scrape, e.g. 1990-2024 or 2019,2021-2023')
+    parser.add_argument('--stat-types',
+                       help='Bulk mode: comma-separated stat types, e.g. per_game,advanced')
+    parser.add_argument('--output-dir', default=DEFAULT_STORE_DIR,
+                       help='History store every scrape is appended to (see sports_ref_store.py)')
+    parser.add_argument('--no-store', action='store_true',
+                       help='Do not append single-season scrapes to the history store')
+    parser.add_argument('--store', action='store_true',
+                       help='--serve: also append freshly parsed tables to the history store (off by default)')
+    parser.add_argument('--fetch-workers', type=int, default=4,
+                       help='Bulk mode: concurrent page downloads')
+    parser.add_argument('--parse-workers', type=int,
+                       help='Bulk mode: parser processes (default: one per core)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help='Max requests per second to each Sports Reference host from this process '
+                            '(0 disables); split it when running several processes')
 
     args = parser.parse_args()
+    cache_dir = None if args.no_cache else args.cache_dir
+    store = None if args.no_store else HistoricalStore(args.output_dir)
 
-    scraper = SportsReferenceScraper()
+    if args.serve:
+        # Off unless asked for: serve runs per user request, often from another working directory
+        serve(cache_dir, args.parser, HistoricalStore(args.output_dir) if args.store else None, rate=args.rate)
+        return
 
-    if args.sport == 'baseball':
-        df = scraper.scrape_baseball_stats(args.year, args.stat_type)
-    elif args.sport == 'basketball':
-        df = scraper.scrape_basketball_stats(args.year, args.stat_type)
-    else:
-        print("Invalid sport")
-        sys.exit(1)
+    if args.years or args.stat_types:
+        if not (args.sport and args.years and args.stat_types):
+            parser.error('bulk mode needs --sport, --years and --stat-types')
+        scraper = build_scraper(cache_dir, args.parser, rate=args.rate, pool_size=args.fetch_workers)
+        failures = run_bulk(scraper, args.sport, parse_years(args.years),
+                            [t.strip() for t in args.stat_types.split(',') if t.strip()],
+                            args.output_dir, args.fetch_workers, args.parse_workers)
+        sys.exit(1 if failures else 0)
+
+    if not (args.sport and args.year and args.stat_type):
+        parser.error('--sport, --year and --stat-type are required unless --serve is given')
+
+    scraper = build_scraper(cache_dir, args.parser, rate=args.rate)
+
+    df = scraper.scrape(args.sport, args.year, args.stat_type)
 
     if df.empty:
         print("No data scraped")
         sys.exit(1)
+    store_scrape(store, args.sport, args.year, args.stat_type, df)
 
-    if args.qwen_format:
-        context = f"Historical {args.sport} {args.stat_type} statistics for {args.year}"
-        output = scraper.format_for_qwen(df, context)
-    else:
-        output = df.to_csv(index=False)
+    players = [p.strip() for p in (args.players or '').split(',') if p.strip()]
+    output = render_output(scraper, df, args.sport, args.year, args.stat_type, args.qwen_format,
+                           budget=args.token_budget, rank_by=args.rank_by, players=players)
 
     if args.output:
         with open(args.output, 'w', encoding='utf-8') as f:
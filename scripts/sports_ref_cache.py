@@ -0,0 +1,258 @@
+#
+# Fanalytics - Sports Reference Cache
+#
+# On-disk caching for the Sports Reference scraper. Pages are stored under
+# a hash of their URL together with the validators (ETag / Last-Modified)
+# the server sent, so stale entries can be revalidated with a conditional
+# GET instead of a full download.
+#
+# Finished seasons never change upstream and are served from disk without
+# touching the network; the current season is revalidated once its TTL
+# expires. The cache is size-bounded and evicts least-recently-used pages.
+#
+# Parsed tables are cached separately as Arrow IPC files tagged with the
+# validator of the page they came from, so a repeat scrape of an unchanged
+# page skips HTML parsing altogether.
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import requests
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SPORTS_REF_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'fanalytics', 'sports_ref'))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_CURRENT_SEASON_TTL = 6 * 60 * 60
+
+# Bump when the shape of scraped tables changes so old parses are not reused
+TABLE_FORMAT_VERSION = '2'
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write a file so concurrent readers never see a partial copy"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class HTTPCache:
+    """URL-keyed page cache with conditional revalidation and LRU eviction.
+
+    Each entry is a pair of files named after sha256(url): `<key>.body`
+    holds the raw response and `<key>.json` its metadata. The metadata
+    file's mtime doubles as the LRU clock, so several worker processes can
+    share one cache directory without a coordinating index.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 current_season_ttl: float = DEFAULT_CURRENT_SEASON_TTL):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.current_season_ttl = current_season_ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key)
+        return f'{base}.body', f'{base}.json'
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            # Missing, evicted by another process, or half-written
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return meta
+
+    def _store(self, key: str, meta: Dict[str, Any], content: Optional[bytes] = None):
+        body_path, meta_path = self._paths(key)
+        if content is not None:
+            _atomic_write(body_path, content)
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _touch(self, key: str):
+        try:
+            os.utime(self._paths(key)[1])
+        except OSError:
+            pass
+
+    @staticmethod
+    def _validator(meta: Dict[str, Any]) -> str:
+        return meta.get('etag') or meta.get('last_modified') or meta['sha256']
+
+    def refresh(self, session: requests.Session, url: str,
+                immutable: bool = False) -> Tuple[str, Optional[bytes]]:
+        """Make sure the entry for `url` is fresh and return its validator.
+
+        `immutable` marks pages for finished seasons: once cached they are
+        never revalidated. Other pages are reused for `current_season_ttl`
+        seconds and then revalidated with If-None-Match / If-Modified-Since.
+
+        Returns (validator, body). The body is only returned when it was just
+        downloaded; otherwise it is left on disk for read() so callers that
+        can answer from the validator alone never load it.
+        """
+        key = self.key_for(url)
+        cached = self._load_meta(key)
+        now = time.time()
+
+        if cached is not None:
+            fresh = immutable or now - cached.get('fetched_at', 0) < self.current_season_ttl
+            if fresh:
+                self._touch(key)
+                return self._validator(cached), None
+
+        headers = {}
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = session.get(url, headers=headers)
+
+        if cached is not None and response.status_code == 304:
+            cached['fetched_at'] = now
+            self._store(key, cached)
+            return self._validator(cached), None
+
+        response.raise_for_status()
+        content = response.content
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'fetched_at': now,
+            'size': len(content),
+        }
+        self._store(key, meta, content)
+        self.evict()
+        return self._validator(meta), content
+
+    def read(self, url: str) -> Optional[bytes]:
+        """Return the cached body for `url`, or None if it is not on disk"""
+        body_path, _ = self._paths(self.key_for(url))
+        try:
+            with open(body_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def fetch(self, session: requests.Session, url: str, immutable: bool = False) -> bytes:
+        """Return the body for `url`, going to the network only when needed"""
+        _, content = self.refresh(session, url, immutable)
+        if content is None:
+            content = self.read(url)
+        if content is None:
+            # Evicted between refresh and read; the entry now looks missing
+            _, content = self.refresh(session, url, immutable)
+        return content
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                key = entry.name[:-len('.json')]
+                body_path, _ = self._paths(key)
+                try:
+                    size = os.path.getsize(body_path) + entry.stat().st_size
+                    entries.append((entry.stat().st_mtime, key, size))
+                except OSError:
+                    continue
+                total += size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, key, size in sorted(entries):
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+class TableCache:
+    """Parsed scrape results stored as memory-mapped Arrow IPC files.
+
+    One file per (sport, year, stat_type). Each file records the validator
+    of the page it was parsed from; a lookup with a different validator is
+    a miss, so tables are invalidated exactly when the upstream page is.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, sport: str, year: int, stat_type: str) -> str:
+        return os.path.join(self.cache_dir, f'{sport}_{stat_type}_{year}.arrow')
+
+    def load(self, sport: str, year: int, stat_type: str, validator: str) -> Optional[pd.DataFrame]:
+        """Return the cached table if it was parsed from this page version"""
+        path = self._path(sport, year, stat_type)
+        try:
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+        metadata = table.schema.metadata or {}
+        if metadata.get(b'validator', b'').decode('utf-8') != validator:
+            return None
+        if metadata.get(b'format', b'').decode('utf-8') != TABLE_FORMAT_VERSION:
+            return None
+
+        df = table.to_pandas()
+        # Scraped headers are not always unique, so names are kept aside
+        df.columns = json.loads(metadata[b'columns'])
+        return df
+
+    def store(self, sport: str, year: int, stat_type: str, validator: str, df: pd.DataFrame):
+        columns: List[str] = [str(c) for c in df.columns]
+        positional = df.set_axis([f'c{i}' for i in range(len(columns))], axis=1)
+        table = pa.Table.from_pandas(positional, preserve_index=False)
+        # Keep pandas' own metadata so nullable and categorical dtypes round-trip
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            'validator': validator,
+            'format': TABLE_FORMAT_VERSION,
+            'columns': json.dumps(columns),
+        })
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        _atomic_write(self._path(sport, year, stat_type), sink.getvalue().to_pybytes())
@@ -0,0 +1,204 @@
+#
+# Fanalytics - LLM Context Builder
+#
+# Turns a scraped stats table into prompt text that fits a token budget.
+# Instead of dumping the first 20 rows as padded fixed-width text, it:
+#
+# - ranks rows by a relevance key (a stat column and/or players of interest)
+# - keeps identity columns, the ranking column and the most informative
+#   stats, dropping constant and empty columns into a one-line header
+# - writes compact pipe-delimited rows with trimmed numbers (.312, 27.3),
+#   followed by one row of whole-table averages
+# - memoizes the text per (table version, query) in an LRU cache, so a
+#   repeated question about the same page costs a dictionary lookup
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Rough GPT-style tokenizer ratio; numbers and pipes tokenize worse than prose
+CHARS_PER_TOKEN = 3
+DEFAULT_TOKEN_BUDGET = 1500
+MIN_ROWS = 10
+
+IDENTITY_COLUMNS = ['Player', 'Name', 'Team', 'Tm', 'Pos']
+
+# Sensible ranking when the caller does not name one
+DEFAULT_RANK_BY = {
+    'per_game': 'PTS',
+    'totals': 'PTS',
+    'advanced': 'WS',
+    'standings': 'W',
+    'batting': 'WAR',
+    'pitching': 'WAR',
+    'fielding': 'WAR',
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_value(value) -> str:
+    """Shortest faithful text for a cell: 0.312 -> .312, 27.30 -> 27.3"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        text = f'{value:.0f}' if abs(value) >= 1000 else f'{value:.3f}'.rstrip('0').rstrip('.')
+        if text.startswith('0.'):
+            return text[1:]
+        if text.startswith('-0.'):
+            return '-' + text[2:]
+        return text
+    return str(value).replace('|', '/').replace('\n', ' ')
+
+
+def table_version(df: pd.DataFrame) -> Hashable:
+    """Identity of a table's contents: the scraper's page version, else a content hash"""
+    version = df.attrs.get('table_version')
+    if version is not None:
+        return version
+    return (df.shape, tuple(map(str, df.columns)),
+            int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+
+class ContextBuilder:
+    """Budgeted, memoized DataFrame-to-prompt formatter"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, df: pd.DataFrame, context: str = '', budget: int = DEFAULT_TOKEN_BUDGET,
+              rank_by: Optional[str] = None, players: Sequence[str] = (),
+              columns: Sequence[str] = ()) -> str:
+        """Format `df` for the model in at most ~`budget` tokens.
+
+        `rank_by` orders rows (descending) by a column; `players` pins rows
+        whose Player/Name contains any of the given strings to the top;
+        `columns` are stats the caller wants kept ahead of the rest.
+        """
+        if df.empty:
+            return "No data available"
+
+        key = (table_version(df), context, budget, rank_by,
+               tuple(p.lower() for p in players), tuple(columns))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        text = self._render(df, context, budget, rank_by, players, columns)
+
+        with self._lock:
+            self._cache[key] = text
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return text
+
+    def _rank_rows(self, df: pd.DataFrame, rank_by: Optional[str],
+                   players: Sequence[str]) -> Tuple[pd.DataFrame, str]:
+        note = ''
+        if rank_by is None:
+            stat_type = df['Stat_Type'].iloc[0] if 'Stat_Type' in df.columns else None
+            rank_by = DEFAULT_RANK_BY.get(str(stat_type))
+        if rank_by in df.columns and pd.api.types.is_numeric_dtype(df[rank_by]):
+            df = df.sort_values(rank_by, ascending=False, na_position='last', kind='stable')
+            note = f'ranked by {rank_by}'
+
+        name_column = next((c for c in ('Player', 'Name') if c in df.columns), None)
+        if players and name_column:
+            names = df[name_column].astype('string').str.lower()
+            pinned = pd.Series(False, index=df.index)
+            for player in players:
+                pinned |= names.str.contains(player.lower(), regex=False).fillna(False)
+            df = pd.concat([df[pinned], df[~pinned]])
+            note = ', '.join(filter(None, [note, f'{int(pinned.sum())} requested players first']))
+        return df, note
+
+    def _render(self, df: pd.DataFrame, context: str, budget: int, rank_by: Optional[str],
+                players: Sequence[str], columns: Sequence[str]) -> str:
+        df = df.loc[:, ~df.columns.duplicated()]
+        ranked, note = self._rank_rows(df, rank_by, players)
+
+        # Constant columns (Year, Stat_Type, ...) are stated once, not per row
+        constants: Dict[str, str] = {}
+        varying: List[str] = []
+        for column in df.columns:
+            values = df[column].dropna()
+            if values.empty or (values.astype('string') == '').all():
+                continue
+            if values.nunique() == 1 and len(df) > 1:
+                constants[column] = format_value(values.iloc[0])
+            else:
+                varying.append(column)
+
+        # Column priority: identity, ranking key, requested, then the rest in page order
+        priority = [c for c in IDENTITY_COLUMNS if c in varying]
+        for column in [rank_by, *columns]:
+            if column in varying and column not in priority:
+                priority.append(column)
+        priority += [c for c in varying if c not in priority]
+
+        # Format a sample of rows once to price each column per row
+        sample = ranked.head(MIN_ROWS)
+        cells = {c: [format_value(v) for v in sample[c].tolist()] for c in priority}
+        cost = {c: (sum(len(v) for v in cells[c]) / max(len(sample), 1) + 1) / CHARS_PER_TOKEN
+                for c in priority}
+
+        header_lines = [context.strip()] if context.strip() else []
+        if constants:
+            header_lines.append('; '.join(f'{k}={v}' for k, v in constants.items()))
+        preamble_tokens = estimate_tokens('\n'.join(header_lines)) + 20
+        available = max(budget - preamble_tokens, 0)
+
+        # Widest set of columns that still leaves room for MIN_ROWS rows,
+        # the header line and the averages line
+        chosen: List[str] = []
+        row_cost = 0.0
+        header_cost = 0.0
+        for column in priority:
+            column_header = (len(column) + 1) / CHARS_PER_TOKEN
+            total = (row_cost + cost[column]) * (MIN_ROWS + 2) + header_cost + column_header
+            if chosen and total > available:
+                continue
+            chosen.append(column)
+            row_cost += cost[column]
+            header_cost += column_header
+
+        # One averages row over the whole table replaces the old describe() block
+        averages = ['avg' if i == 0 else
+                    (format_value(float(df[c].mean())) if pd.api.types.is_numeric_dtype(df[c]) else '')
+                    for i, c in enumerate(chosen)]
+        average_line = '|'.join(averages)
+
+        lines = ['|'.join(chosen)]
+        used = estimate_tokens(lines[0]) + estimate_tokens(average_line) + 1
+        shown = 0
+        for row in ranked[chosen].itertuples(index=False, name=None):
+            line = '|'.join(format_value(v) for v in row)
+            line_tokens = estimate_tokens(line) + 1
+            if used + line_tokens > available:
+                break
+            lines.append(line)
+            used += line_tokens
+            shown += 1
+
+        lines.append(average_line)
+        summary = f'Rows {shown} of {len(df)}' + (f' ({note})' if note else '') + ', then table averages'
+        return '\n'.join(header_lines + [summary, 'Data:'] + lines)
+
+
+# Shared builder so serve() and repeated CLI calls in one process reuse results
+default_builder = ContextBuilder()
@@ -0,0 +1,85 @@
+#
+# Fanalytics - Sports Reference Dataset
+#
+# Partitioned Parquet output for bulk scrapes. Every scraped table lands
+# in one dataset directory laid out Hive-style:
+#
+#   <root>/sport=basketball/stat_type=per_game/year=2019/part-0.parquet
+#
+# so a whole backfill can be read back (or filtered by partition) with
+# pandas.read_parquet / pyarrow.dataset instead of juggling one CSV per run.
+# Re-scraping a partition replaces its file, which keeps re-runs idempotent.
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import os
+import tempfile
+from typing import List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def unique_columns(columns) -> List[str]:
+    """Make scraped headers safe for Parquet, which rejects duplicate names"""
+    seen = {}
+    names = []
+    for column in columns:
+        name = str(column) or 'unnamed'
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f'{name}_{count + 1}')
+    return names
+
+
+def parse_years(spec: str) -> List[int]:
+    """Expand '1990-1995,2001' into a sorted list of years"""
+    years = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(y) for y in part.split('-', 1))
+            years.update(range(min(start, end), max(start, end) + 1))
+        else:
+            years.add(int(part))
+    return sorted(years)
+
+
+class PartitionedDatasetWriter:
+    """Writes scraped tables into a sport/stat_type/year partitioned dataset"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.partitions_written = 0
+        self.rows_written = 0
+
+    def partition_dir(self, sport: str, stat_type: str, year: int) -> str:
+        return os.path.join(self.root, f'sport={sport}', f'stat_type={stat_type}', f'year={year}')
+
+    def write(self, sport: str, stat_type: str, year: int, df: pd.DataFrame) -> str:
+        """Replace one partition with `df` and return the file written"""
+        directory = self.partition_dir(sport, stat_type, year)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'part-0.parquet')
+
+        table = pa.Table.from_pandas(df.set_axis(unique_columns(df.columns), axis=1),
+                                     preserve_index=False)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.parquet')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.partitions_written += 1
+        self.rows_written += len(df)
+        return path
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+#
+# Fanalytics - Sports Reference Fixture Pages
+#
+# Generates synthetic pages shaped like real Sports Reference pages, so the
+# parser benchmark (benchmark_parsers.py) and the tests run on the same
+# input everywhere instead of whatever a local page cache holds. Output is
+# deterministic: the same pages, byte for byte, on every run.
+#
+# What makes real pages expensive to parse is reproduced, not the data:
+#
+# - a few hundred KB of navigation, inline scripts and footer around the table
+# - secondary tables shipped inside HTML comments (Sports Reference
+#   un-comments them client-side), which a parser must skip
+# - data-stat attributes and player links in every row
+# - header rows repeated every 20 rows (class="thead"), and traded players'
+#   combined 2TM line followed by one line per team
+#
+# Usage:
+# python sports_ref_fixtures.py out_dir
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import argparse
+import os
+import random
+from typing import Dict, List, Sequence, Tuple
+
+TEAMS = ['ATL', 'BOS', 'BRK', 'CHO', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL',
+         'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHO', 'POR', 'SAC', 'SAS', 'TOR',
+         'UTA', 'WAS']
+FIRST = ['Aaron', 'Brandon', 'Chris', 'Darius', 'Evan', 'Frank', 'Gary', 'Hunter', 'Isaiah', 'Jalen',
+         'Kevin', 'Luka', 'Marcus', 'Nikola', 'Oscar', 'Paul', 'Quentin', 'Russell', 'Stephen', 'Tyrese']
+LAST = ['Adams', 'Brown', 'Carter', 'Davis', 'Edwards', 'Fox', 'Green', 'Harris', 'Irving', 'Jones',
+        'Knight', 'Lopez', 'Murray', 'Nance', 'Oubre', 'Porter', 'Quickley', 'Robinson', 'Smith', 'Thompson',
+        'Williams', 'Young']
+
+PER_GAME = ['Age', 'Team', 'Pos', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', '2P', '2PA', '2P%',
+            'eFG%', 'FT', 'FTA', 'FT%', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'Awards']
+ADVANCED = ['Age', 'Team', 'Pos', 'G', 'GS', 'MP', 'PER', 'TS%', '3PAr', 'FTr', 'ORB%', 'DRB%', 'TRB%', 'AST%',
+            'STL%', 'BLK%', 'TOV%', 'USG%', 'OWS', 'DWS', 'WS', 'WS/48', 'OBPM', 'DBPM', 'BPM', 'VORP', 'Awards']
+BATTING = ['Age', 'Team', 'Lg', 'WAR', 'G', 'PA', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'SB', 'CS', 'BB',
+           'SO', 'BA', 'OBP', 'SLG', 'OPS', 'OPS+', 'rOBA', 'Rbat+', 'TB', 'GDP', 'HBP', 'SH', 'SF', 'IBB',
+           'Pos', 'Awards']
+STANDINGS = ['W', 'L', 'W/L%', 'GB', 'PS/G', 'PA/G', 'SRS']
+
+# (file name, table id, columns, player rows, with traded players)
+PAGES = [
+    ('basketball_2024_per_game.html', 'per_game_stats', PER_GAME, 580, True),
+    ('basketball_2024_advanced.html', 'advanced_stats', ADVANCED, 580, True),
+    ('baseball_2023_batting.html', 'batting_leaders_standard', BATTING, 900, True),
+    ('basketball_2024_standings.html', None, STANDINGS, 0, False),
+]
+
+
+def _cell(rng: random.Random, column: str, team: str) -> str:
+    if column == 'Age':
+        return str(rng.randint(19, 39))
+    if column == 'Team':
+        return team
+    if column == 'Lg':
+        return rng.choice(['AL', 'NL'])
+    if column == 'Pos':
+        return rng.choice(['PG', 'SG', 'SF', 'PF', 'C', '*6/H', '9D', '1'])
+    if column == 'Awards':
+        return rng.choice(['', '', '', 'AS', 'MVP-5,AS,NBA2'])
+    if column.endswith('%') or column in ('BA', 'OBP', 'SLG', 'OPS', 'rOBA', 'WS/48', '3PAr', 'FTr'):
+        # Rates: leading-dot, sometimes blank (no attempts)
+        return '' if rng.random() < 0.05 else f'.{rng.randint(100, 999)}'
+    if column in ('WAR', 'OWS', 'DWS', 'WS', 'OBPM', 'DBPM', 'BPM', 'VORP', 'PER', 'MP', 'SRS', 'PS/G', 'PA/G'):
+        return f'{rng.uniform(-3, 40):.1f}'
+    return str(rng.randint(0, 700))
+
+
+def _row(rank: int, name: str, slug: str, columns: Sequence[str], team: str, stats: Dict[str, str]) -> str:
+    cells = [f'<th scope="row" class="right " data-stat="ranker" >{rank}</th>',
+             f'<td class="left " data-append-csv="{slug}" data-stat="name_display" >'
+             f'<a href="/players/{slug[0]}/{slug}.html">{name}</a></td>']
+    for column in columns:
+        value = team if column == 'Team' else stats[column]
+        if column == 'Team' and not team.endswith('TM'):
+            value = f'<a href="/teams/{team}/2024.html">{team}</a>'
+        cells.append(f'<td class="right " data-stat="{column.lower()}" >{value}</td>')
+    return '<tr >' + ''.join(cells) + '</tr>\n'
+
+
+def _header(columns: Sequence[str], repeated: bool = False) -> str:
+    cls = ' class="thead"' if repeated else ''
+    cells = ['<th aria-label="Rank" data-stat="ranker" scope="col" class=" poptip sort_default_asc right">Rk</th>',
+             '<th aria-label="Player" data-stat="name_display" scope="col" class=" poptip sort_default_asc left">'
+             'Player</th>']
+    cells += [f'<th aria-label="{c}" data-stat="{c.lower()}" scope="col" class=" poptip center">{c}</th>'
+              for c in columns]
+    return f'<tr{cls}>' + ''.join(cells) + '</tr>\n'
+
+
+def stats_table(rng: random.Random, table_id: str, columns: Sequence[str], players: int, traded: bool) -> str:
+    """A player stats table; returns its HTML"""
+    body: List[str] = []
+    rank = 0
+    lines = 0
+    for i in range(players):
+        name = f'{rng.choice(FIRST)} {rng.choice(LAST)}'
+        slug = f'{name.split()[1][:5].lower()}{name.split()[0][:2].lower()}{i % 100:02d}'
+        rank += 1
+        teams: List[str] = [rng.choice(TEAMS)]
+        if traded and rng.random() < 0.08:
+            teams = [f'{rng.choice([2, 3])}TM'] + rng.sample(TEAMS, 2)
+        for team in teams:
+            stats = {c: _cell(rng, c, team) for c in columns}
+            body.append(_row(rank, name, slug, columns, team, stats))
+            lines += 1
+            if lines % 20 == 0:
+                body.append(_header(columns, repeated=True))
+    body.append('<tr class="league_average_table"><th scope="row"></th><td class="left">League Average</td>'
+                + ''.join('<td></td>' for _ in columns) + '</tr>\n')
+    return (f'<table class="sortable stats_table" id="{table_id}" data-cols-to-freeze=",2">\n'
+            f'<caption>Player Stats Table</caption>\n<thead>\n{_header(columns)}</thead>\n<tbody>\n'
+            + ''.join(body) + '</tbody>\n</table>\n')
+
+
+def standings_tables(rng: random.Random) -> str:
+    """Conference standings with division separator rows, like the league season page"""
+    html = []
+    for conference, teams in (('E', TEAMS[:15]), ('W', TEAMS[15:])):
+        rows = []
+        for d, division in enumerate(('Atlantic', 'Central', 'Southeast')):
+            rows.append(f'<tr class="thead onecell"><td colspan="8" class="left">{division} Division</td></tr>\n')
+            for team in teams[d * 5:(d + 1) * 5]:
+                wins = rng.randint(15, 65)
+                cells = [f'<th scope="row" class="left " data-stat="team_name">'
+                         f'<a href="/teams/{team}/2024.html">{team}</a></th>']
+                cells += [f'<td class="right" data-stat="{c.lower()}">{v}</td>' for c, v in zip(
+                    STANDINGS, [wins, 82 - wins, f'.{wins * 1000 // 82:03d}', '—', f'{rng.uniform(100, 125):.1f}',
+                                f'{rng.uniform(100, 125):.1f}', f'{rng.uniform(-10, 10):.2f}'])]
+                rows.append('<tr class="full_table">' + ''.join(cells) + '</tr>\n')
+        header = ('<tr><th data-stat="team_name" class="left">' + ('Eastern' if conference == 'E' else 'Western')
+                  + ' Conference</th>' + ''.join(f'<th data-stat="{c.lower()}">{c}</th>' for c in STANDINGS) + '</tr>')
+        html.append(f'<table class="suppress_all sortable stats_table" id="divs_{conference}_standings">\n'
+                    f'<thead>{header}</thead>\n<tbody>\n' + ''.join(rows) + '</tbody>\n</table>\n')
+    return ''.join(html)
+
+
+def _boilerplate(rng: random.Random) -> Tuple[str, str]:
+    """Navigation, scripts and footer around the content, roughly as heavy as the real site's"""
+    nav = ['<div id="header"><nav><ul>']
+    for i in range(1500):
+        nav.append(f'<li><a href="/players/{chr(97 + i % 26)}/p{i:04d}.html" data-nav="{i}">Player {i}</a></li>')
+    nav.append('</ul></nav></div>\n')
+    blocks = []
+    for i in range(8):
+        values = ','.join(str(rng.randint(0, 999)) for _ in range(400))
+        blocks.append(f'<script>window.sr_{i}={{"k":"{rng.getrandbits(64):x}","v":[{values}]}};'
+                      f'if(window.sr_{i}.v.length>1){{document.body&&document.body.setAttribute("data-sr-{i}","1");}}'
+                      '</script>\n')
+    scripts = ''.join(blocks)
+    footer = '<div id="footer">' + ''.join(f'<p class="note">Footer note {i} &amp; &copy; Sports Reference</p>'
+                                           for i in range(300)) + '</div>\n'
+    return nav + [scripts], footer
+
+
+def fixture_page(name: str, table_id, columns: Sequence[str], players: int, traded: bool) -> bytes:
+    """One fixture page's bytes; the same for a given name on every call"""
+    rng = random.Random(name)
+    head, footer = _boilerplate(rng)
+    if table_id is None:
+        content = standings_tables(rng)
+    else:
+        content = stats_table(rng, table_id, columns, players, traded)
+    # A secondary table shipped as a comment, as the real pages do
+    hidden = stats_table(rng, f'{table_id or "team"}_hidden', columns[:8], 60, False)
+    html = ('<!DOCTYPE html>\n<html data-version="klecko-" lang="en"><head><meta charset="utf-8">'
+            f'<title>{name}</title></head><body>\n' + ''.join(head)
+            + f'<div id="content" role="main">\n<div class="table_container">\n{content}</div>\n'
+            + f'<div class="placeholder"></div>\n<!--\n{hidden}-->\n</div>\n' + footer + '</body></html>\n')
+    return html.encode('utf-8')
+
+
+def write_fixture_pages(directory: str) -> List[str]:
+    """Write every fixture page into `directory`; returns their paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, table_id, columns, players, traded in PAGES:
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(fixture_page(name, table_id, columns, players, traded))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic Sports Reference pages for benchmarks and tests')
+    parser.add_argument('directory', help='Where to write the pages')
+    args = parser.parse_args()
+    for path in write_fixture_pages(args.directory):
+        print(f"{path}: {os.path.getsize(path) // 1024} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#
+# Fanalytics - Sports Reference Table Parsers
+#
+# Parser engines that pull stats tables out of Sports Reference pages.
+# Every engine returns the same ParsedTable (header names plus one list of
+# cell strings per column), so the scraper does not care which one ran.
+#
+# - LxmlEngine streams the page through lxml's C parser and only keeps the
+#   target <table>; everything else is discarded as it is read.
+# - BeautifulSoupEngine is the original pure-Python html.parser path and
+#   stays as the fallback when lxml is missing or cannot find the table.
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import io
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; BeautifulSoup covers every page
+    etree = None
+
+TableFilter = Callable[[str, List[str]], bool]
+
+
+class ParsedTable:
+    """Header names and column-major cell text for one stats table"""
+
+    __slots__ = ('table_id', 'headers', 'columns')
+
+    def __init__(self, table_id: str, headers: List[str]):
+        self.table_id = table_id
+        self.headers = headers
+        # The first header labels the <th> row-number column, which has no <td>
+        self.columns: List[List[Optional[str]]] = [[] for _ in headers[1:]]
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def add_row(self, cells: List[str], min_cells: int):
+        if len(cells) < min_cells:
+            return
+        if len(cells) > len(self.columns):
+            raise ValueError(f"{len(self.columns)} columns passed, passed data had {len(cells)} columns")
+        for column, value in zip(self.columns, cells):
+            column.append(value)
+        # Short rows (e.g. division separators) are padded like DataFrame(rows) does
+        for column in self.columns[len(cells):]:
+            column.append(None)
+
+    def extend(self, other: 'ParsedTable'):
+        """Append another table's rows positionally, keeping the other's headers"""
+        width = len(other.columns)
+        if len(self.columns) < width:
+            self.columns.extend([None] * len(self) for _ in range(width - len(self.columns)))
+        for i, column in enumerate(self.columns):
+            column.extend(other.columns[i] if i < width else [None] * len(other))
+        self.headers = other.headers
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame({i: column for i, column in enumerate(self.columns)})
+        df.columns = self.headers[1:]
+        return df
+
+
+class BeautifulSoupEngine:
+    """Pure-Python fallback: builds the whole DOM with html.parser"""
+
+    name = 'bs4'
+
+    def iter_tables(self, content: bytes, want: TableFilter, min_cells: int = 1,
+                    skip_thead_rows: bool = True) -> Iterator[ParsedTable]:
+        soup = BeautifulSoup(content, 'html.parser')
+        for table in soup.find_all('table'):
+            table_id = table.get('id') or ''
+            if not want(table_id, table.get('class') or []):
+                continue
+
+            # Extract headers
+            headers = []
+            header_row = table.find('thead').find('tr')
+            for th in header_row.find_all('th'):
+                headers.append(th.get_text().strip())
+            parsed = ParsedTable(table_id, headers)
+
+            # Extract data rows
+            tbody = table.find('tbody')
+            if tbody:
+                for tr in tbody.find_all('tr'):
+                    if skip_thead_rows and tr.get('class') and 'thead' in tr.get('class'):
+                        continue  # Skip header rows
+                    parsed.add_row([td.get_text().strip() for td in tr.find_all('td')], min_cells)
+            yield parsed
+
+
+class LxmlEngine:
+    """Streaming extractor: only the matching tables are ever materialized"""
+
+    name = 'lxml'
+
+    def iter_tables(self, content: bytes, want: TableFilter, min_cells: int = 1,
+                    skip_thead_rows: bool = True) -> Iterator[ParsedTable]:
+        context = etree.iterparse(io.BytesIO(content), events=('start', 'end'),
+                                  html=True, recover=True, huge_tree=True)
+        table_id = None  # set while inside a wanted table
+        depth = 0        # <table> nesting depth inside the wanted table
+        section = None
+        parsed = None
+
+        for event, el in context:
+            tag = el.tag
+            if event == 'start':
+                if tag == 'table':
+                    if table_id is not None:
+                        depth += 1
+                    elif want(el.get('id') or '', (el.get('class') or '').split()):
+                        table_id, depth, parsed = el.get('id') or '', 1, None
+                elif depth == 1 and tag in ('thead', 'tbody'):
+                    section = tag
+                continue
+
+            if table_id is None:
+                # Outside any wanted table: drop the subtree as soon as it is read
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+                continue
+
+            if tag == 'table':
+                depth -= 1
+                if depth == 0:
+                    if parsed is not None:
+                        yield parsed
+                    table_id, section, parsed = None, None, None
+                    el.clear(keep_tail=True)
+            elif tag == 'tr' and depth == 1:
+                if section == 'thead' and parsed is None:
+                    parsed = ParsedTable(table_id, [
+                        ''.join(th.itertext()).strip() for th in el if th.tag == 'th'
+                    ])
+                elif section == 'tbody' and parsed is not None:
+                    classes = (el.get('class') or '').split()
+                    if not (skip_thead_rows and 'thead' in classes):
+                        parsed.add_row([
+                            ''.join(td.itertext()).strip() for td in el if td.tag == 'td'
+                        ], min_cells)
+                el.clear(keep_tail=True)
+            elif depth == 1 and tag in ('thead', 'tbody'):
+                section = None
+
+
+class FallbackEngine:
+    """Try a fast engine first and fall back to another when it comes up empty"""
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f'{primary.name}+{fallback.name}'
+
+    def iter_tables(self, content: bytes, want: TableFilter, min_cells: int = 1,
+                    skip_thead_rows: bool = True) -> Iterator[ParsedTable]:
+        try:
+            tables = list(self.primary.iter_tables(content, want, min_cells, skip_thead_rows))
+        except Exception as e:
+            print(f"{self.primary.name} parser failed ({e}); retrying with {self.fallback.name}")
+            tables = []
+        if not tables:
+            tables = list(self.fallback.iter_tables(content, want, min_cells, skip_thead_rows))
+        return iter(tables)
+
+
+def get_engine(name: str = 'lxml'):
+    """Return the named parser engine, backed by BeautifulSoup as a fallback"""
+    if name == 'bs4' or etree is None:
+        return BeautifulSoupEngine()
+    if name == 'lxml':
+        return FallbackEngine(LxmlEngine(), BeautifulSoupEngine())
+    raise ValueError(f"Unknown parser engine: {name}. Use 'lxml' or 'bs4'")
+
+
+def extract_table(engine, content: bytes, table_ids: Sequence[str], fallback_class: str = 'stats_table',
+                  min_cells: int = 1) -> Optional[ParsedTable]:
+    """Find the first table whose id is in table_ids (in priority order),
+    falling back to the first table carrying `fallback_class`"""
+    want = lambda table_id, classes: table_id in table_ids or fallback_class in classes
+    found = {}
+    for table in engine.iter_tables(content, want, min_cells):
+        found.setdefault(table.table_id, table)
+        found.setdefault(None, table)
+
+    for table_id in table_ids:
+        if table_id in found:
+            return found[table_id]
+    return found.get(None)
+
+
+def extract_tables(engine, content: bytes, id_suffix: str, min_cells: int = 1) -> List[ParsedTable]:
+    """Every table whose id ends with `id_suffix`, in document order"""
+    want = lambda table_id, classes: table_id.endswith(id_suffix)
+    return list(engine.iter_tables(content, want, min_cells, skip_thead_rows=False))
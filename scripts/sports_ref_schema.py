@@ -0,0 +1,134 @@
+#
+# Fanalytics - Sports Reference Column Types
+#
+# Scraped tables arrive as strings. coerce_stat_types() turns them into
+# compact typed columns in one vectorized pass per column:
+#
+# - identity text (Player, Name, Awards) stays text
+# - low-cardinality labels (Team, Pos, Lg) become categoricals
+# - stat columns become nullable Int32 or float32, accepting '',
+#   '%' suffixes, thousands separators and leading-dot rates like '.312'
+#
+# It also holds what the stats mean, shared by the history store and the
+# backend's stats engine: which team label is a traded player's combined
+# line, which stats rank lower-is-better and which are counting stats that
+# add up over a career (everything else is a rate or an average).
+#
+# Every integer stat uses the same nullable Int32, and a stat column that is
+# blank for a whole season (3P before 1980) becomes an all-null float32
+# rather than text. Either way a column has one numeric type in every
+# partition, so a partitioned dataset reads back as one table.
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import re
+from typing import FrozenSet, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns that are never numeric even if a season happens to look like it
+TEXT_COLUMNS = {'Player', 'Name', 'Awards', 'Notes', 'Player-additional'}
+
+# Repeated labels: a categorical stores each distinct value once
+CATEGORY_COLUMNS = {'Team', 'Tm', 'Pos', 'Lg', 'Conf', 'Div', 'Stat_Type'}
+
+# Team labels Sports Reference uses for a traded player's combined line
+COMBINED_TEAM = re.compile(r'^(TOT|\dTM)$')
+
+# Stats where a lower value is better, per (sport, stat_type); a stat type of
+# None applies to every table of that sport. A walk is bad for a pitcher and
+# good for a batter, so these cannot be one set.
+LOWER_IS_BETTER = {
+    ('basketball', None): frozenset({'TOV', 'PF', 'TOV%'}),
+    ('baseball', 'batting'): frozenset({'CS', 'GDP'}),
+    ('baseball', 'pitching'): frozenset({'ERA', 'WHIP', 'FIP', 'L', 'BB', 'H9', 'HR9', 'BB9'}),
+    ('baseball', 'fielding'): frozenset({'E'}),
+}
+
+# Counting stats per (sport, stat_type): summed over seasons. Decided by
+# name, never by a partition's dtype, since a stat blank for a whole era
+# (3P before 1980) says nothing about what the stat is. Per-game, per-36
+# and advanced tables hold averages and rates only.
+COUNTING_STATS = {
+    ('basketball', 'totals'): frozenset({
+        'G', 'GS', 'MP', 'FG', 'FGA', '3P', '3PA', '2P', '2PA', 'FT', 'FTA', 'ORB', 'DRB', 'TRB',
+        'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'Trp-Dbl',
+    }),
+    ('baseball', 'batting'): frozenset({
+        'G', 'PA', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'SB', 'CS', 'BB', 'SO', 'TB', 'GDP',
+        'HBP', 'SH', 'SF', 'IBB',
+    }),
+    ('baseball', 'pitching'): frozenset({
+        'W', 'L', 'G', 'GS', 'GF', 'CG', 'SHO', 'SV', 'IP', 'H', 'R', 'ER', 'HR', 'BB', 'IBB', 'SO',
+        'HBP', 'BK', 'WP', 'BF',
+    }),
+    ('baseball', 'fielding'): frozenset({'G', 'GS', 'CG', 'Inn', 'Ch', 'PO', 'A', 'E', 'DP'}),
+}
+
+# One width for every integer stat: choosing it per season would give
+# partitions of the same column different types
+INTEGER_DTYPE = 'Int32'
+# A column with no values at all; int32 partitions read back into it losslessly
+BLANK_DTYPE = 'float32'
+
+
+def coerce_column(column: pd.Series) -> pd.Series:
+    """Convert one scraped column to its most compact faithful dtype"""
+    if pd.api.types.is_bool_dtype(column):
+        return column
+    if pd.api.types.is_integer_dtype(column):
+        return column.astype(INTEGER_DTYPE)
+    if pd.api.types.is_float_dtype(column):
+        return column.astype('float32')
+    if not (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column)):
+        return column
+
+    text = column.astype('string').str.strip()
+    cleaned = text.str.replace(r'[%,]', '', regex=True)
+    cleaned = cleaned.mask(cleaned == '')
+    if cleaned.isna().all():
+        return pd.Series(np.nan, index=column.index, dtype=BLANK_DTYPE, name=column.name)
+
+    numbers = pd.to_numeric(cleaned, errors='coerce')
+    if (numbers.isna() & cleaned.notna()).any():
+        # At least one real word in the column: it is text, not a stat
+        return column
+
+    if not cleaned.str.contains(r'[.eE]', regex=True).any():
+        return numbers.astype(INTEGER_DTYPE)
+    return numbers.astype('float32')
+
+
+def coerce_stat_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with typed stat columns, categorical labels and text left as text"""
+    if df.empty:
+        return df
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        # Positional access: scraped headers are not guaranteed unique
+        column = df.iloc[:, i]
+        if name in TEXT_COLUMNS:
+            columns.append(column)
+        elif name in CATEGORY_COLUMNS:
+            columns.append(column.astype('category'))
+        else:
+            columns.append(coerce_column(column))
+
+    typed = pd.concat(columns, axis=1, ignore_index=True)
+    typed.columns = df.columns
+    return typed
+
+
+def lower_is_better(sport: str, stat_type: Optional[str]) -> FrozenSet[str]:
+    """Stats of a (sport, stat_type) table that rank ascending"""
+    return LOWER_IS_BETTER.get((sport, None), frozenset()) | LOWER_IS_BETTER.get((sport, stat_type), frozenset())
+
+
+def is_counting_stat(sport: str, stat_type: Optional[str], stat: str) -> bool:
+    """True if `stat` of a (sport, stat_type) table adds up across seasons"""
+    return stat in COUNTING_STATS.get((sport, stat_type), frozenset())
@@ -0,0 +1,127 @@
+#
+# Fanalytics - Sports Reference HTTP Session
+#
+# A requests.Session that keeps Sports Reference happy when many pages are
+# fetched at once: one pooled connection set shared by every thread, a
+# per-host token bucket (the sites ask for at most ~20 requests a minute),
+# and exponential backoff that honors Retry-After on 429/503 responses.
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_RATE = 20 / 60  # requests per second, per host
+DEFAULT_BURST = 1
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+RETRY_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free"""
+
+    def __init__(self, rate: float, capacity: float = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while (the host asked us to back off)"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedSession(requests.Session):
+    """Session with a shared connection pool and per-host rate limiting.
+
+    Safe to share between fetch threads: each request first takes a token
+    from its host's bucket, and a 429/503 pauses that host's bucket for
+    every thread, not just the one that hit it.
+    """
+
+    def __init__(self, rate: Optional[float] = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 pool_size: int = 10):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if not self.rate:
+            return None
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlsplit(url).netloc
+        bucket = self._bucket(host)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                bucket.acquire()
+            response = super().request(method, url, *args, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+
+            delay = _retry_after(response)
+            if delay is None:
+                delay = min(MAX_BACKOFF, self.backoff * 2 ** attempt) * random.uniform(0.8, 1.2)
+            print(f"{host} returned {response.status_code}; backing off {delay:.1f}s")
+            if bucket is not None:
+                bucket.pause(delay)
+            else:
+                time.sleep(delay)
+            response.close()
+            attempt += 1
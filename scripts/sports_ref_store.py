@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+#
+# Fanalytics - Sports Reference Historical Store
+#
+# A local columnar store for every season the scraper has fetched, so
+# cross-season questions are answered from disk instead of re-scraping
+# decades of pages. It uses the same Hive-style Parquet layout as
+# PartitionedDatasetWriter:
+#
+#   <root>/sport=basketball/stat_type=per_game/year=2019/part-0.parquet
+#
+# Appending a scraped table merges it into its partition and keeps one row
+# per (player, team, year), the newest scrape winning. Queries touch only
+# the partitions for the requested years (directory pruning), read only
+# the columns they need (column pruning) and hand row predicates such as
+# "this player" or "at least N games" to the Parquet reader (predicate
+# pushdown), which skips non-matching row groups using their statistics.
+#
+# Usage:
+# python sports_ref_store.py catalog
+# python sports_ref_store.py career --sport basketball --stat-type per_game --player "LeBron James" --stats PTS,AST
+# python sports_ref_store.py leaders --sport baseball --stat-type batting --stat OPS --years 2000-2010 --limit 10
+# python sports_ref_store.py leaders --sport basketball --stat-type totals --stat PTS --years 1990-1999 --career
+#
+# @author Fanalytics Team
+# @created November 24, 2025
+# @license MIT
+#
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from sports_ref_dataset import PartitionedDatasetWriter, parse_years, unique_columns
+from sports_ref_schema import COMBINED_TEAM, coerce_stat_types, is_counting_stat, lower_is_better
+
+DEFAULT_STORE_DIR = 'sports_ref_dataset'
+
+# Identity columns differ by site and era; query results use the first name
+PLAYER_COLUMNS = ('Player', 'Name')
+TEAM_COLUMNS = ('Team', 'Tm')
+
+# Never aggregated into a career line
+NOT_STATS = {'Rk', 'Age', 'Year'}
+
+
+def first_present(columns, candidates: Sequence[str]) -> Optional[str]:
+    for name in candidates:
+        if name in columns:
+            return name
+    return None
+
+
+def dedupe_keys(columns) -> List[str]:
+    """Columns identifying a row within one partition: (player, team), or none for team tables"""
+    player = first_present(columns, PLAYER_COLUMNS)
+    if player is None:
+        return []
+    team = first_present(columns, TEAM_COLUMNS)
+    return [player, team] if team else [player]
+
+
+def season_lines(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per (Player, Year): a traded player's combined line, otherwise their only line"""
+    if df.empty or 'Team' not in df.columns:
+        return df.drop_duplicates(['Player', 'Year'])
+    combined = df['Team'].astype('string').str.match(COMBINED_TEAM.pattern).fillna(False)
+    ordered = df.assign(_combined=combined).sort_values(['Year', '_combined'], ascending=[True, False],
+                                                        kind='stable')
+    return ordered.drop_duplicates(['Player', 'Year']).drop(columns='_combined').reset_index(drop=True)
+
+
+def career_line(seasons: pd.DataFrame, stats: Sequence[str], sport: str, stat_type: str) -> Dict[str, Any]:
+    """Aggregate season lines: counting stats are summed, rates and averages are games-weighted"""
+    weights = (pd.to_numeric(seasons['G'], errors='coerce').fillna(0) if 'G' in seasons.columns
+               else pd.Series(1.0, index=seasons.index))
+    line: Dict[str, Any] = {'Seasons': int(seasons['Year'].nunique())}
+    for stat in stats:
+        if stat in NOT_STATS or stat not in seasons.columns:
+            continue
+        values = pd.to_numeric(seasons[stat], errors='coerce')
+        if values.isna().all():
+            continue
+        if stat in ('G', 'GS') or is_counting_stat(sport, stat_type, stat):
+            line[stat] = float(values.sum())
+        else:
+            present = values.notna() & (weights > 0)
+            total = weights[present].sum()
+            line[stat] = float((values[present] * weights[present]).sum() / total) if total else None
+    return line
+
+
+class HistoricalStore:
+    """Append-and-query access to the partitioned scrape dataset"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self.writer = PartitionedDatasetWriter(root)
+
+    def partition_file(self, sport: str, stat_type: str, year: int) -> str:
+        return os.path.join(self.writer.partition_dir(sport, stat_type, year), 'part-0.parquet')
+
+    def append(self, sport: str, stat_type: str, year: int, df: pd.DataFrame) -> str:
+        """Merge a scraped table into its partition, keeping the newest row per (player, team)"""
+        df = df.set_axis(unique_columns(df.columns), axis=1)
+        keys = dedupe_keys(df.columns)
+        path = self.partition_file(sport, stat_type, year)
+        if keys and os.path.exists(path):
+            existing = pd.read_parquet(path)
+            if all(key in existing.columns for key in keys):
+                df = pd.concat([df, existing], ignore_index=True)
+        if keys:
+            # Rows without a player are team/league summary lines; keep them as scraped
+            named = df[keys[0]].notna()
+            df = pd.concat([df[named].drop_duplicates(keys, keep='first'), df[~named]], ignore_index=True)
+            df = coerce_stat_types(df)
+        return self.writer.write(sport, stat_type, year, df)
+
+    def catalog(self) -> Dict[str, Dict[str, List[int]]]:
+        """{sport: {stat_type: [years]}} in the store"""
+        found: Dict[str, Dict[str, List[int]]] = {}
+        if not os.path.isdir(self.root):
+            return found
+        for sport_dir in sorted(os.listdir(self.root)):
+            if not sport_dir.startswith('sport='):
+                continue
+            for type_dir in sorted(os.listdir(os.path.join(self.root, sport_dir))):
+                if not type_dir.startswith('stat_type='):
+                    continue
+                sport, stat_type = sport_dir.split('=', 1)[1], type_dir.split('=', 1)[1]
+                found.setdefault(sport, {})[stat_type] = [year for year, _ in self.files(sport, stat_type)]
+        return found
+
+    def files(self, sport: str, stat_type: str,
+              years: Optional[Sequence[int]] = None) -> List[Tuple[int, str]]:
+        """(year, path) for the partitions in `years` (all when None), oldest first"""
+        directory = os.path.join(self.root, f'sport={sport}', f'stat_type={stat_type}')
+        if not os.path.isdir(directory):
+            return []
+        wanted = None if years is None else set(years)
+        found = []
+        for name in os.listdir(directory):
+            value = name.split('=', 1)[1] if name.startswith('year=') else ''
+            if not value.isdigit() or (wanted is not None and int(value) not in wanted):
+                continue
+            path = os.path.join(directory, name, 'part-0.parquet')
+            if os.path.exists(path):
+                found.append((int(value), path))
+        return sorted(found)
+
+    def scan(self, sport: str, stat_type: str, columns: Optional[Sequence[str]] = None,
+             years: Optional[Sequence[int]] = None, players: Sequence[str] = (),
+             filters: Sequence[Tuple[str, str, Any]] = ()) -> pd.DataFrame:
+        """Rows from the matching partitions with identity columns named Player / Team.
+
+        Only `columns` (plus player, team and Year) are read, and `players`
+        and `filters` (pyarrow (column, op, value) tuples) are applied by the
+        Parquet reader. A partition lacking a filtered column cannot match
+        and is skipped.
+        """
+        frames = []
+        for year, path in self.files(sport, stat_type, years):
+            names = pq.read_schema(path).names
+            if any(column not in names for column, _, _ in filters):
+                continue
+            player = first_present(names, PLAYER_COLUMNS)
+            team = first_present(names, TEAM_COLUMNS)
+            predicates = list(filters)
+            if players:
+                if player is None:
+                    continue
+                predicates.append((player, 'in', list(players)))
+
+            read = None
+            if columns is not None:
+                read = [c for c in (player, team, 'Year') if c and c in names]
+                read = list(dict.fromkeys([*read, *(c for c in columns if c in names)]))
+            df = pq.read_table(path, columns=read, filters=predicates or None).to_pandas()
+            df = df.rename(columns={player: 'Player', team: 'Team'} if player else {team: 'Team'})
+            # Mixed-era categories would otherwise fall back to object per partition anyway
+            for column in ('Player', 'Team'):
+                if column in df.columns:
+                    df[column] = df[column].astype('string')
+            df['Year'] = year
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=['Player', 'Team', 'Year', *(columns or [])])
+        return pd.concat(frames, ignore_index=True)
+
+    def career(self, sport: str, stat_type: str, player: str,
+               stats: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """A player's season lines and career aggregate, e.g. career PPG from per_game"""
+        columns = None if stats is None else ['G', *stats]
+        seasons = season_lines(self.scan(sport, stat_type, columns=columns, players=[player]))
+        if seasons.empty:
+            raise KeyError(f"No {sport} {stat_type} seasons stored for {player}")
+        if stats is None:
+            stats = [c for c in seasons.columns if c not in ('Player', 'Team') and c not in NOT_STATS]
+        return seasons, career_line(seasons, stats, sport, stat_type)
+
+    def leaders(self, sport: str, stat_type: str, stat: str, years: Optional[Sequence[int]] = None,
+                limit: int = 10, min_games: int = 0, ascending: Optional[bool] = None,
+                career: bool = False) -> pd.DataFrame:
+        """Best seasons for `stat` over `years`, or with career=True the best totals over that span"""
+        if ascending is None:
+            ascending = stat in lower_is_better(sport, stat_type)
+        # A season below the games floor can still add to a career total
+        filters = [('G', '>=', min_games)] if (min_games and not career) else []
+        rows = season_lines(self.scan(sport, stat_type, columns=['G', stat], years=years, filters=filters))
+        if stat not in rows.columns:
+            raise KeyError(f"{stat} is not a column of {sport} {stat_type} in the requested years")
+        rows = rows[pd.to_numeric(rows[stat], errors='coerce').notna()]
+
+        if career:
+            lines = [{'Player': player, **career_line(group, ['G', stat], sport, stat_type)}
+                     for player, group in rows.groupby('Player', sort=False)]
+            rows = pd.DataFrame(lines, columns=['Player', 'Seasons', 'G', stat])
+            if min_games and 'G' in rows.columns:
+                rows = rows[rows['G'] >= min_games]
+            rows = rows.dropna(subset=[stat])
+        else:
+            rows = rows[[c for c in ('Player', 'Team', 'Year', 'G', stat) if c in rows.columns]]
+
+        rows = rows.astype({stat: 'float64'})
+        picked = rows.nsmallest(limit, stat) if ascending else rows.nlargest(limit, stat)
+        return picked.reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the local Sports Reference history store')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR,
+                       help='Partitioned Parquet dataset directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('catalog', help='List stored sports, stat types and years')
+
+    career = commands.add_parser('career', help="One player's seasons and career line")
+    career.add_argument('--sport', choices=['baseball', 'basketball'], required=True)
+    career.add_argument('--stat-type', required=True, help='e.g. per_game, totals, batting')
+    career.add_argument('--player', required=True, help='Name as listed by Sports Reference')
+    career.add_argument('--stats', help='Comma-separated stat columns (default: all)')
+
+    leaders = commands.add_parser('leaders', help='Top seasons (or careers) for one stat')
+    leaders.add_argument('--sport', choices=['baseball', 'basketball'], required=True)
+    leaders.add_argument('--stat-type', required=True, help='e.g. per_game, totals, batting')
+    leaders.add_argument('--stat', required=True, help='Stat column, e.g. PTS or OPS')
+    leaders.add_argument('--years', help='e.g. 2000-2010 or 2019,2021-2023 (default: all stored)')
+    leaders.add_argument('--limit', type=int, default=10)
+    leaders.add_argument('--min-games', type=int, default=0,
+                        help='Games floor per season (per career with --career)')
+    leaders.add_argument('--order', choices=['asc', 'desc'],
+                        help='Default: desc, asc for lower-is-better stats')
+    leaders.add_argument('--career', action='store_true',
+                        help='Rank players by their aggregate over the years instead of single seasons')
+
+    args = parser.parse_args()
+    store = HistoricalStore(args.store_dir)
+
+    if args.command == 'catalog':
+        for sport, stat_types in store.catalog().items():
+            for stat_type, years in stat_types.items():
+                print(f"{sport} {stat_type}: {len(years)} seasons ({years[0]}-{years[-1]})")
+        return
+
+    try:
+        if args.command == 'career':
+            stats = [s.strip() for s in args.stats.split(',') if s.strip()] if args.stats else None
+            seasons, line = store.career(args.sport, args.stat_type, args.player, stats)
+            print(seasons.to_string(index=False))
+            print()
+            print('Career: ' + ', '.join(f"{k} {v:.3f}" if isinstance(v, float) else f"{k} {v}"
+                                         for k, v in line.items()))
+        else:
+            ascending = None if args.order is None else args.order == 'asc'
+            years = parse_years(args.years) if args.years else None
+            rows = store.leaders(args.sport, args.stat_type, args.stat, years, limit=args.limit,
+                                 min_games=args.min_games, ascending=ascending, career=args.career)
+            print(rows.to_string(index=False) if not rows.empty else 'No matching rows')
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import pytest
+
+from sports_ref_fixtures import PAGES, fixture_page
+from sports_ref_parsers import BeautifulSoupEngine, LxmlEngine, extract_table, extract_tables
+
+STATS_IDS = ['per_game_stats', 'advanced_stats', 'batting_leaders_standard']
+STATS_PAGES = [page for page in PAGES if page[1] is not None]
+
+
+@pytest.mark.parametrize('name, table_id, columns, players, traded', STATS_PAGES)
+def test_engines_agree_on_fixture_pages(name, table_id, columns, players, traded):
+    content = fixture_page(name, table_id, columns, players, traded)
+    tables = [extract_table(engine, content, STATS_IDS, min_cells=2)
+              for engine in (LxmlEngine(), BeautifulSoupEngine())]
+    assert [t.table_id for t in tables] == [table_id, table_id]
+    assert tables[0].headers == tables[1].headers == ['Rk', 'Player', *columns]
+    assert tables[0].columns == tables[1].columns
+    # Repeated header rows are skipped and the commented-out table is never picked up
+    assert len(tables[0]) >= players
+    assert 'Player' not in tables[0].columns[0]
+
+
+def test_standings_tables_keep_their_separator_rows():
+    name, table_id, columns, players, traded = PAGES[-1]
+    content = fixture_page(name, table_id, columns, players, traded)
+    lxml, bs4 = (extract_tables(engine, content, '_standings') for engine in (LxmlEngine(), BeautifulSoupEngine()))
+    assert [t.table_id for t in lxml] == ['divs_E_standings', 'divs_W_standings']
+    assert [t.columns for t in lxml] == [t.columns for t in bs4]
+    # 15 teams and 3 division separators per conference
+    assert [len(t) for t in lxml] == [18, 18]
+
+
+def test_fixture_pages_are_deterministic():
+    assert fixture_page(*PAGES[0]) == fixture_page(*PAGES[0])
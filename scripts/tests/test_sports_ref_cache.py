@@ -0,0 +1,85 @@
+import pytest
+import requests
+
+from sports_ref_cache import HTTPCache
+
+URL = 'https://www.basketball-reference.com/leagues/NBA_2025_totals.html'
+
+
+class Response:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+class FakeSession:
+    """Answers GETs from a queue of responses and records the request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(str(tmp_path), current_season_ttl=0)
+
+
+def test_stale_entry_is_revalidated_and_kept_on_304(cache):
+    session = FakeSession(
+        Response(200, b'<html>v1</html>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+        Response(304))
+    assert cache.fetch(session, URL) == b'<html>v1</html>'
+
+    validator, content = cache.refresh(session, URL)
+    assert session.requests[1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    # Not modified: nothing downloaded, the body stays on disk under the same validator
+    assert (validator, content) == ('"v1"', None)
+    assert cache.read(URL) == b'<html>v1</html>'
+
+
+def test_changed_page_replaces_the_entry(cache):
+    session = FakeSession(Response(200, b'v1', {'ETag': '"v1"'}), Response(200, b'v2', {'ETag': '"v2"'}))
+    cache.fetch(session, URL)
+    assert cache.refresh(session, URL) == ('"v2"', b'v2')
+    assert cache.read(URL) == b'v2'
+
+
+def test_fresh_entries_skip_the_network(tmp_path):
+    cache = HTTPCache(str(tmp_path), current_season_ttl=3600)
+    session = FakeSession(Response(200, b'v1', {'ETag': '"v1"'}))
+    cache.fetch(session, URL)
+    assert cache.fetch(session, URL) == b'v1'
+    assert len(session.requests) == 1
+
+
+def test_finished_seasons_are_never_revalidated(cache):
+    session = FakeSession(Response(200, b'v1', {'ETag': '"v1"'}))
+    cache.fetch(session, URL, immutable=True)
+    # Past the TTL, but the page cannot change upstream
+    assert cache.fetch(session, URL, immutable=True) == b'v1'
+    assert len(session.requests) == 1
+
+
+def test_validator_falls_back_to_content_hash(cache):
+    validator, _ = cache.refresh(FakeSession(Response(200, b'no validators')), URL)
+    assert len(validator) == 64
+    # No validators to send: the next revalidation is a plain GET
+    session = FakeSession(Response(200, b'no validators'))
+    cache.refresh(session, URL)
+    assert session.requests == [{}]
+
+
+def test_errors_are_raised_and_not_cached(cache):
+    with pytest.raises(requests.HTTPError):
+        cache.fetch(FakeSession(Response(429)), URL)
+    assert cache.read(URL) is None
@@ -0,0 +1,43 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from sports_ref_store import HistoricalStore
+
+
+def season(three_pointers, points, games='80', team='BOS'):
+    return pd.DataFrame({'Player': ['A', 'B'], 'Team': [team, 'NYK'], 'G': [games, '70'],
+                         '3P': [three_pointers, ''], '3P%': ['.400' if three_pointers else '', ''],
+                         'PTS': [points, '500']})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoricalStore(str(tmp_path))
+    # 3P did not exist before 1980: the whole 1979 column is blank
+    store.append('basketball', 'totals', 1979, season('', '1000'))
+    store.append('basketball', 'totals', 1980, season('50', '1000'))
+    store.append('basketball', 'totals', 1981, season('60', '40000'))
+    return store
+
+
+def test_blank_era_partition_reads_back_as_one_numeric_table(store, tmp_path):
+    table = pq.read_table(str(tmp_path / 'sport=basketball' / 'stat_type=totals'))
+    df = table.to_pandas().sort_values(['year', 'Player'])
+    assert pd.api.types.is_numeric_dtype(df['3P'])
+    assert df.loc[df['Player'] == 'A', 'PTS'].tolist() == [1000, 1000, 40000]
+
+
+def test_career_sums_counting_stats_across_a_blank_era(store):
+    _, line = store.career('basketball', 'totals', 'A', ['3P', '3P%', 'PTS'])
+    assert line['Seasons'] == 3
+    assert line['3P'] == 110
+    assert line['PTS'] == 42000
+    # Rates stay games-weighted averages
+    assert line['3P%'] == pytest.approx(0.4)
+
+
+def test_career_leaders_sum_across_a_blank_era(store):
+    leaders = store.leaders('basketball', 'totals', '3P', years=[1979, 1980, 1981], career=True)
+    assert leaders.loc[0, 'Player'] == 'A'
+    assert leaders.loc[0, '3P'] == 110
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from scrape_sports_refs import store_scrape
+
+
+class RecordingStore:
+    def __init__(self):
+        self.appended = []
+
+    def append(self, sport, stat_type, year, df):
+        self.appended.append((sport, stat_type, year, len(df)))
+
+
+def table(from_cache=False):
+    df = pd.DataFrame({'Player': ['A'], 'Team': ['BOS'], 'PTS': ['10']})
+    if from_cache:
+        df.attrs['from_table_cache'] = True
+    return df
+
+
+def test_freshly_parsed_table_is_appended():
+    store = RecordingStore()
+    store_scrape(store, 'basketball', 2024, 'totals', table())
+    assert store.appended == [('basketball', 'totals', 2024, 1)]
+
+
+def test_table_cache_hit_is_not_rewritten():
+    store = RecordingStore()
+    store_scrape(store, 'basketball', 2024, 'totals', table(from_cache=True))
+    assert store.appended == []
+
+
+def test_no_store_and_empty_tables_are_skipped():
+    store = RecordingStore()
+    store_scrape(None, 'basketball', 2024, 'totals', table())
+    store_scrape(store, 'basketball', 2024, 'totals', pd.DataFrame())
+    assert store.appended == []